@@ -1,10 +1,94 @@
 
+from typing import List, Dict, Any
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     APP_NAME: str = "Universal Data Connector"
     MAX_RESULTS: int = 10
 
+    # Connector datasets: <DATA_DIR>/<dataset>.<DATA_FORMAT> (json or
+    # ndjson, as written by app.utils.mock_data)
+    DATA_DIR: str = "data"
+    DATA_FORMAT: str = "json"
+
+    # Connector result cache
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESULT_CACHE_REALTIME_TTL: float = 5.0
+    RESULT_CACHE_DEFAULT_TTL: float = 60.0
+
+    # Threads available to blocking connector / file work from async code
+    BLOCKING_WORKERS: int = 8
+
+    # Groq endpoint (None: the SDK default / GROQ_BASE_URL) and SDK
+    # retries; point LLM_BASE_URL at benchmarks.fake_groq offline
+    LLM_BASE_URL: str | None = None
+    LLM_MAX_RETRIES: int = 2
+
+    # LLM turns may request this many rounds of tool calls before
+    # the model is asked to answer without tools
+    LLM_MAX_TOOL_ROUNDS: int = 3
+
+    # Tool results sent back to the LLM: "compact" or "json",
+    # optionally per source, e.g. {"analytics": "json"}
+    TOOL_RESULT_ENCODING: str = "compact"
+    TOOL_RESULT_ENCODING_BY_SOURCE: Dict[str, str] = {}
+    TOOL_RESULT_TOKEN_BUDGET: int = 800
+    TOOL_RESULT_FLOAT_DIGITS: int = 2
+
+    # Answer single-tool-call turns straight from the connector's voice
+    # context when the query matches a rule, skipping the second LLM
+    # call. Rules: {"source", "filter_fields", "aggregate"}. Aggregate
+    # summaries are exact, so they are the default; list summaries only
+    # describe the returned page and are left to the model, as is any
+    # result truncated by `limit` (e.g. resampled buckets).
+    FAST_PATH_ENABLED: bool = False
+    FAST_PATH_RULES: List[Dict[str, Any]] = [
+        {"source": "analytics", "filter_fields": ["metric_name"], "aggregate": True},
+    ]
+
+    # Chat loop caches keyed by the normalized user message: tool-call
+    # plans (skip the first LLM call) and final answers (skip both
+    # while the queried snapshots and freshness windows still hold)
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_PLAN_CACHE_SIZE: int = 1024
+    CHAT_PLAN_TTL: float = 900.0
+    CHAT_ANSWER_CACHE_SIZE: int = 1024
+
+    # Guess the first tool call from keywords and run it while the
+    # first LLM completion is in flight
+    SPECULATIVE_PREFETCH: bool = False
+
+    # Voice latency budget per chat request (None: no deadline) and the
+    # remaining-time thresholds at which stages degrade
+    CHAT_DEADLINE_MS: int | None = None
+    DEADLINE_CONNECTOR_LOW_SECONDS: float = 2.0
+    DEADLINE_CONNECTOR_CRITICAL_SECONDS: float = 1.0
+    DEADLINE_LLM_MIN_SECONDS: float = 0.5
+
+    # Per-stage connector timings, LLM latency and token histograms
+    # served on /metrics; DEBUG_TIMINGS also attaches a connector's
+    # stage timings (ms) to metadata.timings
+    METRICS_ENABLED: bool = True
+    DEBUG_TIMINGS: bool = False
+
+    # Extra or replacement connectors, {"source": "module:Class"};
+    # installed packages can also register them under the
+    # "universal_data_connector.connectors" entry point group
+    CONNECTOR_PLUGINS: Dict[str, str] = {}
+
+    # Load dataset snapshots, indexes and analytics rollups while the
+    # app starts, instead of on the first request
+    WARMUP_ON_STARTUP: bool = True
+
+    # Logging: "json" (one object per line) or "text"; LOG_SAMPLING
+    # keeps a fraction of INFO records per logger, e.g.
+    # {"app.connectors": 0.1}. Warnings and errors are always kept.
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLING: Dict[str, float] = {}
+
     class Config:
         env_file = ".env"
 
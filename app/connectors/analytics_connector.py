@@ -1,17 +1,61 @@
-import json
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
+import numpy as np
+
+from app.config import settings
 from app.connectors.base import BaseConnector
-from app.models.common import DataType
+from app.connectors.rollups import (
+    GRANULARITIES,
+    ROLLUP_FUNCTIONS,
+    RollupStore,
+    answer_from_rollup,
+)
+from app.connectors.snapshot import SNAPSHOT_CACHE, DatasetSnapshot
+from app.connectors.timeseries import (
+    ColumnarStore,
+    MetricSeries,
+    reduce_values,
+    resample,
+    select_window,
+)
+from app.models.analytics import AggregatedMetric
+from app.models.common import DataQuery, DataResponse, DataType, Metadata
+from app.services.filter_compiler import (
+    FilterClause,
+    FilterError,
+    compile_filters,
+    to_epoch_us,
+)
+from app.services.voice_optimizer import VoiceOptimizer
+
+
+DATA_PATH = Path(settings.DATA_DIR) / f"analytics.{settings.DATA_FORMAT}"
+
+
+def _columnar(snapshot: DatasetSnapshot) -> ColumnarStore:
+    return snapshot.derive(
+        "analytics_columns",
+        lambda s: ColumnarStore.from_records(s.records)
+    )
 
 
-DATA_PATH = Path("data/analytics.json")
+def _rollups(snapshot: DatasetSnapshot) -> RollupStore:
+    return snapshot.derive(
+        "analytics_rollups",
+        lambda s: RollupStore.from_columnar(_columnar(s))
+    )
 
 
 class AnalyticsConnector(BaseConnector):
     source_name = "analytics"
     data_type = DataType.TIME_SERIES  # default (can change dynamically)
+    data_path = DATA_PATH
+    hash_index_fields = ("metric_name",)
+    sorted_index_fields = ("timestamp", "value")
+    time_field = "timestamp"
+    supports_aggregate = True
 
     # -------------------------
     # Data Fetching
@@ -28,13 +72,7 @@ class AnalyticsConnector(BaseConnector):
             }
         ]
         """
-        if not DATA_PATH.exists():
-            return []
-
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        return data
+        return self.snapshot().to_dicts()
 
     # -------------------------
     # Freshness Indicator
@@ -96,10 +134,258 @@ class AnalyticsConnector(BaseConnector):
         )
 
     # -------------------------
-    # Override Execute for Dynamic DataType
+    # Columnar Store & Rollups
+    # -------------------------
+    def warmup(self) -> None:
+        super().warmup()
+        self.columnar()
+        self.rollups()
+
+    def columnar(self) -> ColumnarStore:
+        """
+        Per-metric NumPy columns for the current snapshot.
+        """
+        return _columnar(self.snapshot())
+
+    def rollups(self) -> RollupStore:
+        """
+        Day/week/month rollups for the current snapshot.
+        """
+        return _rollups(self.snapshot())
+
+    def ingest(self, points: List[Dict[str, Any]]) -> str:
+        """
+        Append new data points in memory. The columnar store and
+        rollups are updated incrementally rather than rebuilt.
+        Returns the new snapshot version.
+        """
+        return SNAPSHOT_CACHE.append(self.data_path, points).version
+
     # -------------------------
-    def execute(self, query):
-        response = super().execute(query)
+    # Vectorized Aggregation
+    # -------------------------
+    @staticmethod
+    def _range_mask(column: np.ndarray, clause: FilterClause) -> np.ndarray:
+        operand = clause.operand
+
+        if operand is None:
+            return np.zeros(len(column), dtype=bool)
+        if clause.op == "gt":
+            return column > operand
+        if clause.op == "gte":
+            return column >= operand
+        if clause.op == "lt":
+            return column < operand
+        if clause.op == "lte":
+            return column <= operand
+        return (column >= operand[0]) & (column <= operand[1])
+
+    def _selected_series(self, query: DataQuery, store: ColumnarStore) -> List[tuple]:
+        """
+        Metrics of `store` passing the query's metric_name filters, each
+        with the slice of points inside [start_date, end_date]. The
+        window is found by binary search on the metric's sorted
+        timestamps.
+        """
+        predicate = compile_filters(query.filters)
+        clauses = predicate.clauses if predicate else []
+        metric_clauses = [c for c in clauses if c.field == "metric_name"]
+
+        start_us = to_epoch_us(query.start_date) if query.start_date else None
+        end_us = to_epoch_us(query.end_date) if query.end_date else None
+
+        selected = []
+
+        for name in store.metrics():
+            if all(clause.test(name) for clause in metric_clauses):
+                series: MetricSeries = store.series[name]
+                selected.append((series, series.window(start_us, end_us)))
+
+        return selected
+
+    def _column_clauses(self, query: DataQuery) -> List[FilterClause]:
+        """
+        timestamp/value range clauses of an aggregate query.
+        """
+        predicate = compile_filters(query.filters)
+        clauses = predicate.clauses if predicate else []
+
+        column_clauses = []
+
+        for clause in clauses:
+            if clause.field == "metric_name":
+                continue
+            if (
+                clause.field in ("timestamp", "value")
+                and clause.op in ("gt", "gte", "lt", "lte", "between")
+            ):
+                column_clauses.append(clause)
+            else:
+                raise FilterError(
+                    f"Filter '{clause.field}__{clause.op}' is not supported "
+                    f"with aggregate; use metric_name, timestamp or value ranges"
+                )
+
+        return column_clauses
+
+    # -------------------------
+    # Query Scoping
+    # -------------------------
+    def scope(self, records: List[Any], query: DataQuery) -> Iterable[Any]:
+        """
+        Restrict a time-windowed query to the matching slice of each
+        selected metric instead of scanning every point. Positions are
+        re-sorted so downstream ordering (and tie-breaking) is the same
+        as a full scan.
+
+        Positions index the snapshot's own record list, so records from
+        any other snapshot (e.g. one replaced by a reload or `ingest()`
+        since they were read) fall back to the base time-field scan.
+        """
+        if query.start_date is None and query.end_date is None:
+            return records
+
+        snapshot = self.snapshot()
+        if records is not snapshot.records:
+            return super().scope(records, query)
+
+        slices = [
+            series.positions[window]
+            for series, window in self._selected_series(query, _columnar(snapshot))
+        ]
+
+        if not slices:
+            return []
+
+        positions = np.sort(np.concatenate(slices), kind="stable")
+        return [records[position] for position in positions.tolist()]
+
+    @staticmethod
+    def _label(epoch_us: int, period: str | None) -> str:
+        moment = datetime.fromtimestamp(epoch_us // 1_000_000, tz=timezone.utc)
+
+        if period == "month":
+            return moment.strftime("%Y-%m")
+        if period == "week":
+            return f"week of {moment.date().isoformat()}"
+        return moment.date().isoformat()
+
+    def aggregate(self, query: DataQuery) -> DataResponse:
+        """
+        Answer an aggregate query per metric.
+
+        sum/avg/min/max/count over a plain time window are routed to the
+        coarsest rollup with a fully covered bucket, reading raw points
+        only for the partial buckets at the edges. Everything else runs
+        one vectorized pass over the metric's columns. Without `period`
+        each metric folds into a single value; with it the series is
+        resampled into day/week/month buckets.
+        """
+        function = query.aggregate.value
+        period = query.period.value if query.period else None
+
+        column_clauses = self._column_clauses(query)
+
+        # One snapshot for the whole query: rollups and columns must
+        # describe the same data even if it is reloaded meanwhile
+        snapshot = self.snapshot()
+        rollups = (
+            _rollups(snapshot)
+            if function in ROLLUP_FUNCTIONS and not column_clauses
+            else None
+        )
+
+        start_us = to_epoch_us(query.start_date) if query.start_date else None
+        end_us = to_epoch_us(query.end_date) if query.end_date else None
+
+        rows: List[Dict[str, Any]] = []
+        points = 0
+        used_rollups = set()
+
+        for series, window in self._selected_series(query, _columnar(snapshot)):
+            masks = [
+                self._range_mask(
+                    (series.timestamps if clause.field == "timestamp" else series.values)[window],
+                    clause
+                )
+                for clause in column_clauses
+            ]
+            timestamps, values = select_window(series, window, masks)
+
+            if len(timestamps) == 0:
+                continue
+
+            points += len(timestamps)
+
+            table = (
+                rollups.route(series.metric_name, start_us, end_us, period)
+                if rollups is not None
+                else None
+            )
+
+            if table is not None:
+                used_rollups.add(table.granularity)
+                buckets = answer_from_rollup(
+                    table, series, function, start_us, end_us, period
+                )
+            elif period is None:
+                buckets = [(None, reduce_values(values, function, query.percentile), len(timestamps))]
+            else:
+                starts, aggregated, counts = resample(
+                    timestamps, values, period, function, query.percentile
+                )
+                buckets = list(zip(starts.tolist(), aggregated.tolist(), counts.tolist()))
+
+            for start, value, count in buckets:
+                label = (
+                    self._label(start, period)
+                    if start is not None
+                    else f"{self._label(int(timestamps[0]), None)} to "
+                         f"{self._label(int(timestamps[-1]), None)}"
+                )
+                rows.append(AggregatedMetric(
+                    metric_name=series.metric_name,
+                    value=round(value, 2),
+                    period=label,
+                    aggregate=function,
+                    points=count
+                ).model_dump())
+
+        limited = rows[query.offset: query.offset + query.limit]
+
+        context = (
+            VoiceOptimizer.summarize_aggregate(rows, function, period, query.percentile)
+            if query.voice_context
+            else None
+        )
+
+        rollup = ",".join(g for g in GRANULARITIES if g in used_rollups) or None
+
+        metadata = Metadata(
+            total_results=len(rows),
+            returned_results=len(limited),
+            data_type=DataType.TIME_SERIES if period else DataType.AGGREGATED,
+            freshness=self.freshness(),
+            note=f"{function} computed over {points} data points",
+            rollup=rollup,
+        )
+
+        return DataResponse(data=limited, metadata=metadata, context=context)
+
+    # -------------------------
+    # Override Run / Respond for Dynamic DataType
+    # -------------------------
+    def run(self, query):
+        if query.aggregate is not None:
+            clock = self.stage_clock()
+            response = self.aggregate(query)
+            clock.lap("aggregate")
+            return self._finish_timings(response, clock)
+
+        return super().run(query)
+
+    def respond(self, query, page, total_results, clock=None):
+        response = super().respond(query, page, total_results, clock)
 
         # Detect if aggregated (single computed value scenario)
         if len(response.data) == 1:
@@ -1,14 +1,51 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Type
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Type, Iterable, Iterator, Tuple, TypeVar
 from app.models.common import DataQuery, DataResponse, Metadata, DataType
 from app.services.data_identifier import identify_data_type
 from app.services.business_rules import BusinessRulesEngine
+from app.services.filter_compiler import compile_filters, CompiledFilter, FilterError
 from app.services.voice_optimizer import VoiceOptimizer
+from app.services.result_cache import RESULT_CACHE, query_key, ttl_for_freshness
+from app.config import settings
+from app.utils.executor import run_blocking
+from app.utils.deadline import below, check_deadline, degrade
+from app.utils.metrics import CONNECTOR_EXECUTE_SECONDS, CONNECTOR_STAGE_SECONDS, NULL_CLOCK, StageClock, stage_clock
+from app.connectors.snapshot import SNAPSHOT_CACHE, DatasetSnapshot
+from app.connectors.indexes import SnapshotIndex
+from app.connectors.records import materialize
+from app.connectors.resources import RESOURCES
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class _Tally:
+    """
+    Pass-through iterator counting the records that flow through it.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        self._records = iter(records)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        record = next(self._records)
+        self.count += 1
+        return record
+
+    def drain(self) -> int:
+        for _ in self._records:
+            self.count += 1
+        return self.count
+
 
 class BaseConnector(ABC):
     """
@@ -19,6 +56,102 @@ class BaseConnector(ABC):
     source_name: str
     data_type: DataType
 
+    # File-backed connectors set this to share parsed snapshots
+    data_path: Path | None = None
+
+    # Fields indexed once per snapshot: hash indexes answer equality
+    # and `in` filters, sorted indexes answer range filters
+    hash_index_fields: Tuple[str, ...] = ()
+    sorted_index_fields: Tuple[str, ...] = ()
+
+    # Field that `DataQuery.start_date` / `end_date` apply to
+    time_field: str | None = None
+
+    # Set to False to keep this source out of the result cache
+    cacheable: bool = True
+
+    # Whether `DataQuery.aggregate` (with `period` / `percentile`) is
+    # answered; other connectors reject aggregation options
+    supports_aggregate: bool = False
+
+    # -------------------------
+    # Dataset Snapshot
+    # -------------------------
+    def snapshot(self) -> DatasetSnapshot:
+        """
+        Return the current parsed snapshot of `data_path`.
+        The file is only re-parsed when it changes on disk.
+        """
+        if self.data_path is None:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} is not backed by a dataset file"
+            )
+        return SNAPSHOT_CACHE.get(self.data_path)
+
+    def records(self) -> List[Any]:
+        """
+        Records the execution pipeline runs over.
+        File-backed connectors serve typed snapshot rows directly;
+        others fall back to `fetch()`.
+        """
+        if self.data_path is not None:
+            return self.snapshot().records
+        return self.fetch()
+
+    def snapshot_version(self) -> str:
+        """
+        Version of the data currently served by this connector.
+        Changes whenever the underlying dataset changes.
+        """
+        return self.snapshot().version
+
+    def cache_version(self) -> str | None:
+        """
+        Version the result cache keys on, or None to bypass caching.
+        Connectors without a dataset file should override this.
+        """
+        if self.data_path is None:
+            return None
+        return self.snapshot_version()
+
+    # -------------------------
+    # Lifecycle Hooks
+    # -------------------------
+    def startup(self) -> None:
+        """
+        Called once by the registry when the connector is created,
+        before it serves any query. Acquire long-lived resources here,
+        preferably through `resource()` so they are shared.
+        """
+
+    def shutdown(self) -> None:
+        """
+        Called by the registry when the app stops or the connector is
+        replaced. Shared resources are closed by the registry.
+        """
+
+    @staticmethod
+    def resource(name: str, factory: Callable[[], T], close: Callable[[T], Any] | None = None) -> T:
+        """
+        A process-wide resource (HTTP client, connection pool) created
+        on first request and shared by every connector and entry point.
+        """
+        return RESOURCES.get(name, factory, close)
+
+    def warmup(self) -> None:
+        """
+        Load the dataset snapshot and build its indexes ahead of the
+        first request. Connectors with more derived structures extend
+        this.
+        """
+        if self.data_path is None:
+            return
+
+        snapshot = self.snapshot()
+
+        if self.hash_index_fields or self.sorted_index_fields:
+            snapshot.index(self.hash_index_fields, self.sorted_index_fields)
+
     # -------------------------
     # Core Data Retrieval
     # -------------------------
@@ -41,6 +174,30 @@ class BaseConnector(ABC):
         """
         pass
 
+    # -------------------------
+    # Optional Hook: Query Scoping
+    # -------------------------
+    def scope(self, records: List[Any], query: DataQuery) -> Iterable[Any]:
+        """
+        Narrow the records a query can touch before filtering.
+
+        The default applies `start_date`/`end_date` to `time_field`,
+        which resolves through its sorted index when one is declared.
+        """
+        if query.start_date is None and query.end_date is None:
+            return records
+
+        if self.time_field is None:
+            return records
+
+        window = {}
+        if query.start_date is not None:
+            window[f"{self.time_field}__gte"] = query.start_date
+        if query.end_date is not None:
+            window[f"{self.time_field}__lte"] = query.end_date
+
+        return self.iter_filters(records, window)
+
     # -------------------------
     # Optional Hook: Filtering
     # -------------------------
@@ -53,56 +210,55 @@ class BaseConnector(ABC):
         if not filters:
             return data
 
-        filtered = []
-
-        for item in data:
-            keep = True
-
-            for key, value in filters.items():
-
-                # Handle operators like value__gt
-                if "__" in key:
-                    field, op = key.split("__", 1)
-                    item_value = item.get(field)
-
-                    if item_value is None:
-                        keep = False
-                        break
-
-                    # 🔥 Force numeric comparison when possible
-                    try:
-                        item_value = float(item_value)
-                        value = float(value)
-                    except (ValueError, TypeError):
-                        keep = False
-                        break
-
-                    if op == "gt" and not (item_value > value):
-                        keep = False
-                        break
-                    elif op == "lt" and not (item_value < value):
-                        keep = False
-                        break
-                    elif op == "gte" and not (item_value >= value):
-                        keep = False
-                        break
-                    elif op == "lte" and not (item_value <= value):
-                        keep = False
-                        break
-
-                # Handle equality
-                else:
-                    if str(item.get(key)) != str(value):
-                        keep = False
-                        break
+        return list(self.iter_filters(data, filters))
+
+    def iter_filters(
+        self,
+        data: Iterable[Dict[str, Any]],
+        filters: Dict[str, Any] | None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield records matching `filters`.
+        Filters are compiled once into a single predicate; see
+        app.services.filter_compiler for the supported operators.
+        """
+
+        predicate = compile_filters(filters)
+
+        if predicate is None:
+            yield from data
+            return
+
+        index = self._index_for(data)
 
-            if keep:
-                filtered.append(item)
+        if index is not None:
+            candidates, residual = index.plan(predicate.clauses)
 
-        return filtered
+            if candidates is not None:
+                selected = (data[position] for position in candidates)
 
+                if residual:
+                    yield from filter(CompiledFilter(residual), selected)
+                else:
+                    yield from selected
+                return
+
+        yield from filter(predicate, data)
+
+    def _index_for(self, data: Iterable[Dict[str, Any]]) -> SnapshotIndex | None:
+        """
+        Snapshot indexes are only valid for the snapshot's own record list.
+        """
+        if self.data_path is None:
+            return None
+        if not (self.hash_index_fields or self.sorted_index_fields):
+            return None
 
+        snapshot = self.snapshot()
+        if data is not snapshot.records:
+            return None
 
+        return snapshot.index(self.hash_index_fields, self.sorted_index_fields)
 
     # -------------------------
     # Optional Hook: Business Rules
@@ -128,10 +284,215 @@ class BaseConnector(ABC):
     ) -> List[Dict[str, Any]]:
         return data[offset: offset + limit]
 
+    @staticmethod
+    def take_page(
+        records: Iterable[Dict[str, Any]],
+        limit: int,
+        offset: int,
+        count_total: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int | None]:
+        """
+        Pull one page out of a record stream.
+
+        Stops consuming the stream as soon as `offset + limit`
+        records have been seen, unless `count_total` is set, in
+        which case the remainder is drained to count all matches.
+        Returns (page, matched_count or None).
+        """
+
+        iterator = iter(records)
+        end = offset + limit
+        page: List[Dict[str, Any]] = []
+        seen = 0
+
+        if end > 0:
+            for record in iterator:
+                if seen >= offset:
+                    page.append(record)
+                seen += 1
+                if seen >= end:
+                    break
+
+        if not count_total:
+            return page, None
+
+        return page, seen + sum(1 for _ in iterator)
+
+    # -------------------------
+    # Query Validation
+    # -------------------------
+    def check_query(self, query: DataQuery) -> None:
+        """
+        Reject query options this connector would silently ignore.
+        """
+        if query.aggregate is None:
+            if query.period is not None or query.percentile is not None:
+                raise FilterError("period and percentile require aggregate")
+            return
+
+        if not self.supports_aggregate:
+            raise FilterError(
+                f"aggregate is not supported for source '{self.source_name}'"
+            )
+
     # -------------------------
     # Unified Execution Method
     # -------------------------
     def execute(self, query: DataQuery) -> DataResponse:
+        """
+        Serve `query` from the result cache, or run the pipeline and
+        cache the response for the connector's freshness window.
+        """
+        self.check_query(query)
+
+        started = time.perf_counter()
+        key = self._cache_key(query)
+
+        if key is None:
+            return self._observed(self.run_within_deadline(query), "bypass", started)
+
+        cached = self._cached(key, started)
+        if cached is not None:
+            return self._observed(cached, "hit", started)
+
+        return self._observed(self._run_and_store(key, query), "miss", started)
+
+    def _cache_key(self, query: DataQuery) -> Tuple[str, str, str] | None:
+        version = (
+            self.cache_version()
+            if self.cacheable and settings.RESULT_CACHE_ENABLED
+            else None
+        )
+
+        if version is None:
+            return None
+
+        return (self.__class__.__name__, version, query_key(query))
+
+    def _cached(self, key: Tuple[str, str, str], started: float) -> DataResponse | None:
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            logger.info("Result cache hit for %s", self.__class__.__name__)
+            if settings.DEBUG_TIMINGS:
+                # The stored timings belong to the run that filled the cache
+                cached.metadata.timings = {"cache": round((time.perf_counter() - started) * 1000, 3)}
+        return cached
+
+    def _run_and_store(self, key: Tuple[str, str, str], query: DataQuery) -> DataResponse:
+        response = self.run_within_deadline(query)
+
+        # A degraded response answers a narrower query than its key
+        if not response.metadata.degraded:
+            RESULT_CACHE.put(key, response, ttl_for_freshness(self.freshness()))
+
+        return response
+
+    # -------------------------
+    # Deadline Handling
+    # -------------------------
+    def run_within_deadline(self, query: DataQuery) -> DataResponse:
+        """
+        `run` under the current request deadline (app.utils.deadline).
+
+        Fails fast once the deadline passed, returns fewer rows when
+        the budget is low and only the voice summary when it is nearly
+        spent. Degraded stages are listed in `metadata.degraded`.
+        """
+        check_deadline(self.__class__.__name__)
+
+        stages: List[str] = []
+
+        if (
+            below(settings.DEADLINE_CONNECTOR_LOW_SECONDS)
+            and query.limit > VoiceOptimizer.MAX_VOICE_RECORDS
+        ):
+            query = query.model_copy(update={"limit": VoiceOptimizer.MAX_VOICE_RECORDS})
+            stages.append("connector_rows")
+
+        response = self.run(query)
+
+        if (
+            below(settings.DEADLINE_CONNECTOR_CRITICAL_SECONDS)
+            and response.context
+            and response.data
+        ):
+            response.data = []
+            response.metadata.returned_results = 0
+            stages.append("connector_summary_only")
+
+        if stages:
+            logger.info("%s degraded to meet deadline: %s", self.__class__.__name__, stages)
+            response.metadata.degraded = stages
+            for stage in stages:
+                degrade(stage)
+
+        return response
+
+    async def afetch(self, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Async fetch. File-backed connectors load their snapshot without
+        blocking the event loop; connectors talking to remote systems
+        should override this with a native async client.
+        """
+        if self.data_path is not None:
+            return (await SNAPSHOT_CACHE.aget(self.data_path)).to_dicts()
+        return await run_blocking(self.fetch, **kwargs)
+
+    async def aexecute(self, query: DataQuery) -> DataResponse:
+        """
+        Async variant of `execute` for use from async endpoints.
+
+        The snapshot is (re)loaded off the event loop, cache hits are
+        answered inline, and the CPU-bound pipeline runs on the
+        bounded blocking executor.
+        """
+        self.check_query(query)
+
+        started = time.perf_counter()
+
+        if self.data_path is not None:
+            await SNAPSHOT_CACHE.aget(self.data_path)
+
+        key = self._cache_key(query)
+
+        if key is None:
+            return self._observed(await run_blocking(self.run_within_deadline, query), "bypass", started)
+
+        cached = self._cached(key, started)
+        if cached is not None:
+            return self._observed(cached, "hit", started)
+
+        return self._observed(await run_blocking(self._run_and_store, key, query), "miss", started)
+
+    # -------------------------
+    # Timing
+    # -------------------------
+    def _observed(self, response: DataResponse, cache: str, started: float) -> DataResponse:
+        if settings.METRICS_ENABLED:
+            CONNECTOR_EXECUTE_SECONDS.observe(time.perf_counter() - started, self.source_name, cache)
+        return response
+
+    def stage_clock(self) -> StageClock:
+        """
+        Clock timing the stages of one `run`. Benchmarks override this
+        to record more than wall time per stage.
+        """
+        return stage_clock(CONNECTOR_STAGE_SECONDS, self.source_name)
+
+    @staticmethod
+    def _finish_timings(response: DataResponse, clock: StageClock) -> DataResponse:
+        """
+        Record the clock's stages and, with DEBUG_TIMINGS, attach them
+        to the response metadata.
+        """
+        timings = clock.finish()
+        if settings.DEBUG_TIMINGS:
+            response.metadata.timings = {
+                stage: round(seconds * 1000, 3) for stage, seconds in timings.items()
+            }
+        return response
+
+    def run(self, query: DataQuery) -> DataResponse:
         """
         Full pipeline execution:
         1. Fetch raw data
@@ -140,68 +501,119 @@ class BaseConnector(ABC):
         4. Apply pagination
         5. Apply voice optimization
         6. Construct standardized response
+
+        Steps 2-4 are chained generators, so records are only
+        pulled until the requested page is filled. Sources whose
+        business rules impose an ordering keep only the top
+        offset + limit records in a bounded heap.
+
+        Stage timings: fetch, select (filters, business rules and
+        pagination, which run interleaved), count, materialize, voice
+        and metadata.
         """
+        clock = self.stage_clock()
 
-        logger.info("Fetching data using %s", self.__class__.__name__)
-        logger.info("Query filters: %s", query.filters)
+        logger.debug("Fetching data using %s", self.__class__.__name__)
+        logger.debug("Query filters: %s", query.filters)
 
         # 1. Fetch
-        raw_data = self.fetch()
+        raw_data = self.records()
         total_results = len(raw_data)
+        clock.lap("fetch")
+
+        logger.debug("Raw data fetched. Total records: %d", total_results)
 
-        logger.info("Raw data fetched. Total records: %d", total_results)
+        check_deadline("filtering")
 
-        # 2. Apply filters
-        filtered_data = self.apply_filters(raw_data, query.filters)
+        # 2. Apply time window and filters (lazy)
+        filtered = self.iter_filters(self.scope(raw_data, query), query.filters)
 
-        logger.info("Filtered records count: %d", len(filtered_data))
+        # 3. Apply business rules (lazy selection, top-K ordering)
+        selected = BusinessRulesEngine.select(query.source, filtered)
 
-        # 3. Apply business rules
-        filtered_data = BusinessRulesEngine.apply(
+        tally = _Tally(selected) if query.count_total else None
+
+        ruled = BusinessRulesEngine.order(
             query.source,
-            filtered_data
+            tally if tally is not None else selected,
+            top_k=query.offset + query.limit
         )
 
-        logger.info("After business rules count: %d", len(filtered_data))
-
-        # 4. Pagination
-        limited_data = self.limit_results(
-            filtered_data,
+        # 4. Pagination (stops pulling once the page is filled)
+        page, _ = self.take_page(
+            ruled,
             query.limit,
             query.offset
         )
+        clock.lap("select")
 
-        logger.info(
+        # Only rows in the page are turned back into dicts
+        limited_data = [materialize(record) for record in page]
+        clock.lap("materialize")
+
+        matched = tally.drain() if tally is not None else None
+
+        if matched is not None:
+            total_results = matched
+            clock.lap("count")
+
+        logger.debug(
             "After pagination → offset=%d limit=%d returned=%d",
             query.offset,
             query.limit,
             len(limited_data)
         )
 
-        # 5. Voice optimization
+        # 5-6. Voice optimization and metadata
+        response = self.respond(query, limited_data, total_results, clock)
+
+        logger.info(
+            "%s returned %d of %d records",
+            self.__class__.__name__,
+            len(response.data),
+            total_results
+        )
+
+        return self._finish_timings(response, clock)
+
+    def respond(
+        self,
+        query: DataQuery,
+        page: List[Dict[str, Any]],
+        total_results: int,
+        clock: StageClock | None = None
+    ) -> DataResponse:
+        """
+        Build the response for one page of materialized rows: voice
+        optimization (when requested) and metadata.
+        """
+        clock = clock or NULL_CLOCK
+
         if query.voice_context:
-            logger.info("Applying voice optimization")
-            limited_data, context = VoiceOptimizer.optimize(
+            logger.debug("Applying voice optimization")
+            page, context = VoiceOptimizer.optimize(
                 query.source,
-                limited_data
+                page
             )
         else:
             context = None
 
-        # 6. Build metadata
+        clock.lap("voice")
+
         metadata = Metadata(
             total_results=total_results,
-            returned_results=len(limited_data),
-            data_type=identify_data_type(limited_data),
+            returned_results=len(page),
+            data_type=identify_data_type(page),
             freshness=self.freshness(),
             note=None,
             summary_hint="Use context field to generate concise answer."
         )
 
-        logger.info("Connector execution completed successfully")
-
-        return DataResponse(
-            data=limited_data,
+        response = DataResponse(
+            data=page,
             metadata=metadata,
             context=context
-        )
\ No newline at end of file
+        )
+        clock.lap("metadata")
+
+        return response
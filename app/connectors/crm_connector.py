@@ -1,17 +1,21 @@
-import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from app.config import settings
 from app.connectors.base import BaseConnector
 from app.models.common import DataType
 
 
-DATA_PATH = Path("data/customers.json")
+DATA_PATH = Path(settings.DATA_DIR) / f"customers.{settings.DATA_FORMAT}"
 
 
 class CRMConnector(BaseConnector):
     source_name = "crm"
     data_type = DataType.TABULAR
+    data_path = DATA_PATH
+    hash_index_fields = ("id", "status", "company")
+    sorted_index_fields = ("lifetime_value", "created_at")
+    time_field = "created_at"
 
     # -------------------------
     # Data Fetching
@@ -19,14 +23,9 @@ class CRMConnector(BaseConnector):
     def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """
         Load CRM customer data from JSON file.
+        Served from the shared snapshot cache.
         """
-        if not DATA_PATH.exists():
-            return []
-
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        return data
+        return self.snapshot().to_dicts()
 
     # -------------------------
     # Freshness Indicator
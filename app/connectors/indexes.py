@@ -0,0 +1,180 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
+
+from app.services.filter_compiler import (
+    DATETIME_FIELDS,
+    FilterClause,
+    to_number,
+    to_text,
+    to_epoch_us,
+)
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HashIndex:
+    """
+    Equality index: text value -> ascending record positions.
+    Keys use the same text form as equality filters.
+    """
+
+    __slots__ = ("field", "postings")
+
+    def __init__(self, field: str, records: Sequence[Dict[str, Any]]):
+        self.field = field
+        self.postings: Dict[str, List[int]] = {}
+
+        for position, record in enumerate(records):
+            key = to_text(record.get(field))
+            self.postings.setdefault(key, []).append(position)
+
+    def lookup(self, values: Iterable[str]) -> List[int]:
+        lists = [self.postings.get(value, []) for value in values]
+
+        if len(lists) == 1:
+            return lists[0]
+
+        return sorted(p for postings in lists for p in postings)
+
+
+class SortedIndex:
+    """
+    Range index: records ordered by their comparable value.
+    Records whose value is missing or not comparable are left out,
+    mirroring the range filters, which never match them.
+    """
+
+    __slots__ = ("field", "kind", "keys", "positions")
+
+    def __init__(self, field: str, records: Sequence[Dict[str, Any]]):
+        self.field = field
+        self.kind = "datetime" if field in DATETIME_FIELDS else "number"
+
+        coerce = to_epoch_us if self.kind == "datetime" else to_number
+        pairs = []
+
+        for position, record in enumerate(records):
+            value = record.get(field)
+            if value is None:
+                continue
+            key = coerce(value)
+            if key is None or key != key:  # skip NaN
+                continue
+            pairs.append((key, position))
+
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def range(self, op: str, operand: Any) -> List[int]:
+        keys = self.keys
+
+        if op == "gt":
+            lo, hi = bisect_right(keys, operand), len(keys)
+        elif op == "gte":
+            lo, hi = bisect_left(keys, operand), len(keys)
+        elif op == "lt":
+            lo, hi = 0, bisect_left(keys, operand)
+        elif op == "lte":
+            lo, hi = 0, bisect_right(keys, operand)
+        else:  # between, inclusive
+            low, high = operand
+            lo, hi = bisect_left(keys, low), bisect_right(keys, high)
+
+        return self.positions[lo:hi]
+
+
+class SnapshotIndex:
+    """
+    Secondary indexes over one dataset snapshot.
+    Built once per snapshot and shared by every query against it.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Dict[str, Any]],
+        hash_fields: Iterable[str] = (),
+        sorted_fields: Iterable[str] = (),
+    ):
+        self.hash: Dict[str, HashIndex] = {
+            field: HashIndex(field, records) for field in hash_fields
+        }
+        self.sorted: Dict[str, SortedIndex] = {
+            field: SortedIndex(field, records) for field in sorted_fields
+        }
+
+        logger.info(
+            "Built indexes (hash=%s, sorted=%s) over %d records",
+            sorted(self.hash),
+            sorted(self.sorted),
+            len(records)
+        )
+
+    # -------------------------
+    # Query Planning
+    # -------------------------
+    def _lookup(self, clause: FilterClause) -> List[int] | None:
+        """
+        Resolve one clause through an index, or None if not indexable.
+        """
+        if clause.op == "eq" and clause.kind == "text":
+            index = self.hash.get(clause.field)
+            return index.lookup((clause.operand,)) if index else None
+
+        if clause.op == "in" and clause.kind == "text":
+            index = self.hash.get(clause.field)
+            return index.lookup(clause.operand) if index else None
+
+        if clause.op in ("gt", "gte", "lt", "lte", "between"):
+            index = self.sorted.get(clause.field)
+            if index is None:
+                return None
+            if clause.operand is None:
+                # Non-comparable bound matches nothing
+                return []
+            if index.kind != clause.kind:
+                return None
+            return index.range(clause.op, clause.operand)
+
+        return None
+
+    def plan(
+        self,
+        clauses: Sequence[FilterClause]
+    ) -> Tuple[List[int] | None, List[FilterClause]]:
+        """
+        Split clauses into an index-resolved candidate set and the
+        residual clauses that still need a scan.
+
+        Returns (ascending candidate positions or None, residual).
+        None means no clause was indexable and a full scan is needed.
+        """
+        candidates: List[Tuple[List[int], bool]] = []
+        residual: List[FilterClause] = []
+
+        for clause in clauses:
+            positions = self._lookup(clause)
+            if positions is None:
+                residual.append(clause)
+            else:
+                ordered = clause.op in ("eq", "in")
+                candidates.append((positions, ordered))
+
+        if not candidates:
+            return None, residual
+
+        candidates.sort(key=lambda item: len(item[0]))
+        smallest, ordered = candidates[0]
+
+        if not ordered:
+            smallest = sorted(smallest)
+
+        for positions, _ in candidates[1:]:
+            if not smallest:
+                break
+            allowed = set(positions)
+            smallest = [p for p in smallest if p in allowed]
+
+        return smallest, residual
@@ -0,0 +1,220 @@
+import keyword
+from typing import List, Dict, Any, Sequence, Tuple, Type
+
+from app.services.filter_compiler import (
+    DATETIME_FIELDS,
+    render_epoch_us,
+    to_epoch_us,
+)
+
+# String fields with at most this many distinct values share one
+# object per value (dictionary encoding)
+MAX_POOLED_VALUES = 1024
+
+
+class Record:
+    """
+    Compact, typed row stored in a dataset snapshot.
+
+    Subclasses are generated per dataset with one slot per field.
+    Datetime fields hold epoch microseconds, numbers stay native and
+    low-cardinality strings are shared. `get()` returns the stored
+    (typed) value; `to_dict()` rebuilds the original JSON form and is
+    only called for rows that end up in a response.
+    """
+
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+    _datetime_fields: frozenset = frozenset()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._field_set:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_set:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._field_set and hasattr(self, key)
+
+    def keys(self) -> List[str]:
+        return [field for field in self._fields if hasattr(self, field)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        datetime_fields = self._datetime_fields
+
+        for field in self._fields:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+
+            if field in datetime_fields and value is not None:
+                value = render_epoch_us(value)
+
+            result[field] = value
+
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+def materialize(record: Any) -> Dict[str, Any]:
+    """
+    Public dict form of a stored record.
+    """
+    return record.to_dict() if isinstance(record, Record) else record
+
+
+# -------------------------
+# Schema Inference
+# -------------------------
+def _field_order(raw: Sequence[Dict[str, Any]]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for record in raw:
+        for key in record:
+            if key not in seen:
+                seen[key] = None
+    return list(seen)
+
+
+def _slot_safe(field: str) -> bool:
+    return (
+        isinstance(field, str)
+        and field.isidentifier()
+        and not keyword.iskeyword(field)
+        and not field.startswith("_")
+        and not hasattr(Record, field)
+    )
+
+
+def _epoch_column(raw: Sequence[Dict[str, Any]], field: str) -> Dict[int, int] | None:
+    """
+    Convert one datetime field to epoch microseconds, keyed by row.
+    Returns None unless every value round-trips exactly, so that
+    `to_dict()` reproduces the original strings.
+    """
+    column: Dict[int, int] = {}
+
+    for position, record in enumerate(raw):
+        value = record.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return None
+
+        epoch = to_epoch_us(value)
+        if epoch is None or render_epoch_us(epoch) != value:
+            return None
+
+        column[position] = epoch
+
+    return column
+
+
+def build_records(raw: List[Dict[str, Any]], name: str = "Row") -> List[Any]:
+    """
+    Convert parsed JSON objects into typed `Record` rows.
+
+    Falls back to the original dicts when the data cannot be
+    represented with slots (non-identifier keys, non-object rows).
+    """
+    if not raw or not all(isinstance(record, dict) for record in raw):
+        return raw
+
+    fields = _field_order(raw)
+    if not all(_slot_safe(field) for field in fields):
+        return raw
+
+    epoch_columns = {}
+    for field in fields:
+        if field in DATETIME_FIELDS:
+            column = _epoch_column(raw, field)
+            if column is not None:
+                epoch_columns[field] = column
+
+    row_class: Type[Record] = type(name, (Record,), {
+        "__slots__": tuple(fields),
+        "_fields": tuple(fields),
+        "_field_set": frozenset(fields),
+        "_datetime_fields": frozenset(epoch_columns),
+    })
+
+    pools: Dict[str, Dict[str, str] | None] = {field: {} for field in fields}
+    rows: List[Record] = []
+    new_row = object.__new__
+
+    for position, record in enumerate(raw):
+        row = new_row(row_class)
+
+        for field, value in record.items():
+            column = epoch_columns.get(field)
+
+            if column is not None:
+                value = column.get(position)
+            elif value.__class__ is str:
+                pool = pools[field]
+                if pool is not None:
+                    shared = pool.get(value)
+                    if shared is None:
+                        if len(pool) >= MAX_POOLED_VALUES:
+                            pools[field] = None
+                        else:
+                            pool[value] = value
+                    else:
+                        value = shared
+
+            setattr(row, field, value)
+
+        rows.append(row)
+
+    return rows
+
+
+def extend_records(existing: List[Any], raw: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Convert appended JSON objects into rows of the same type as
+    `existing`, so both can be filtered and sorted together.
+    """
+    if not existing:
+        return build_records(raw)
+
+    row_class = existing[0].__class__
+    if not issubclass(row_class, Record):
+        return raw
+
+    rows: List[Record] = []
+    new_row = object.__new__
+
+    for record in raw:
+        unknown = set(record) - row_class._field_set
+        if unknown:
+            raise ValueError(f"Unknown fields for {row_class.__name__}: {sorted(unknown)}")
+
+        row = new_row(row_class)
+
+        for field, value in record.items():
+            if field in row_class._datetime_fields and value is not None:
+                epoch = to_epoch_us(value) if isinstance(value, str) else None
+                if epoch is None or render_epoch_us(epoch) != value:
+                    raise ValueError(
+                        f"{field} must be a UTC ISO timestamp like "
+                        f"'{render_epoch_us(0)}', got {value!r}"
+                    )
+                value = epoch
+
+            setattr(row, field, value)
+
+        rows.append(row)
+
+    return rows
@@ -1,16 +1,160 @@
-from app.connectors.crm_connector import CRMConnector
-from app.connectors.support_connector import SupportConnector
-from app.connectors.analytics_connector import AnalyticsConnector
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, List, Type
 
+from app.config import settings
+from app.connectors.base import BaseConnector
+from app.connectors.resources import RESOURCES
 
-CONNECTOR_MAP = {
-    "crm": CRMConnector(),
-    "support": SupportConnector(),
-    "analytics": AnalyticsConnector()
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Built-in connector classes by source, imported on first use so that
+# importing the registry does not load every connector (and NumPy for
+# analytics)
+BUILTIN_CONNECTORS: Dict[str, str] = {
+    "crm": "app.connectors.crm_connector:CRMConnector",
+    "support": "app.connectors.support_connector:SupportConnector",
+    "analytics": "app.connectors.analytics_connector:AnalyticsConnector",
 }
 
+# Installed packages can provide connectors under this entry point
+# group, e.g. `crm = "acme_connectors.salesforce:SalesforceConnector"`
+ENTRY_POINT_GROUP = "universal_data_connector.connectors"
+
+
+def _import(path: str) -> Type[BaseConnector]:
+    module_name, _, class_name = path.partition(":")
+    connector_class = getattr(importlib.import_module(module_name), class_name)
+
+    if not (isinstance(connector_class, type) and issubclass(connector_class, BaseConnector)):
+        raise TypeError(f"{path} is not a BaseConnector subclass")
+
+    return connector_class
+
+
+class ConnectorRegistry:
+    """
+    The one set of connector instances used by /data, /chat and tool
+    execution, so snapshots, indexes and shared resources are built
+    and held once per process.
+
+    Sources resolve, last match winning, from the built-ins, installed
+    plugins (ENTRY_POINT_GROUP) and CONNECTOR_PLUGINS. Connectors are
+    created and started on first use; `warmup()` preloads them all and
+    `shutdown()` stops them and closes shared resources.
+    """
+
+    def __init__(self):
+        self._paths: Dict[str, str] | None = None
+        self._instances: Dict[str, BaseConnector] = {}
+        self._lock = threading.RLock()
+
+    # -------------------------
+    # Discovery
+    # -------------------------
+    def paths(self) -> Dict[str, str]:
+        """
+        {source: "module:Class"} for every known connector.
+        """
+        if self._paths is None:
+            with self._lock:
+                if self._paths is None:
+                    self._paths = self._discover()
+        return self._paths
+
+    @staticmethod
+    def _discover() -> Dict[str, str]:
+        paths = dict(BUILTIN_CONNECTORS)
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            logger.info("Discovered connector plugin %s = %s", entry_point.name, entry_point.value)
+            paths[entry_point.name] = entry_point.value
+
+        paths.update(settings.CONNECTOR_PLUGINS)
+
+        return paths
+
+    def register(self, source: str, path: str) -> None:
+        """
+        Add or replace the connector serving `source`. A running
+        instance of the previous connector is shut down.
+        """
+        with self._lock:
+            self._paths = {**self.paths(), source: path}
+            previous = self._instances.pop(source, None)
+
+        if previous is not None:
+            previous.shutdown()
+
+    def sources(self) -> List[str]:
+        return list(self.paths())
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.paths()
+
+    # -------------------------
+    # Instances
+    # -------------------------
+    def get(self, source: str) -> BaseConnector:
+        connector = self._instances.get(source)
+        if connector is not None:
+            return connector
+
+        path = self.paths().get(source)
+        if path is None:
+            raise ValueError(f"Unknown data source: {source}")
+
+        with self._lock:
+            connector = self._instances.get(source)
+            if connector is None:
+                connector = _import(path)()
+                connector.startup()
+                self._instances[source] = connector
+            return connector
+
+    def all(self) -> Dict[str, BaseConnector]:
+        return {source: self.get(source) for source in self.paths()}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths())
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def shutdown(self) -> None:
+        """
+        Stop every running connector, then close shared resources.
+        Connectors used afterwards are created and started again.
+        """
+        with self._lock:
+            instances = self._instances
+            self._instances = {}
+
+        for source, connector in instances.items():
+            try:
+                connector.shutdown()
+            except Exception:
+                logger.exception("Shutting down %s failed", source)
+
+        RESOURCES.close_all()
+
+
+REGISTRY = ConnectorRegistry()
+
+
+def get_connector(source: str) -> BaseConnector:
+    """
+    The process-wide connector instance for `source`.
+    """
+    return REGISTRY.get(source)
+
 
-def get_connector(source: str):
-    if source not in CONNECTOR_MAP:
-        raise ValueError(f"Unknown data source: {source}")
-    return CONNECTOR_MAP[source]
+def all_connectors() -> Dict[str, BaseConnector]:
+    """
+    Every registered connector, instantiating those not used yet.
+    """
+    return REGISTRY.all()
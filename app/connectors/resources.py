@@ -0,0 +1,62 @@
+import threading
+from typing import Dict, Any, Callable, List, Tuple, TypeVar
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar("T")
+
+
+class SharedResources:
+    """
+    Process-wide, named resources shared by every connector and entry
+    point (HTTP clients, connection pools, remote sessions).
+
+    A resource is created by the first caller to ask for its name and
+    closed, in reverse creation order, when the registry shuts down.
+    Dataset snapshots and their indexes are shared the same way
+    through SNAPSHOT_CACHE.
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, Any] = {}
+        self._closers: List[Tuple[str, Callable[[Any], Any] | None]] = []
+        self._lock = threading.Lock()
+
+    def get(self, name: str, factory: Callable[[], T], close: Callable[[T], Any] | None = None) -> T:
+        resource = self._resources.get(name)
+        if resource is not None:
+            return resource
+
+        with self._lock:
+            resource = self._resources.get(name)
+            if resource is None:
+                resource = factory()
+                self._resources[name] = resource
+                self._closers.append((name, close))
+                logger.info("Created shared resource %s", name)
+            return resource
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._resources)
+
+    def close_all(self) -> None:
+        with self._lock:
+            closers = list(reversed(self._closers))
+            resources = self._resources
+            self._resources = {}
+            self._closers = []
+
+        for name, close in closers:
+            if close is None:
+                continue
+            try:
+                close(resources[name])
+            except Exception:
+                logger.exception("Closing shared resource %s failed", name)
+
+
+RESOURCES = SharedResources()
@@ -0,0 +1,283 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from app.connectors.timeseries import (
+    ColumnarStore,
+    MetricSeries,
+    bucket_starts,
+    resample,
+    series_points,
+)
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Finest to coarsest
+GRANULARITIES = ("day", "week", "month")
+
+# Functions that can be composed from (count, sum, min, max) partials
+ROLLUP_FUNCTIONS = {"sum", "avg", "min", "max", "count"}
+
+
+def _bucket_end(start_us: int, granularity: str) -> int:
+    """
+    Exclusive end of the bucket starting at `start_us`.
+    """
+    day = 86_400 * 1_000_000
+
+    if granularity == "day":
+        return start_us + day
+    if granularity == "week":
+        return start_us + 7 * day
+
+    month = np.array([start_us // day], dtype="datetime64[D]").astype("datetime64[M]")
+    return int((month + 1).astype("datetime64[D]").astype(np.int64)[0]) * day
+
+
+class RollupTable:
+    """
+    Pre-aggregated buckets for one metric at one granularity.
+    Parallel lists sorted by bucket start; only non-empty buckets exist.
+    """
+
+    __slots__ = ("granularity", "starts", "ends", "counts", "totals", "mins", "maxs")
+
+    def __init__(self, granularity: str):
+        self.granularity = granularity
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.counts: List[int] = []
+        self.totals: List[float] = []
+        self.mins: List[float] = []
+        self.maxs: List[float] = []
+
+    @classmethod
+    def from_series(cls, series: MetricSeries, granularity: str) -> "RollupTable":
+        table = cls(granularity)
+
+        if len(series) == 0:
+            return table
+
+        starts, totals, counts = resample(series.timestamps, series.values, granularity, "sum")
+        _, mins, _ = resample(series.timestamps, series.values, granularity, "min")
+        _, maxs, _ = resample(series.timestamps, series.values, granularity, "max")
+
+        table.starts = starts.tolist()
+        table.ends = [_bucket_end(start, granularity) for start in table.starts]
+        table.counts = counts.tolist()
+        table.totals = totals.tolist()
+        table.mins = mins.tolist()
+        table.maxs = maxs.tolist()
+        return table
+
+    def copy(self) -> "RollupTable":
+        table = RollupTable(self.granularity)
+        table.starts = list(self.starts)
+        table.ends = list(self.ends)
+        table.counts = list(self.counts)
+        table.totals = list(self.totals)
+        table.mins = list(self.mins)
+        table.maxs = list(self.maxs)
+        return table
+
+    def add(self, timestamp_us: int, value: float) -> None:
+        """
+        Fold one point into its bucket, creating the bucket if needed.
+        """
+        start = int(bucket_starts(np.array([timestamp_us], dtype=np.int64), self.granularity)[0])
+        i = bisect_left(self.starts, start)
+
+        if i < len(self.starts) and self.starts[i] == start:
+            self.counts[i] += 1
+            self.totals[i] += value
+            self.mins[i] = min(self.mins[i], value)
+            self.maxs[i] = max(self.maxs[i], value)
+            return
+
+        self.starts.insert(i, start)
+        self.ends.insert(i, _bucket_end(start, self.granularity))
+        self.counts.insert(i, 1)
+        self.totals.insert(i, value)
+        self.mins.insert(i, value)
+        self.maxs.insert(i, value)
+
+    def covered(self, start_us: int | None, end_us: int | None) -> Tuple[int, int]:
+        """
+        Index range [lo, hi) of buckets lying entirely inside the
+        inclusive window [start_us, end_us].
+        """
+        lo = 0 if start_us is None else bisect_left(self.starts, start_us)
+        hi = len(self.ends) if end_us is None else bisect_right(self.ends, end_us + 1)
+        return lo, max(lo, hi)
+
+
+class RollupStore:
+    """
+    Per-metric day/week/month rollups of an analytics snapshot.
+
+    Built once per snapshot from the columnar store and updated point
+    by point when new data is ingested. Queries combine fully covered
+    buckets with the raw points at the window edges, so answers are
+    exact for any window.
+    """
+
+    def __init__(self, tables: Dict[Tuple[str, str], RollupTable]):
+        self.tables = tables
+
+    @classmethod
+    def from_columnar(cls, store: ColumnarStore) -> "RollupStore":
+        tables = {
+            (metric, granularity): RollupTable.from_series(series, granularity)
+            for metric, series in store.series.items()
+            for granularity in GRANULARITIES
+        }
+
+        logger.info(
+            "Built analytics rollups (%d metrics x %s)",
+            len(store.series),
+            "/".join(GRANULARITIES)
+        )
+
+        return cls(tables)
+
+    def extended(self, records: Iterable[Any], start: int) -> "RollupStore":
+        """
+        New store with appended `records` folded in bucket by bucket.
+        Only tables touched by the new points are copied; the previous
+        store stays valid for queries already running against it.
+        """
+        tables = dict(self.tables)
+        copied = set()
+
+        for metric, timestamp_us, value, _ in series_points(records, start):
+            for granularity in GRANULARITIES:
+                key = (metric, granularity)
+
+                if key not in copied:
+                    table = tables.get(key)
+                    tables[key] = table.copy() if table else RollupTable(granularity)
+                    copied.add(key)
+
+                tables[key].add(timestamp_us, value)
+
+        return RollupStore(tables)
+
+    # -------------------------
+    # Query Routing
+    # -------------------------
+    def route(
+        self,
+        metric: str,
+        start_us: int | None,
+        end_us: int | None,
+        period: str | None = None
+    ) -> RollupTable | None:
+        """
+        Coarsest table with at least one bucket fully inside the window.
+        A resampled query can only use the table of its own period.
+        """
+        candidates = (period,) if period else tuple(reversed(GRANULARITIES))
+
+        for granularity in candidates:
+            table = self.tables.get((metric, granularity))
+            if table is None:
+                continue
+            lo, hi = table.covered(start_us, end_us)
+            if hi > lo:
+                return table
+
+        return None
+
+
+def combine(
+    function: str,
+    count: int,
+    total: float,
+    minimum: float,
+    maximum: float
+) -> float:
+    if function == "count":
+        return float(count)
+    if function == "sum":
+        return total
+    if function == "avg":
+        return total / count if count else float("nan")
+    if function == "min":
+        return minimum
+    return maximum
+
+
+def _partials(values: np.ndarray) -> Tuple[int, float, float, float]:
+    if len(values) == 0:
+        return 0, 0.0, float("inf"), float("-inf")
+    return len(values), float(values.sum()), float(values.min()), float(values.max())
+
+
+def answer_from_rollup(
+    table: RollupTable,
+    series: MetricSeries,
+    function: str,
+    start_us: int | None,
+    end_us: int | None,
+    period: str | None = None
+) -> List[Tuple[int | None, float, int]]:
+    """
+    Evaluate an aggregate using `table` for covered buckets and the
+    raw series only for the partial buckets at the window edges.
+
+    Returns [(bucket_start or None, value, count)]: one row per bucket
+    when resampling by `period`, otherwise a single row.
+    """
+    lo, hi = table.covered(start_us, end_us)
+
+    window = series.window(start_us, end_us)
+    stamps = series.timestamps[window]
+    values = series.values[window]
+
+    inner_lo = int(np.searchsorted(stamps, table.starts[lo], "left"))
+    inner_hi = int(np.searchsorted(stamps, table.ends[hi - 1], "left"))
+
+    head = values[:inner_lo]
+    tail = values[inner_hi:]
+
+    if period is None:
+        count, total, minimum, maximum = 0, 0.0, float("inf"), float("-inf")
+
+        for c, t, mn, mx in (_partials(head), _partials(tail)):
+            count += c
+            total += t
+            minimum = min(minimum, mn)
+            maximum = max(maximum, mx)
+
+        count += sum(table.counts[lo:hi])
+        total += sum(table.totals[lo:hi])
+        minimum = min([minimum] + table.mins[lo:hi])
+        maximum = max([maximum] + table.maxs[lo:hi])
+
+        return [(None, combine(function, count, total, minimum, maximum), count)]
+
+    rows: List[Tuple[int | None, float, int]] = []
+
+    # Edge points each fall into a single (partially covered) bucket
+    if len(head):
+        c, t, mn, mx = _partials(head)
+        start = int(bucket_starts(stamps[:1], period)[0])
+        rows.append((start, combine(function, c, t, mn, mx), c))
+
+    for i in range(lo, hi):
+        rows.append((
+            table.starts[i],
+            combine(function, table.counts[i], table.totals[i], table.mins[i], table.maxs[i]),
+            table.counts[i]
+        ))
+
+    if len(tail):
+        c, t, mn, mx = _partials(tail)
+        start = int(bucket_starts(stamps[inner_hi:inner_hi + 1], period)[0])
+        rows.append((start, combine(function, c, t, mn, mx), c))
+
+    return rows
@@ -0,0 +1,248 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Iterable, Callable, Hashable, TypeVar
+
+from app.connectors.indexes import SnapshotIndex
+from app.connectors.records import build_records, extend_records, materialize
+from app.utils.executor import run_blocking
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+MISSING_VERSION = "missing"
+
+T = TypeVar("T")
+
+
+class DatasetSnapshot:
+    """
+    Immutable, parsed view of a dataset file.
+
+    `version` changes whenever the underlying file changes
+    (inode, size or mtime), so downstream caches can key on it.
+    Records are compact typed rows (see app.connectors.records),
+    shared between callers and must be treated as read-only.
+    """
+
+    __slots__ = ("path", "version", "records", "signature", "appended", "_derived", "_lock")
+
+    def __init__(
+        self,
+        path: Path,
+        version: str,
+        records: List[Any],
+        signature: Tuple[int, int, int] | None,
+        appended: int = 0,
+    ):
+        self.path = path
+        self.version = version
+        self.records = records
+        self.signature = signature
+        self.appended = appended  # records ingested on top of the file
+        self._derived: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def derive(self, key: Hashable, factory: Callable[["DatasetSnapshot"], T]) -> T:
+        """
+        Structure computed from this snapshot (indexes, columnar views),
+        built once on first use and dropped with the snapshot.
+
+        Derived objects that define `extended(records, start)` are
+        carried over incrementally when records are appended; others
+        are rebuilt lazily on the next snapshot.
+        """
+        value = self._derived.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            value = self._derived.get(key)
+            if value is None:
+                value = factory(self)
+                self._derived[key] = value
+            return value
+
+    def index(
+        self,
+        hash_fields: Iterable[str] = (),
+        sorted_fields: Iterable[str] = ()
+    ) -> SnapshotIndex:
+        """
+        Secondary indexes for this snapshot, built on first use.
+        """
+        fields = (tuple(sorted(hash_fields)), tuple(sorted(sorted_fields)))
+
+        return self.derive(
+            ("index",) + fields,
+            lambda snapshot: SnapshotIndex(snapshot.records, *fields)
+        )
+
+    def extended(self, raw: List[Dict[str, Any]]) -> "DatasetSnapshot":
+        """
+        New snapshot with `raw` records appended and a new version.
+        """
+        rows = extend_records(self.records, raw)
+        start = len(self.records)
+        appended = self.appended + len(rows)
+        base_version = self.version.split("+", 1)[0]
+
+        snapshot = DatasetSnapshot(
+            self.path,
+            f"{base_version}+{appended}",
+            self.records + rows,
+            self.signature,
+            appended,
+        )
+
+        with self._lock:
+            derived = dict(self._derived)
+
+        for key, value in derived.items():
+            extend = getattr(value, "extended", None)
+            if extend is not None:
+                snapshot._derived[key] = extend(rows, start)
+
+        return snapshot
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Materialize every record in its original JSON form.
+        """
+        return [materialize(record) for record in self.records]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class SnapshotCache:
+    """
+    Process-wide cache of parsed dataset files.
+
+    Entries are keyed on the resolved file path and validated against
+    the file's (inode, size, mtime_ns) signature on every lookup. The
+    file is only re-parsed when that signature changes.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[Path, DatasetSnapshot] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+    def get(self, path: Path) -> DatasetSnapshot:
+        key = Path(path).resolve()
+
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.signature is None:
+                # Records ingested without a backing file
+                return snapshot
+            return DatasetSnapshot(key, MISSING_VERSION, [], None)
+
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.signature == signature:
+                return snapshot
+
+            snapshot = self._load(key, signature)
+            self._snapshots[key] = snapshot
+            return snapshot
+
+    async def aget(self, path: Path) -> DatasetSnapshot:
+        """
+        Async variant of `get`: a cached, unchanged snapshot is returned
+        inline; reading and parsing a changed file runs on the
+        blocking executor.
+        """
+        key = Path(path).resolve()
+        snapshot = self._snapshots.get(key)
+
+        if snapshot is not None and snapshot.signature is not None:
+            try:
+                stat = os.stat(key)
+            except FileNotFoundError:
+                stat = None
+
+            if stat is not None and snapshot.signature == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+                return snapshot
+
+        return await run_blocking(self.get, key)
+
+    def version(self, path: Path) -> str:
+        return self.get(path).version
+
+    def append(self, path: Path, raw: List[Dict[str, Any]]) -> DatasetSnapshot:
+        """
+        Ingest records on top of the current snapshot of `path`.
+
+        The file is not rewritten: appended records live in memory
+        until the file itself changes and is re-parsed.
+        """
+        key = Path(path).resolve()
+        current = self.get(key)
+
+        with self._lock:
+            current = self._snapshots.get(key, current)
+            snapshot = current.extended(raw)
+            self._snapshots[key] = snapshot
+
+        logger.info(
+            "Appended %d records to snapshot %s (version=%s)",
+            len(raw),
+            key.name,
+            snapshot.version
+        )
+
+        return snapshot
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def invalidate(self, path: Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(Path(path).resolve(), None)
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    @staticmethod
+    def _load(path: Path, signature: Tuple[int, int, int]) -> DatasetSnapshot:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix == ".ndjson":
+                raw = [json.loads(line) for line in f if line.strip()]
+            else:
+                raw = json.load(f)
+
+        row_name = path.stem.title().replace("_", "") + "Record"
+        records = build_records(raw, name=row_name)
+
+        version = "{:x}-{:x}-{:x}".format(*signature)
+
+        logger.info(
+            "Loaded snapshot %s (version=%s, records=%d)",
+            path.name,
+            version,
+            len(records)
+        )
+
+        return DatasetSnapshot(path, version, records, signature)
+
+
+SNAPSHOT_CACHE = SnapshotCache()
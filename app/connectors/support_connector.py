@@ -1,17 +1,21 @@
-import json
 from pathlib import Path
 from typing import List, Dict, Any
 
+from app.config import settings
 from app.connectors.base import BaseConnector
 from app.models.common import DataType
 
 
-DATA_PATH = Path("data/support_tickets.json")
+DATA_PATH = Path(settings.DATA_DIR) / f"support_tickets.{settings.DATA_FORMAT}"
 
 
 class SupportConnector(BaseConnector):
     source_name = "support"
     data_type = DataType.TABULAR
+    data_path = DATA_PATH
+    hash_index_fields = ("id", "customer_id", "status", "priority")
+    sorted_index_fields = ("created_at",)
+    time_field = "created_at"
 
     # -------------------------
     # Data Fetching
@@ -19,14 +23,9 @@ class SupportConnector(BaseConnector):
     def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """
         Load support ticket data from JSON file.
+        Served from the shared snapshot cache.
         """
-        if not DATA_PATH.exists():
-            return []
-
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        return data
+        return self.snapshot().to_dicts()
 
     # -------------------------
     # Freshness Indicator
@@ -0,0 +1,271 @@
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from app.services.filter_compiler import to_epoch_us, to_number
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+US_PER_DAY = 86_400 * 1_000_000
+
+AGGREGATE_FUNCTIONS = ("sum", "avg", "min", "max", "count", "percentile")
+RESAMPLE_PERIODS = ("day", "week", "month")
+
+
+class MetricSeries:
+    """
+    One metric as parallel NumPy columns, sorted by timestamp.
+    Timestamps are int64 epoch microseconds, values float64 and
+    positions the index of each point in the snapshot's record list.
+    """
+
+    __slots__ = ("metric_name", "timestamps", "values", "positions")
+
+    def __init__(
+        self,
+        metric_name: str,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        positions: np.ndarray,
+    ):
+        self.metric_name = metric_name
+        self.timestamps = timestamps
+        self.values = values
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def window(self, start_us: int | None = None, end_us: int | None = None) -> slice:
+        """
+        Binary-search the sorted timestamps for [start_us, end_us].
+        Both bounds are inclusive; None leaves that side open.
+        """
+        lo = 0 if start_us is None else int(np.searchsorted(self.timestamps, start_us, "left"))
+        hi = len(self.timestamps) if end_us is None else int(np.searchsorted(self.timestamps, end_us, "right"))
+        return slice(lo, max(lo, hi))
+
+
+def series_points(
+    records: Iterable[Any],
+    start: int = 0
+) -> Iterable[Tuple[str, int, float, int]]:
+    """
+    Yield (metric, epoch_us, value, position) for every usable point.
+    Records lacking a parseable timestamp or numeric value are skipped.
+    """
+    for position, record in enumerate(records, start):
+        metric = record.get("metric_name")
+        timestamp = record.get("timestamp")
+        value = record.get("value")
+
+        if metric is None or timestamp is None or value is None:
+            continue
+
+        timestamp = to_epoch_us(timestamp)
+        value = to_number(value)
+        if timestamp is None or value is None:
+            continue
+
+        yield metric, timestamp, value, position
+
+
+class ColumnarStore:
+    """
+    Per-metric columnar view of an analytics snapshot.
+    Built once per snapshot; records lacking a parseable timestamp
+    or numeric value are left out.
+    """
+
+    def __init__(self, series: Dict[str, MetricSeries]):
+        self.series = series
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "ColumnarStore":
+        columns: Dict[str, Tuple[List[int], List[float], List[int]]] = {}
+
+        for metric, timestamp, value, position in series_points(records):
+            stamps, values, positions = columns.setdefault(metric, ([], [], []))
+            stamps.append(timestamp)
+            values.append(value)
+            positions.append(position)
+
+        series = {}
+        for metric, (stamps, values, positions) in columns.items():
+            stamps_array = np.asarray(stamps, dtype=np.int64)
+            order = np.argsort(stamps_array, kind="stable")
+            series[metric] = MetricSeries(
+                metric,
+                stamps_array[order],
+                np.asarray(values, dtype=np.float64)[order],
+                np.asarray(positions, dtype=np.int64)[order]
+            )
+
+        logger.info(
+            "Built columnar analytics store (%d metrics, %d points)",
+            len(series),
+            sum(len(s) for s in series.values())
+        )
+
+        return cls(series)
+
+    def metrics(self) -> List[str]:
+        return sorted(self.series)
+
+    def extended(self, records: Iterable[Any], start: int) -> "ColumnarStore":
+        """
+        New store with appended `records` (snapshot positions from
+        `start`) merged into their metrics' sorted columns.
+        """
+        columns: Dict[str, Tuple[List[int], List[float], List[int]]] = {}
+
+        for metric, timestamp, value, position in series_points(records, start):
+            stamps, values, positions = columns.setdefault(metric, ([], [], []))
+            stamps.append(timestamp)
+            values.append(value)
+            positions.append(position)
+
+        series = dict(self.series)
+
+        for metric, (stamps, values, positions) in columns.items():
+            current = series.get(metric)
+            stamps_array = np.asarray(stamps, dtype=np.int64)
+            values_array = np.asarray(values, dtype=np.float64)
+            positions_array = np.asarray(positions, dtype=np.int64)
+
+            if current is not None:
+                stamps_array = np.concatenate((current.timestamps, stamps_array))
+                values_array = np.concatenate((current.values, values_array))
+                positions_array = np.concatenate((current.positions, positions_array))
+
+            order = np.argsort(stamps_array, kind="stable")
+            series[metric] = MetricSeries(
+                metric,
+                stamps_array[order],
+                values_array[order],
+                positions_array[order]
+            )
+
+        return ColumnarStore(series)
+
+
+# -------------------------
+# Vectorized Reductions
+# -------------------------
+def reduce_values(
+    values: np.ndarray,
+    function: str,
+    percentile: float | None = None
+) -> float:
+    """
+    Reduce a value column to a single number.
+    """
+    if function == "count":
+        return float(len(values))
+
+    if len(values) == 0:
+        return 0.0 if function == "sum" else float("nan")
+
+    if function == "sum":
+        return float(values.sum())
+    if function == "avg":
+        return float(values.mean())
+    if function == "min":
+        return float(values.min())
+    if function == "max":
+        return float(values.max())
+    if function == "percentile":
+        return float(np.percentile(values, 50.0 if percentile is None else percentile))
+
+    raise ValueError(f"Unsupported aggregate function: {function}")
+
+
+def bucket_starts(timestamps: np.ndarray, period: str) -> np.ndarray:
+    """
+    Map epoch-microsecond timestamps to the start of their bucket
+    (UTC day, ISO week starting Monday, or calendar month), also in
+    epoch microseconds.
+    """
+    days = timestamps // US_PER_DAY
+
+    if period == "day":
+        return days * US_PER_DAY
+
+    if period == "week":
+        # 1970-01-01 was a Thursday: shift so weeks start on Monday
+        return ((days + 3) // 7 * 7 - 3) * US_PER_DAY
+
+    if period == "month":
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        return months.astype("datetime64[D]").astype(np.int64) * US_PER_DAY
+
+    raise ValueError(f"Unsupported resample period: {period}")
+
+
+def resample(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    period: str,
+    function: str,
+    percentile: float | None = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group a time-sorted series into periods and reduce each bucket.
+    Returns (bucket_start_us, aggregated_value, point_count).
+    """
+    if len(timestamps) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.empty(0, dtype=np.float64), empty
+
+    starts = bucket_starts(timestamps, period)
+
+    # Sorted input means each bucket is one contiguous run
+    boundaries = np.flatnonzero(np.diff(starts)) + 1
+    offsets = np.concatenate(([0], boundaries))
+    counts = np.diff(np.concatenate((offsets, [len(starts)])))
+
+    if function == "sum":
+        result = np.add.reduceat(values, offsets)
+    elif function == "avg":
+        result = np.add.reduceat(values, offsets) / counts
+    elif function == "min":
+        result = np.minimum.reduceat(values, offsets)
+    elif function == "max":
+        result = np.maximum.reduceat(values, offsets)
+    elif function == "count":
+        result = counts.astype(np.float64)
+    elif function == "percentile":
+        q = 50.0 if percentile is None else percentile
+        result = np.array([
+            np.percentile(chunk, q)
+            for chunk in np.split(values, boundaries)
+        ])
+    else:
+        raise ValueError(f"Unsupported aggregate function: {function}")
+
+    return starts[offsets], result, counts
+
+
+def select_window(
+    series: MetricSeries,
+    window: slice = slice(None),
+    masks: Sequence[np.ndarray] = ()
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Slice a series to a time window, then apply boolean masks
+    computed over that slice.
+    """
+    timestamps = series.timestamps[window]
+    values = series.values[window]
+
+    if not masks:
+        return timestamps, values
+
+    mask = masks[0]
+    for other in masks[1:]:
+        mask = mask & other
+
+    return timestamps[mask], values[mask]
@@ -0,0 +1,214 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Hashable, Tuple
+
+from app.config import settings
+from app.connectors.registry import get_connector
+from app.services.result_cache import ttl_for_freshness
+from app.utils.deadline import degraded_stages
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """
+    Cache key for a user message: case, punctuation and spacing do
+    not matter ("How many critical tickets?" == "how many critical tickets").
+    """
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", message.lower())).strip()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU map bounded by entry count, with per-entry expiry
+    and an optional validity check on lookup.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, valid: Callable[[Any], bool] | None = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+        # Validity checks may touch connectors: run them unlocked
+        if valid is not None and not valid(value):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic() + ttl)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class ChatTurn:
+    """
+    What one pass through the chat loop did, for caching: the tool
+    calls of the first round and the outcome of every tool call.
+    """
+
+    __slots__ = ("message", "key", "first_calls", "outcomes")
+
+    def __init__(self, message: str):
+        self.message = message
+        self.key = normalize_message(message)
+        self.first_calls: List[Any] = []
+        self.outcomes: List[Tuple[Dict[str, Any], Any, Any]] = []
+
+
+class ChatCache:
+    """
+    Two caches in front of the LLM loop, both keyed by the normalized
+    user message:
+
+    - plans: the tool calls the model chose in its first round, so a
+      repeated question skips the first completion (CHAT_PLAN_TTL
+      bounds how long relative phrases like "today" are trusted)
+    - answers: final answers, reused while every connector the turn
+      queried still serves the same snapshot version and the shortest
+      of their freshness windows has not passed
+    """
+
+    def __init__(self, max_plans: int, max_answers: int):
+        self.plans = LRUCache(max_plans)
+        self.answers = LRUCache(max_answers)
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+    def plan(self, message: str) -> List[Dict[str, str]] | None:
+        if not settings.CHAT_CACHE_ENABLED:
+            return None
+        return self.plans.get(normalize_message(message))
+
+    def answer(self, message: str) -> str | None:
+        if not settings.CHAT_CACHE_ENABLED:
+            return None
+
+        entry = self.answers.get(normalize_message(message), valid=self._current)
+        if entry is None:
+            return None
+
+        logger.info("Chat answer served from cache")
+        return entry[0]
+
+    @staticmethod
+    def _current(entry: Tuple[str, Dict[str, str]]) -> bool:
+        _, versions = entry
+        return all(
+            get_connector(source).cache_version() == version
+            for source, version in versions.items()
+        )
+
+    # -------------------------
+    # Store
+    # -------------------------
+    def remember(self, turn: ChatTurn, answer: str | None) -> None:
+        if not settings.CHAT_CACHE_ENABLED or not turn.outcomes:
+            return
+
+        # A failed call may succeed next time: cache nothing
+        if any(result is None for _, _, result in turn.outcomes):
+            return
+
+        self.plans.put(
+            turn.key,
+            [
+                {"name": call.function.name, "arguments": call.function.arguments}
+                for call in turn.first_calls
+            ],
+            settings.CHAT_PLAN_TTL
+        )
+
+        # Answers cut short by a deadline are not the answer to keep
+        if not answer or degraded_stages():
+            return
+
+        versions: Dict[str, str] = {}
+        ttl = float("inf")
+
+        for _, query, result in turn.outcomes:
+            source = query.source.value
+            version = get_connector(source).cache_version()
+            if version is None:
+                return
+            versions[source] = version
+            ttl = min(ttl, ttl_for_freshness(result.metadata.freshness))
+
+        self.answers.put(turn.key, (answer, versions), ttl)
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def clear(self) -> None:
+        self.plans.clear()
+        self.answers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"plans": self.plans.stats(), "answers": self.answers.stats()}
+
+
+CHAT_CACHE = ChatCache(settings.CHAT_PLAN_CACHE_SIZE, settings.CHAT_ANSWER_CACHE_SIZE)
@@ -0,0 +1,111 @@
+import threading
+from typing import List, Dict, Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.models.common import DataQuery, DataResponse
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FastPathRule(BaseModel):
+    """
+    A query shape whose connector `context` is trusted as the final
+    answer, so the second LLM completion can be skipped.
+    """
+    source: str
+    filter_fields: List[str] = Field(
+        default_factory=list,
+        description="Fields the query may filter on (any operator)"
+    )
+    aggregate: bool | None = Field(
+        default=None,
+        description="True: aggregate queries only, False: never, None: either"
+    )
+
+    def matches(self, query: DataQuery) -> bool:
+        if query.source.value != self.source:
+            return False
+
+        if self.aggregate is not None and (query.aggregate is not None) != self.aggregate:
+            return False
+
+        allowed = set(self.filter_fields)
+        return all(
+            key.split("__", 1)[0] in allowed
+            for key in (query.filters or {})
+        )
+
+
+class FastPath:
+    """
+    Answers a turn straight from the connector's voice context when
+    its single tool call matches a configured rule (FAST_PATH_RULES).
+
+    Only the first tool round is eligible, and only for a single tool
+    call with voice context enabled whose result is complete (first
+    page, nothing cut by `limit`): anything else needs the model to
+    combine or rephrase results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._raw_rules: List[Dict[str, Any]] | None = None
+        self._rules: List[FastPathRule] = []
+
+        self.considered = 0
+        self.fired = 0
+        self.fired_by_source: Dict[str, int] = {}
+
+    def rules(self) -> List[FastPathRule]:
+        raw = settings.FAST_PATH_RULES
+        if raw is not self._raw_rules:
+            self._rules = [FastPathRule.model_validate(rule) for rule in raw]
+            self._raw_rules = raw
+        return self._rules
+
+    def answer(self, query: DataQuery, result: DataResponse | None) -> str | None:
+        """
+        The final answer for a single-tool-call turn, or None when the
+        LLM should phrase it.
+        """
+        if not settings.FAST_PATH_ENABLED:
+            return None
+
+        with self._lock:
+            self.considered += 1
+
+        if (
+            result is None
+            or not result.context
+            or not query.voice_context
+            or query.offset
+            or result.metadata.returned_results != result.metadata.total_results
+            or not any(rule.matches(query) for rule in self.rules())
+        ):
+            return None
+
+        source = query.source.value
+
+        with self._lock:
+            self.fired += 1
+            self.fired_by_source[source] = self.fired_by_source.get(source, 0) + 1
+
+        logger.info("Fast path answered %s query from connector context", source)
+
+        return result.context
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "considered": self.considered,
+                "fired": self.fired,
+                "fire_rate": self.fired / self.considered if self.considered else 0.0,
+                "fired_by_source": dict(self.fired_by_source),
+            }
+
+
+FAST_PATH = FastPath()
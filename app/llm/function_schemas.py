@@ -11,7 +11,7 @@ QUERY_DATA_FUNCTION = {
             },
             "filters": {
                 "type": "object",
-                "description": "Filtering conditions such as metric_name, status, priority, lifetime_value__gt, etc.",
+                "description": "Filtering conditions such as metric_name, status, priority, lifetime_value__gt, etc. Operators are appended as field__op: gt, gte, lt, lte, ne, in (comma-separated), contains, between (low,high). created_at and timestamp accept ISO dates.",
                 "additionalProperties": {
                     "type": ["string", "number", "boolean"]
                 }
@@ -26,6 +26,30 @@ QUERY_DATA_FUNCTION = {
                 "description": "Pagination offset.",
                 "default": 0
             },
+            "start_date": {
+                "type": "string",
+                "format": "date-time",
+                "description": "Inclusive start of the time window (ISO 8601)."
+            },
+            "end_date": {
+                "type": "string",
+                "format": "date-time",
+                "description": "Inclusive end of the time window (ISO 8601)."
+            },
+            "aggregate": {
+                "type": "string",
+                "enum": ["sum", "avg", "min", "max", "count", "percentile"],
+                "description": "Analytics only: aggregate values instead of returning raw data points."
+            },
+            "percentile": {
+                "type": "number",
+                "description": "Percentile (0-100) used when aggregate is 'percentile'."
+            },
+            "period": {
+                "type": "string",
+                "enum": ["day", "week", "month"],
+                "description": "Analytics only: resample the aggregate per period."
+            },
             "voice_context": {
                 "type": "boolean",
                 "description": "Whether to optimize the response for voice interaction.",
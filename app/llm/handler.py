@@ -1,90 +1,707 @@
+import asyncio
 import json
 import os
-from groq import Groq
-from dotenv import load_dotenv
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Dict, Any, AsyncIterator, Tuple
 from app.llm.function_schemas import QUERY_DATA_FUNCTION
+from app.llm.chat_cache import CHAT_CACHE, ChatTurn
+from app.llm.fast_path import FAST_PATH
+from app.llm.prefetch import PREFETCHER, Speculation
+from app.llm.result_encoder import encode_tool_result
 from app.models.common import DataQuery
 from app.connectors.registry import get_connector  # You should have this
 from app.models.common import DataResponse
+from app.config import settings
+from app.utils.deadline import DeadlineExceeded, below, degrade, degraded_stages, remaining
+from app.utils.executor import map_blocking, run_blocking
+from app.utils.metrics import (
+    CHAT_TURN_SECONDS,
+    CONNECTOR_STAGE_SECONDS,
+    LLM_ERRORS_TOTAL,
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_REQUEST_SECONDS,
+    record_usage,
+)
 import logging
 logger = logging.getLogger(__name__)
 
-load_dotenv("settings.env")
+# -------------------------
+# Groq Clients
+# -------------------------
+# `client` and `async_client` are created on first use: importing the
+# SDK and building its HTTP clients is a large share of startup time.
+_CLIENT_NAMES = ("client", "async_client")
+_client_lock = threading.Lock()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+def _create_client(name: str):
+    import groq
+    from dotenv import load_dotenv
+
+    load_dotenv("settings.env")
+
+    client_class = groq.Groq if name == "client" else groq.AsyncGroq
+    return client_class(
+        api_key=os.getenv("GROQ_API_KEY"),
+        base_url=settings.LLM_BASE_URL,
+        max_retries=settings.LLM_MAX_RETRIES
+    )
+
+
+def __getattr__(name: str):
+    if name not in _CLIENT_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _client_lock:
+        if name not in globals():
+            globals()[name] = _create_client(name)
+        return globals()[name]
+
+
+def _client(name: str):
+    # Module globals first, so tests can patch the clients
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
+
+def _is_timeout(error: Exception) -> bool:
+    from groq import APITimeoutError
+    return isinstance(error, APITimeoutError)
+
+
+MODEL = "llama-3.1-8b-instant"
+
+TOOLS = [{
+    "type": "function",
+    "function": QUERY_DATA_FUNCTION
+}]
+
+
+class _AnswerFromContext(Exception):
+    """
+    Ends a turn early with the connector contexts as the answer, when
+    the request deadline leaves no room for another LLM call.
+    """
+
+    def __init__(self, answer: str):
+        super().__init__(answer)
+        self.answer = answer
 
 
 class LLMHandler:
 
+    # -------------------------
+    # Shared Message Helpers
+    # -------------------------
     @staticmethod
-    def process_user_message(user_message: str) -> str:
+    def _initial_messages(user_message: str) -> List[Dict[str, Any]]:
+        return [
+            {"role": "system", "content": "You are a business data assistant."},
+            {"role": "user", "content": user_message}
+        ]
+
+    @staticmethod
+    def _parse_tool_call(tool_call) -> DataQuery:
+        function_name = tool_call.function.name
+        arguments = json.loads(tool_call.function.arguments)
+
+        logger.debug("Function call detected: %s", function_name)
+        logger.debug("Function arguments: %s", arguments)
+
+        return DataQuery(**arguments)
+
+    @staticmethod
+    def _tool_message(tool_call, source: str, result: DataResponse) -> Dict[str, Any]:
+        # Log row count safely
+        if hasattr(result, "data") and isinstance(result.data, list):
+            logger.debug("Filtered rows count: %d", len(result.data))
+        else:
+            logger.debug("Data returned from connector")
+
+        started = time.perf_counter()
+        content = encode_tool_result(source, result)
+
+        if settings.METRICS_ENABLED:
+            CONNECTOR_STAGE_SECONDS.observe(time.perf_counter() - started, source, "serialize")
+
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": content
+        }
+
+    @staticmethod
+    def _tool_error(tool_call, error: Exception) -> Dict[str, Any]:
+        logger.warning("Tool call %s failed: %s", tool_call.id, error)
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": json.dumps({"error": str(error)})
+        }
+
+    @staticmethod
+    def _run_tool_call(
+        tool_call,
+        speculation: Speculation | None = None
+    ) -> Tuple[Dict[str, Any], DataQuery | None, DataResponse | None]:
         """
-        Full LLM → Function Call → Backend → LLM loop
+        Returns the tool message for the LLM, the parsed query and the
+        connector result (None when the call failed). A matching
+        speculative prefetch supplies the result when available.
         """
+        data_query = None
+        try:
+            data_query = LLMHandler._parse_tool_call(tool_call)
+            result = PREFETCHER.claim(speculation, data_query)
+            if result is None:
+                logger.debug("Executing connector for source: %s", data_query.source)
+                result = get_connector(data_query.source).execute(data_query)
+        except (ValueError, TypeError, DeadlineExceeded) as e:
+            return LLMHandler._tool_error(tool_call, e), data_query, None
+        return LLMHandler._tool_message(tool_call, data_query.source.value, result), data_query, result
 
-        logger.info("Processing user message: %s", user_message)
+    @staticmethod
+    async def _arun_tool_call(
+        tool_call,
+        speculation: Speculation | None = None
+    ) -> Tuple[Dict[str, Any], DataQuery | None, DataResponse | None]:
+        data_query = None
+        try:
+            data_query = LLMHandler._parse_tool_call(tool_call)
+            result = await PREFETCHER.aclaim(speculation, data_query)
+            if result is None:
+                logger.debug("Executing connector for source: %s", data_query.source)
+                result = await get_connector(data_query.source).aexecute(data_query)
+        except (ValueError, TypeError, DeadlineExceeded) as e:
+            return LLMHandler._tool_error(tool_call, e), data_query, None
+        return LLMHandler._tool_message(tool_call, data_query.source.value, result), data_query, result
 
-        messages = [
-            {"role": "system", "content": "You are a business data assistant."},
-            {"role": "user", "content": user_message}
+    @staticmethod
+    def _fast_answer(round_number: int, outcomes: List[Tuple[Dict[str, Any], DataQuery | None, DataResponse | None]]) -> str | None:
+        """
+        Connector context to return directly, skipping the next LLM call.
+        """
+        if round_number or len(outcomes) != 1:
+            return None
+
+        _, data_query, result = outcomes[0]
+        if data_query is None:
+            return None
+
+        return FAST_PATH.answer(data_query, result)
+
+    @staticmethod
+    def _finish_round(
+        turn: ChatTurn,
+        messages: List[Dict[str, Any]],
+        round_number: int,
+        tool_calls: List[Any],
+        outcomes: List[Tuple[Dict[str, Any], DataQuery | None, DataResponse | None]]
+    ) -> str | None:
+        """
+        Record a tool round on the turn and append it to the
+        conversation. Returns the fast-path answer ending the turn, if
+        any.
+        """
+        if round_number == 0:
+            turn.first_calls = list(tool_calls)
+        turn.outcomes.extend(outcomes)
+
+        answer = LLMHandler._fast_answer(round_number, outcomes)
+        if answer is not None:
+            return answer
+
+        messages.append(LLMHandler._assistant_message(tool_calls))
+        messages.extend(tool_message for tool_message, _, _ in outcomes)
+        return None
+
+    @staticmethod
+    def _assistant_message(tool_calls) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "tool_calls": [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {"name": call.function.name, "arguments": call.function.arguments}
+                }
+                for call in tool_calls
+            ]
+        }
+
+    @staticmethod
+    def _planned_tool_calls(user_message: str) -> List[Any]:
+        """
+        Tool calls cached for this message, shaped like the client's.
+        """
+        plan = CHAT_CACHE.plan(user_message) or []
+
+        if plan:
+            logger.info("Reusing cached tool plan (%d call(s))", len(plan))
+
+        return [
+            SimpleNamespace(
+                id=f"cached_{i}",
+                function=SimpleNamespace(name=call["name"], arguments=call["arguments"])
+            )
+            for i, call in enumerate(plan)
+        ]
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    @staticmethod
+    def _observe_completion(mode: str, with_tools: bool, started: float, usage: Any = None) -> None:
+        if not settings.METRICS_ENABLED:
+            return
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, mode, "true" if with_tools else "false")
+        record_usage(usage)
+
+    @staticmethod
+    def _stream_usage(chunk) -> Any:
+        """
+        Token usage carried by a stream chunk; Groq sends it on the
+        last chunk under `x_groq`.
+        """
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            return usage
+
+        x_groq = getattr(chunk, "x_groq", None)
+        if isinstance(x_groq, dict):
+            return x_groq.get("usage")
+        return getattr(x_groq, "usage", None)
+
+    @staticmethod
+    def _observe_error(error: Exception) -> None:
+        if settings.METRICS_ENABLED:
+            LLM_ERRORS_TOTAL.inc(1, type(error).__name__)
+
+    @staticmethod
+    def _observe_turn(mode: str, started: float) -> None:
+        if settings.METRICS_ENABLED:
+            CHAT_TURN_SECONDS.observe(time.perf_counter() - started, mode)
+
+    # -------------------------
+    # Deadline Handling
+    # -------------------------
+    @staticmethod
+    def _llm_options(with_tools: bool) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"tools": TOOLS, "tool_choice": "auto"} if with_tools else {}
+
+        left = remaining()
+        if left is not None:
+            options["timeout"] = max(left, 0.001)
+
+        return options
+
+    @staticmethod
+    def _template_answer(turn: ChatTurn) -> str | None:
+        contexts = [
+            result.context
+            for _, _, result in turn.outcomes
+            if result is not None and result.context
         ]
+        return " ".join(contexts) or None
 
-        # Step 1 — Ask model
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=messages,
-            tools=[{
-                "type": "function",
-                "function": QUERY_DATA_FUNCTION
-            }],
-            tool_choice="auto"
-        )
+    @staticmethod
+    def _check_budget(turn: ChatTurn) -> None:
+        """
+        Skip the next LLM call in favour of the connector contexts when
+        the remaining budget is below DEADLINE_LLM_MIN_SECONDS.
+        """
+        if not below(settings.DEADLINE_LLM_MIN_SECONDS):
+            return
+
+        answer = LLMHandler._template_answer(turn)
+        if answer is not None:
+            logger.info("Deadline near: answering from connector context")
+            degrade("llm_answer")
+            raise _AnswerFromContext(answer)
+
+    @staticmethod
+    def _timed_out(turn: ChatTurn, error: Exception) -> Exception:
+        answer = LLMHandler._template_answer(turn)
 
-        message = response.choices[0].message
+        if answer is None:
+            return DeadlineExceeded("LLM call did not finish within the request deadline")
 
-        # Step 2 — Did model call function?
-        if message.tool_calls:
+        logger.warning("LLM call timed out: answering from connector context")
+        degrade("llm_answer")
+        return _AnswerFromContext(answer)
 
-            tool_call = message.tool_calls[0]
-            function_name = tool_call.function.name
-            arguments = json.loads(tool_call.function.arguments)
+    # -------------------------
+    # Blocking Pipeline
+    # -------------------------
+    @staticmethod
+    def process_user_message(user_message: str) -> str:
+        """
+        Full LLM → Function Call → Backend → LLM loop.
+
+        Every tool call in a turn runs concurrently on the blocking
+        executor and all results go back in one round. The model may
+        request follow-up tool rounds up to LLM_MAX_TOOL_ROUNDS.
+        Cached answers and tool plans skip one or both LLM calls.
+        """
 
-            logger.info("Function call detected: %s", function_name)
-            logger.debug("Function arguments: %s", arguments)
+        logger.debug("Processing user message: %s", user_message)
 
-            # Step 3 — Execute backend
-            data_query = DataQuery(**arguments)
+        started = time.perf_counter()
 
-            logger.info("Executing connector for source: %s", data_query.source)
+        cached = CHAT_CACHE.answer(user_message)
+        if cached is not None:
+            LLMHandler._observe_turn("sync", started)
+            return cached
 
-            connector = get_connector(data_query.source)
-            result: DataResponse = connector.execute(data_query)
+        turn = ChatTurn(user_message)
+        planned = LLMHandler._planned_tool_calls(user_message)
+        speculation = None if planned else PREFETCHER.start(user_message)
 
-            # Log row count safely
-            if hasattr(result, "data") and isinstance(result.data, list):
-                logger.info("Filtered rows count: %d", len(result.data))
+        try:
+            answer = LLMHandler._process(turn, planned, speculation)
+        except _AnswerFromContext as early:
+            answer = early.answer
+        finally:
+            PREFETCHER.settle(speculation)
+
+        CHAT_CACHE.remember(turn, answer)
+
+        LLMHandler._observe_turn("sync", started)
+
+        return answer
+
+    @staticmethod
+    def _complete(turn: ChatTurn, messages: List[Dict[str, Any]], with_tools: bool):
+        LLMHandler._check_budget(turn)
+
+        started = time.perf_counter()
+
+        try:
+            response = _client("client").chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                **LLMHandler._llm_options(with_tools)
+            )
+        except Exception as e:
+            LLMHandler._observe_error(e)
+            if _is_timeout(e):
+                raise LLMHandler._timed_out(turn, e) from e
+            raise
+
+        LLMHandler._observe_completion("sync", with_tools, started, getattr(response, "usage", None))
+
+        return response.choices[0].message
+
+    @staticmethod
+    def _process(
+        turn: ChatTurn,
+        planned: List[Any],
+        speculation: Speculation | None
+    ) -> str:
+        messages = LLMHandler._initial_messages(turn.message)
+
+        for round_number in range(settings.LLM_MAX_TOOL_ROUNDS + 1):
+            # Tool budget spent: the model must answer from what it has
+            with_tools = round_number < settings.LLM_MAX_TOOL_ROUNDS
+
+            if with_tools and round_number == 0 and planned:
+                tool_calls = planned
+            else:
+                message = LLMHandler._complete(turn, messages, with_tools)
+
+                if not with_tools or not message.tool_calls:
+                    logger.info("Final response generated")
+                    return message.content
+
+                tool_calls = message.tool_calls
+
+            logger.info("Executing %d tool call(s)", len(tool_calls))
+
+            # Only the first round can use the speculative prefetch
+            guess = speculation if round_number == 0 else None
+            outcomes = map_blocking(
+                lambda tool_call: LLMHandler._run_tool_call(tool_call, guess),
+                tool_calls
+            )
+
+            answer = LLMHandler._finish_round(turn, messages, round_number, tool_calls, outcomes)
+            if answer is not None:
+                return answer
+
+    # -------------------------
+    # Async Pipeline
+    # -------------------------
+    @staticmethod
+    async def aprocess_user_message(user_message: str) -> str:
+        """
+        Non-blocking LLM → Function Call → Backend → LLM loop.
+        LLM calls use the async client; all tool calls of a turn are
+        gathered concurrently, so a turn costs roughly its slowest call.
+        """
+
+        logger.debug("Processing user message: %s", user_message)
+
+        started = time.perf_counter()
+
+        # Validating a cached answer may re-read snapshots
+        cached = await run_blocking(CHAT_CACHE.answer, user_message)
+        if cached is not None:
+            LLMHandler._observe_turn("async", started)
+            return cached
+
+        turn = ChatTurn(user_message)
+        planned = LLMHandler._planned_tool_calls(user_message)
+        speculation = None if planned else PREFETCHER.start(user_message)
+
+        try:
+            answer = await LLMHandler._aprocess(turn, planned, speculation)
+        except _AnswerFromContext as early:
+            answer = early.answer
+        finally:
+            PREFETCHER.settle(speculation)
+
+        await run_blocking(CHAT_CACHE.remember, turn, answer)
+
+        LLMHandler._observe_turn("async", started)
+
+        return answer
+
+    @staticmethod
+    async def _acomplete(turn: ChatTurn, messages: List[Dict[str, Any]], with_tools: bool):
+        LLMHandler._check_budget(turn)
+
+        started = time.perf_counter()
+
+        try:
+            response = await _client("async_client").chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                **LLMHandler._llm_options(with_tools)
+            )
+        except Exception as e:
+            LLMHandler._observe_error(e)
+            if _is_timeout(e):
+                raise LLMHandler._timed_out(turn, e) from e
+            raise
+
+        LLMHandler._observe_completion("async", with_tools, started, getattr(response, "usage", None))
+
+        return response.choices[0].message
+
+    @staticmethod
+    async def _aprocess(
+        turn: ChatTurn,
+        planned: List[Any],
+        speculation: Speculation | None
+    ) -> str:
+        messages = LLMHandler._initial_messages(turn.message)
+
+        for round_number in range(settings.LLM_MAX_TOOL_ROUNDS + 1):
+            with_tools = round_number < settings.LLM_MAX_TOOL_ROUNDS
+
+            if with_tools and round_number == 0 and planned:
+                tool_calls = planned
             else:
-                logger.info("Data returned from connector")
+                message = await LLMHandler._acomplete(turn, messages, with_tools)
+
+                if not with_tools or not message.tool_calls:
+                    logger.info("Final response generated")
+                    return message.content
 
-            # Step 4 — Send tool result back to LLM
-            messages.append(message)
+                tool_calls = message.tool_calls
 
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call.id,
-                "content": json.dumps(result.model_dump())
-            })
+            logger.info("Executing %d tool call(s)", len(tool_calls))
 
-            # Step 5 — Final response
-            final_response = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=messages
+            guess = speculation if round_number == 0 else None
+            outcomes = await asyncio.gather(*(
+                LLMHandler._arun_tool_call(tool_call, guess)
+                for tool_call in tool_calls
+            ))
+
+            answer = LLMHandler._finish_round(turn, messages, round_number, tool_calls, outcomes)
+            if answer is not None:
+                return answer
+
+    # -------------------------
+    # Streaming Pipeline
+    # -------------------------
+    @staticmethod
+    async def _astream_completion(
+        turn: ChatTurn,
+        messages: List[Dict[str, Any]],
+        with_tools: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        One streamed completion. Relays content as token events and
+        finishes with a {"event": "tool_calls"} event holding any tool
+        calls assembled from the streamed deltas.
+        """
+        LLMHandler._check_budget(turn)
+
+        calls: Dict[int, Dict[str, str]] = {}
+        relayed = False
+        usage = None
+        first_chunk = True
+        started = time.perf_counter()
+
+        try:
+            stream = await _client("async_client").chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                stream=True,
+                **LLMHandler._llm_options(with_tools)
             )
 
-            logger.info("Final response generated")
+            async for chunk in stream:
+                if first_chunk and settings.METRICS_ENABLED:
+                    LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started, "true" if with_tools else "false")
+                first_chunk = False
+
+                usage = LLMHandler._stream_usage(chunk) or usage
+
+                if not chunk.choices:
+                    continue
+
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    relayed = True
+                    yield {"event": "token", "text": delta.content}
+
+                for fragment in delta.tool_calls or ():
+                    call = calls.setdefault(fragment.index, {"id": "", "name": "", "arguments": ""})
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    if fragment.function is not None:
+                        call["name"] += fragment.function.name or ""
+                        call["arguments"] += fragment.function.arguments or ""
+        except Exception as e:
+            LLMHandler._observe_error(e)
+            if not _is_timeout(e):
+                raise
+            # Half an answer has been spoken: it cannot be replaced
+            if relayed:
+                raise DeadlineExceeded("LLM stream did not finish within the request deadline") from e
+            raise LLMHandler._timed_out(turn, e) from e
+
+        LLMHandler._observe_completion("stream", with_tools, started, usage)
+
+        yield {
+            "event": "tool_calls",
+            "tool_calls": [
+                SimpleNamespace(
+                    id=call["id"],
+                    function=SimpleNamespace(name=call["name"], arguments=call["arguments"])
+                )
+                for _, call in sorted(calls.items())
+            ]
+        }
+
+    @staticmethod
+    async def astream_user_message(user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `aprocess_user_message`.
+
+        Every completion is streamed, so an answer is relayed token by
+        token whichever round produces it. Yields:
+        - {"event": "context", ...} with a connector's voice context as
+          soon as its tool result is ready, before the next LLM call
+        - {"event": "token", "text": ...} for each piece of the answer
+        - {"event": "done"} once the answer is complete
+        """
+
+        logger.debug("Streaming user message: %s", user_message)
+
+        started = time.perf_counter()
+
+        cached = await run_blocking(CHAT_CACHE.answer, user_message)
+        if cached is not None:
+            yield {"event": "token", "text": cached}
+            LLMHandler._observe_turn("stream", started)
+            yield {"event": "done"}
+            return
+
+        turn = ChatTurn(user_message)
+        planned = LLMHandler._planned_tool_calls(user_message)
+        speculation = None if planned else PREFETCHER.start(user_message)
+        parts: List[str] = []
+
+        try:
+            async for event in LLMHandler._astream(turn, planned, speculation):
+                if event["event"] == "token":
+                    parts.append(event["text"])
+                yield event
+        except _AnswerFromContext as early:
+            parts.append(early.answer)
+            yield {"event": "token", "text": early.answer}
+        finally:
+            PREFETCHER.settle(speculation)
+
+        await run_blocking(CHAT_CACHE.remember, turn, "".join(parts))
+
+        logger.info("Final response streamed")
+
+        LLMHandler._observe_turn("stream", started)
+
+        done: Dict[str, Any] = {"event": "done"}
+        stages = degraded_stages()
+        if stages:
+            done["degraded"] = stages
+
+        yield done
+
+    @staticmethod
+    async def _astream(
+        turn: ChatTurn,
+        planned: List[Any],
+        speculation: Speculation | None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        messages = LLMHandler._initial_messages(turn.message)
+
+        for round_number in range(settings.LLM_MAX_TOOL_ROUNDS + 1):
+            with_tools = round_number < settings.LLM_MAX_TOOL_ROUNDS
+
+            if with_tools and round_number == 0 and planned:
+                tool_calls = planned
+            else:
+                tool_calls = []
+
+                async for event in LLMHandler._astream_completion(turn, messages, with_tools):
+                    if event["event"] == "tool_calls":
+                        tool_calls = event["tool_calls"]
+                    else:
+                        yield event
+
+                if not with_tools or not tool_calls:
+                    return
+
+            logger.info("Executing %d tool call(s)", len(tool_calls))
+
+            guess = speculation if round_number == 0 else None
+            tasks = [
+                asyncio.ensure_future(LLMHandler._arun_tool_call(tool_call, guess))
+                for tool_call in tool_calls
+            ]
+
+            try:
+                # Relay each context as soon as its own call finishes
+                for finished in asyncio.as_completed(tasks):
+                    tool_message, _, result = await finished
+                    if result is not None and result.context:
+                        yield {
+                            "event": "context",
+                            "tool_call_id": tool_message["tool_call_id"],
+                            "context": result.context
+                        }
+            finally:
+                for task in tasks:
+                    task.cancel()
 
-            return final_response.choices[0].message.content
+            outcomes = [task.result() for task in tasks]
 
-        # If no function call
-        logger.info("No function call detected, returning direct LLM response")
-        return message.content
\ No newline at end of file
+            answer = LLMHandler._finish_round(turn, messages, round_number, tool_calls, outcomes)
+            if answer is not None:
+                yield {"event": "token", "text": answer}
+                return
@@ -0,0 +1,291 @@
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Dict, Any, Tuple
+
+from app.config import settings
+from app.connectors.registry import get_connector
+from app.connectors.snapshot import DatasetSnapshot
+from app.llm.function_schemas import QUERY_DATA_FUNCTION
+from app.llm.chat_cache import normalize_message
+from app.models.common import DataQuery, DataResponse
+from app.services.result_cache import query_key
+from app.utils.executor import run_blocking, submit
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+SOURCES: List[str] = QUERY_DATA_FUNCTION["parameters"]["properties"]["source"]["enum"]
+
+# Words that point at a source beyond its own name
+SOURCE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "crm": ("customer", "customers", "client", "clients", "account", "accounts", "lifetime value"),
+    "support": ("ticket", "tickets", "issue", "issues", "support", "priority", "escalation"),
+    "analytics": ("metric", "metrics", "analytics", "trend", "traffic", "usage"),
+}
+
+# Fields with more distinct values than this are not used as vocabulary
+MAX_VOCABULARY_VALUES = 32
+
+# Speculations fetch the largest page DataQuery allows (limit <= 50),
+# unvoiced, so any page size and voice setting the model picks can be
+# cut from it
+PREFETCH_LIMIT = 50
+
+
+def _phrase(value: str) -> str:
+    return normalize_message(value.replace("_", " "))
+
+
+def _contains(message: str, phrase: str) -> bool:
+    return bool(phrase) and re.search(rf"\b{re.escape(phrase)}\b", message) is not None
+
+
+def _vocabulary(snapshot: DatasetSnapshot, fields: Tuple[str, ...]) -> Dict[str, Dict[str, str]]:
+    """
+    {field: {spoken phrase: stored value}} for low-cardinality fields.
+    """
+    vocabulary: Dict[str, Dict[str, str]] = {}
+
+    for field in fields:
+        values: Dict[str, str] = {}
+        for record in snapshot.records:
+            value = record.get(field)
+            if isinstance(value, str) and value not in values:
+                values[value] = value
+                if len(values) > MAX_VOCABULARY_VALUES:
+                    break
+
+        if values and len(values) <= MAX_VOCABULARY_VALUES:
+            vocabulary[field] = {_phrase(value): value for value in values}
+
+    return vocabulary
+
+
+def known_values(source: str) -> Dict[str, Dict[str, str]]:
+    connector = get_connector(source)
+    if connector.data_path is None:
+        return {}
+
+    fields = tuple(
+        field for field in connector.hash_index_fields
+        if field != "id" and not field.endswith("_id")
+    )
+
+    return connector.snapshot().derive(
+        ("prefetch_vocabulary", fields),
+        lambda snapshot: _vocabulary(snapshot, fields)
+    )
+
+
+def predict_query(message: str) -> DataQuery | None:
+    """
+    Guess the tool call for `message` from keywords: source names and
+    synonyms plus known values of each source's indexed fields (which
+    become equality filters). Returns None unless one source wins.
+    """
+    text = normalize_message(message)
+
+    scores: Dict[str, int] = {}
+    filters: Dict[str, Dict[str, str]] = {}
+
+    for source in SOURCES:
+        score = sum(_contains(text, keyword) for keyword in (source,) + SOURCE_KEYWORDS.get(source, ()))
+        matched: Dict[str, str] = {}
+
+        for field, values in known_values(source).items():
+            hits = [(phrase, value) for phrase, value in values.items() if _contains(text, phrase)]
+            if len(hits) == 1:
+                phrase, matched[field] = hits[0]
+                # "daily active users" is stronger evidence than "active"
+                score += len(phrase.split())
+
+        scores[source] = score
+        filters[source] = matched
+
+    best = max(scores.values())
+    winners = [source for source, score in scores.items() if score == best]
+
+    if best == 0 or len(winners) > 1:
+        return None
+
+    source = winners[0]
+    return DataQuery(source=source, filters=filters[source] or None)
+
+
+def _shape(query: DataQuery) -> str:
+    """
+    query_key without paging and voice: the part of a tool call a
+    prefetch has to get right.
+    """
+    return query_key(query.model_copy(update={"limit": PREFETCH_LIMIT, "offset": 0, "voice_context": False}))
+
+
+class Speculation:
+    """
+    A connector query started from a predicted tool call while the
+    first LLM completion is still in flight.
+    """
+
+    __slots__ = ("message", "started", "finished", "predicted", "shape", "ready", "future", "used")
+
+    def __init__(self, message: str):
+        self.message = message
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.predicted: DataQuery | None = None
+        self.shape: str | None = None
+        self.ready = threading.Event()
+        self.used = False
+        self.future: Future = submit(self._run)
+
+    def _run(self) -> DataResponse | None:
+        try:
+            self.predicted = predict_query(self.message)
+            if self.predicted is not None:
+                self.shape = _shape(self.predicted)
+        finally:
+            self.ready.set()
+
+        if self.predicted is None:
+            return None
+
+        wide = self.predicted.model_copy(update={"limit": PREFETCH_LIMIT, "offset": 0, "voice_context": False})
+        logger.debug("Prefetching %s", self.shape)
+
+        try:
+            return get_connector(wide.source.value).execute(wide)
+        finally:
+            self.finished = time.perf_counter()
+
+    def matches(self, query: DataQuery) -> bool:
+        # Callers wait for the (cheap) classifier, never for the query
+        return self.shape is not None and self.shape == _shape(query)
+
+
+class Prefetcher:
+    """
+    Speculative tool prefetch (SPECULATIVE_PREFETCH).
+
+    Hits cut the requested page from the prefetched rows and voice it;
+    misses discard them. The time
+    saved on a hit is the part of the connector run that overlapped
+    the LLM call: min(run time, claim time - start time).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.speculations = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    def start(self, message: str) -> Speculation | None:
+        if not settings.SPECULATIVE_PREFETCH:
+            return None
+        return Speculation(message)
+
+    def claim(self, speculation: Speculation | None, query: DataQuery) -> DataResponse | None:
+        if speculation is None:
+            return None
+
+        speculation.ready.wait()
+        if not speculation.matches(query):
+            return None
+
+        claimed = time.perf_counter()
+        try:
+            result = speculation.future.result()
+        except Exception:
+            return None
+
+        return self._hit(speculation, claimed, result, query)
+
+    async def aclaim(self, speculation: Speculation | None, query: DataQuery) -> DataResponse | None:
+        if speculation is None:
+            return None
+
+        if not speculation.ready.is_set():
+            await run_blocking(speculation.ready.wait)
+        if not speculation.matches(query):
+            return None
+
+        claimed = time.perf_counter()
+        try:
+            result = await asyncio.wrap_future(speculation.future)
+        except Exception:
+            return None
+
+        return self._hit(speculation, claimed, result, query)
+
+    @staticmethod
+    def _page(result: DataResponse, query: DataQuery) -> DataResponse | None:
+        """
+        The page `query` asks for, cut from the wide prefetched result
+        and voiced like a connector run would. None when the page goes
+        past the prefetched rows and more matches may exist.
+        """
+        rows = result.data
+        end = query.offset + query.limit
+
+        if end > len(rows) and len(rows) >= PREFETCH_LIMIT:
+            return None
+
+        return get_connector(query.source.value).respond(query, rows[query.offset:end], result.metadata.total_results)
+
+    def _hit(
+        self,
+        speculation: Speculation,
+        claimed: float,
+        result: DataResponse | None,
+        query: DataQuery
+    ) -> DataResponse | None:
+        if result is None:
+            return None
+
+        # Each caller gets its own rows, like a result-cache hit
+        page = self._page(result.model_copy(deep=True), query)
+        if page is None:
+            return None
+
+        saved = min(speculation.finished, claimed) - speculation.started
+
+        with self._lock:
+            speculation.used = True
+            self.saved_ms += saved * 1000
+
+        logger.info("Prefetch hit for %s (saved %.1f ms)", speculation.predicted.source.value, saved * 1000)
+
+        return page
+
+    def settle(self, speculation: Speculation | None) -> None:
+        """
+        Count a finished speculation once the turn no longer needs it.
+        """
+        if speculation is None or not speculation.ready.is_set() or speculation.predicted is None:
+            return
+
+        with self._lock:
+            self.speculations += 1
+            if speculation.used:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "speculations": self.speculations,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / self.speculations if self.speculations else 0.0,
+                "saved_ms": self.saved_ms,
+                "saved_ms_per_hit": self.saved_ms / self.hits if self.hits else 0.0,
+            }
+
+
+PREFETCHER = Prefetcher()
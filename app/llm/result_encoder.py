@@ -0,0 +1,171 @@
+import json
+import math
+from typing import List, Dict, Any, Tuple
+
+from app.config import settings
+from app.models.common import DataResponse
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+ENCODINGS = ("json", "compact")
+
+# Rough prompt-token estimate for English / JSON text
+CHARS_PER_TOKEN = 4
+
+# Metadata fields the model never needs repeated back
+_SKIPPED_METADATA = {"summary_hints"}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def encoding_for(source: str) -> str:
+    """
+    Encoding configured for a source: TOOL_RESULT_ENCODING_BY_SOURCE
+    overrides the global TOOL_RESULT_ENCODING.
+    """
+    encoding = settings.TOOL_RESULT_ENCODING_BY_SOURCE.get(source, settings.TOOL_RESULT_ENCODING)
+
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported tool result encoding: {encoding}")
+
+    return encoding
+
+
+# -------------------------
+# Value Compaction
+# -------------------------
+def compact_value(value: Any, digits: int) -> Any:
+    """
+    Round floats (to `digits` decimals, or significant digits below 1)
+    and drop nulls inside nested structures.
+    """
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        if abs(value) >= 1 or value == 0:
+            rounded = round(value, digits)
+        else:
+            rounded = float(f"{value:.{max(digits, 1)}g}")
+        return int(rounded) if rounded.is_integer() else rounded
+
+    if isinstance(value, dict):
+        return {
+            k: compact_value(v, digits)
+            for k, v in value.items()
+            if v is not None
+        }
+
+    if isinstance(value, list):
+        return [compact_value(v, digits) for v in value]
+
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _metadata_line(result: DataResponse) -> str:
+    metadata = result.metadata.model_dump(mode="json", exclude_none=True)
+
+    parts = [
+        f"{key}={value}"
+        for key, value in metadata.items()
+        if key not in _SKIPPED_METADATA
+    ]
+
+    return "meta: " + " ".join(parts)
+
+
+def _table(rows: List[Any], digits: int) -> Tuple[List[str], List[str]]:
+    """
+    Header lines plus one value line per row. Columns that are null
+    in every row are dropped, and columns holding the same value in
+    every row are stated once instead of repeated. Non-object rows
+    are emitted as-is.
+    """
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        return [], [_dumps(compact_value(row, digits)) for row in rows]
+
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for key, value in row.items():
+            if value is not None:
+                columns.setdefault(key, None)
+
+    header: List[str] = []
+    shared: Dict[str, Any] = {}
+
+    for column in columns:
+        first = rows[0].get(column)
+        if len(rows) > 1 and all(row.get(column) == first for row in rows):
+            shared[column] = compact_value(first, digits)
+        else:
+            header.append(column)
+
+    lines = [
+        _dumps([compact_value(row.get(column), digits) for column in header])
+        for row in rows
+    ]
+
+    head = ["all rows: " + _dumps(shared)] if shared else []
+    head.append("columns: " + _dumps(header))
+
+    return head, lines
+
+
+# -------------------------
+# Encoders
+# -------------------------
+def encode_json(result: DataResponse) -> str:
+    """
+    The full response, as sent before compact encoding existed.
+    """
+    return json.dumps(result.model_dump(mode="json"))
+
+
+def encode_compact(result: DataResponse, token_budget: int | None = None, digits: int | None = None) -> str:
+    """
+    Header row plus value rows, nulls dropped, numbers rounded and
+    metadata on one line. Rows are trimmed to fit `token_budget`,
+    saying how many of the returned rows are shown.
+    """
+    token_budget = settings.TOOL_RESULT_TOKEN_BUDGET if token_budget is None else token_budget
+    digits = settings.TOOL_RESULT_FLOAT_DIGITS if digits is None else digits
+
+    head = [_metadata_line(result)]
+    if result.context:
+        head.append("context: " + result.context)
+
+    header, rows = _table(result.data, digits)
+    head.extend(header)
+
+    used = estimate_tokens("\n".join(head))
+    shown: List[str] = []
+
+    for line in rows:
+        cost = estimate_tokens(line) + 1
+        if shown and used + cost > token_budget:
+            break
+        # Always keep at least one row so the model sees the shape
+        shown.append(line)
+        used += cost
+
+    lines = head + shown
+
+    if len(shown) < len(rows):
+        lines.append(f"showing {len(shown)} of {len(rows)} rows")
+        logger.debug("Trimmed tool result to %d of %d rows", len(shown), len(rows))
+
+    return "\n".join(lines)
+
+
+def encode_tool_result(source: str, result: DataResponse) -> str:
+    if encoding_for(source) == "json":
+        return encode_json(result)
+    return encode_compact(result)
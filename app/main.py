@@ -1,14 +1,58 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from app.routers import health, data, llm, llm_executor
-from app.utils.logging import configure_logging
+from app.config import settings
+from app.connectors.registry import REGISTRY
+from app.routers import health, data, llm, llm_executor, metrics
+from app.services.warmup import STARTUP, warm_up
+from app.utils.logging import RequestIdMiddleware, configure_logging
 
 
 configure_logging()
 
-app = FastAPI(title="Universal Data Connector")
+logger = logging.getLogger(__name__)
+
+STARTUP["import_seconds"] = time.perf_counter() - _IMPORT_STARTED
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and preload every connector before serving, so the first
+    request does not pay for datasets and indexes; shut them down and
+    close shared resources on exit.
+    """
+    warmup_started = time.perf_counter()
+
+    if settings.WARMUP_ON_STARTUP:
+        STARTUP["warmup_seconds_by_source"] = await warm_up()
+
+    finished = time.perf_counter()
+    STARTUP["warmup_seconds"] = finished - warmup_started
+    STARTUP["ready_seconds"] = finished - _IMPORT_STARTED
+
+    logger.info(
+        "Ready in %.0f ms (imports %.0f ms, warmup %.0f ms)",
+        STARTUP["ready_seconds"] * 1000,
+        STARTUP["import_seconds"] * 1000,
+        STARTUP["warmup_seconds"] * 1000
+    )
+
+    yield
+
+    REGISTRY.shutdown()
+
+
+app = FastAPI(title="Universal Data Connector", lifespan=lifespan)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(health.router)
 app.include_router(data.router)
 app.include_router(llm.router)
 app.include_router(llm_executor.router)
+app.include_router(metrics.router)
@@ -17,6 +17,8 @@ class AggregatedMetric(BaseModel):
     metric_name: str
     value: float
     period: str  # e.g., "last_7_days"
+    aggregate: Optional[str] = None  # e.g., "sum"
+    points: Optional[int] = None  # raw points folded into the value
 
 
 class AnalyticsQueryParams(BaseModel):
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
@@ -17,6 +18,21 @@ class DataType(str, Enum):
     UNKNOWN = "unknown"
 
 
+class AggregateFunction(str, Enum):
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+    COUNT = "count"
+    PERCENTILE = "percentile"
+
+
+class AggregatePeriod(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
 class DataQuery(BaseModel):
     source: DataSource = Field(
         ...,
@@ -41,6 +57,32 @@ class DataQuery(BaseModel):
         default=True,
         description="Enable voice-optimized summarization"
     )
+    count_total: bool = Field(
+        default=False,
+        description="Count every matching record for metadata.total_results (scans the full result set)"
+    )
+    start_date: Optional[datetime] = Field(
+        default=None,
+        description="Inclusive start of the time window (analytics timestamp, otherwise created_at)"
+    )
+    end_date: Optional[datetime] = Field(
+        default=None,
+        description="Inclusive end of the time window"
+    )
+    aggregate: Optional[AggregateFunction] = Field(
+        default=None,
+        description="Aggregate time-series values instead of returning raw points (analytics only)"
+    )
+    percentile: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=100,
+        description="Percentile to compute when aggregate is 'percentile' (default 50)"
+    )
+    period: Optional[AggregatePeriod] = Field(
+        default=None,
+        description="Resample the aggregate per day, week or month"
+    )
 
 
 class Metadata(BaseModel):
@@ -62,6 +104,18 @@ class Metadata(BaseModel):
         default=None,
         description="Optional voice-friendly summary hints"
     )
+    rollup: Optional[str] = Field(
+        default=None,
+        description="Pre-aggregated rollup granularity used to answer the query (day, week, month)"
+    )
+    degraded: Optional[List[str]] = Field(
+        default=None,
+        description="Stages cut short to meet the request deadline (e.g. connector_rows, connector_summary_only)"
+    )
+    timings: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Per-stage connector timings in milliseconds (only with DEBUG_TIMINGS)"
+    )
 
 
 class DataResponse(BaseModel):
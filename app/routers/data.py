@@ -1,17 +1,17 @@
-from app.services.data_services import fetch_data
+from app.services.data_services import afetch_data
 from fastapi import APIRouter, Query,Request
 from app.models.common import DataResponse, Metadata
 
 router = APIRouter()
 
 @router.get("/data/{source}", response_model=DataResponse)
-def get_data(
+async def get_data(
     source: str,
     request: Request,
     limit: int = Query(10, ge=1),
     offset: int = Query(0, ge=0),
 ):
-    return fetch_data(source, request, limit, offset)
+    return await afetch_data(source, request, limit, offset)
 
 # from fastapi import APIRouter, Query
 # from app.connectors.crm_connector import CRMConnector
@@ -1,8 +1,15 @@
+from app.config import settings
 from app.llm.handler import LLMHandler
-from fastapi import APIRouter
+from app.utils.deadline import DeadlineExceeded, deadline
+from fastapi import APIRouter, HTTPException
 
 router = APIRouter()
 
 @router.post("/chat")
 async def chat(message: str):
-    return {"response": LLMHandler.process_user_message(message)}
+    budget = settings.CHAT_DEADLINE_MS / 1000 if settings.CHAT_DEADLINE_MS else None
+    try:
+        with deadline(budget):
+            return {"response": await LLMHandler.aprocess_user_message(message)}
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
@@ -1,6 +1,12 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from app.config import settings
 from app.llm.handler import LLMHandler
+from app.utils.deadline import DeadlineExceeded, deadline, degraded_stages
 import logging
 logger = logging.getLogger(__name__)
 
@@ -9,26 +15,90 @@ router = APIRouter(prefix="/chat", tags=["LLM"])
 
 class ChatRequest(BaseModel):
     message: str
+    deadline_ms: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Latency budget for this turn; defaults to CHAT_DEADLINE_MS"
+    )
+
+    def deadline_seconds(self) -> float | None:
+        budget = self.deadline_ms or settings.CHAT_DEADLINE_MS
+        return budget / 1000 if budget else None
 
 
 @router.post("/")
 async def chat(request: ChatRequest):
 
     logger.info("Received chat request")
-    logger.info(f"User message: {request.message}")
+    logger.debug("User message: %s", request.message)
 
     try:
-        response = LLMHandler.process_user_message(request.message)
+        with deadline(request.deadline_seconds()):
+            response = await LLMHandler.aprocess_user_message(request.message)
+            degraded = degraded_stages()
 
         logger.info("LLM response generated successfully")
-        logger.debug(f"LLM response content: {response}")
+        logger.debug("LLM response content: %s", response)
 
-        return {"response": response}
+        return {"response": response, "degraded": degraded}
+
+    except DeadlineExceeded as e:
+        logger.warning("Chat request missed its deadline: %s", e)
+        raise HTTPException(status_code=504, detail=str(e))
 
     except Exception as e:
         logger.exception("Error while processing chat request")
         raise e
 
+
+# -------------------------
+# Streaming
+# -------------------------
+STREAM_MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _encode_event(event: Dict[str, Any], format: str) -> str:
+    if format == "sse":
+        payload = {k: v for k, v in event.items() if k != "event"}
+        return f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps(event) + "\n"
+
+
+async def _encode_stream(request: ChatRequest, format: str) -> AsyncIterator[str]:
+    try:
+        with deadline(request.deadline_seconds()):
+            async for event in LLMHandler.astream_user_message(request.message):
+                yield _encode_event(event, format)
+    except Exception as e:
+        # Headers are already sent: report the failure in-band
+        logger.exception("Error while streaming chat response")
+        yield _encode_event({"event": "error", "message": str(e)}, format)
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, format: str = "sse"):
+    """
+    Stream the answer as server-sent events (default) or NDJSON.
+    Voice clients can start speaking on the first `context` event.
+    """
+
+    logger.info("Received streaming chat request (%s)", format)
+
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported stream format: {format}. Use one of {sorted(STREAM_MEDIA_TYPES)}"
+        )
+
+    return StreamingResponse(
+        _encode_stream(request, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # from app.llm.handler import LLMHandler
 
 # response = LLMHandler.process_user_message(
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.llm.chat_cache import CHAT_CACHE
+from app.llm.fast_path import FAST_PATH
+from app.llm.prefetch import PREFETCHER
+from app.services.result_cache import RESULT_CACHE
+from app.services.warmup import startup_stats
+from app.utils.metrics import METRICS
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS.collector("result_cache", RESULT_CACHE.stats)
+METRICS.collector("chat_cache", CHAT_CACHE.stats)
+METRICS.collector("fast_path", FAST_PATH.stats)
+METRICS.collector("prefetch", PREFETCHER.stats)
+METRICS.collector("startup", startup_stats)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus text exposition of stage timings, LLM latency and
+    token counts, and cache / fast path / prefetch statistics.
+    """
+    return PlainTextResponse(METRICS.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,14 +1,35 @@
-from typing import List, Dict, Any
+import heapq
+from itertools import chain
+from typing import List, Dict, Any, Callable, Iterable, Iterator
+
+
+PRIORITY_ORDER = {
+    "critical": 4,
+    "high": 3,
+    "medium": 2,
+    "low": 1
+}
+
+ACTIONABLE_STATUSES = {"open", "in_progress"}
 
 
 class BusinessRulesEngine:
     """
     Centralized business rule processor.
     Keeps domain logic outside connectors.
+
+    Rules are split in two phases:
+    - select: per-record filtering, always streaming
+    - order: sorting, optionally bounded to the top `top_k` records;
+      sources without ordering rules pass through unchanged
     """
 
     @staticmethod
-    def apply(source: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def apply(
+        source: str,
+        data: List[Dict[str, Any]],
+        top_k: int | None = None
+    ) -> List[Dict[str, Any]]:
         """
         Apply business rules based on source.
         """
@@ -16,70 +37,149 @@ class BusinessRulesEngine:
         if not data:
             return data
 
+        return list(BusinessRulesEngine.stream(source, data, top_k=top_k))
+
+    @staticmethod
+    def stream(
+        source: str,
+        records: Iterable[Dict[str, Any]],
+        top_k: int | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily apply business rules.
+
+        When `top_k` is given only the first `top_k` records of the
+        ordered result are produced, selected with a bounded heap
+        (O(n log k)) instead of a full sort. The ordering, including
+        tie-breaking, is identical to sorted(...)[:top_k].
+        """
+
+        return BusinessRulesEngine.order(
+            source,
+            BusinessRulesEngine.select(source, records),
+            top_k=top_k
+        )
+
+    @staticmethod
+    def select(
+        source: str,
+        records: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
         if source == "crm":
-            return BusinessRulesEngine._crm_rules(data)
+            return BusinessRulesEngine._crm_select(records)
 
         if source == "support":
-            return BusinessRulesEngine._support_rules(data)
+            return BusinessRulesEngine._support_select(records)
+
+        return iter(records)
+
+    @staticmethod
+    def order(
+        source: str,
+        records: Iterable[Dict[str, Any]],
+        top_k: int | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        if source == "crm":
+            return BusinessRulesEngine._crm_order(records, top_k)
+
+        if source == "support":
+            return BusinessRulesEngine._support_order(records, top_k)
 
         if source == "analytics":
-            return BusinessRulesEngine._analytics_rules(data)
+            return BusinessRulesEngine._analytics_order(records, top_k)
 
-        return data
+        return iter(records)
+
+    # -------------------------
+    # Ordering Helper
+    # -------------------------
+    @staticmethod
+    def _ordered(
+        records: Iterable[Dict[str, Any]],
+        key: Callable[[Dict[str, Any]], Any],
+        reverse: bool,
+        top_k: int | None
+    ) -> Iterator[Dict[str, Any]]:
+        if top_k is None:
+            return iter(sorted(records, key=key, reverse=reverse))
+
+        # heapq.nlargest / nsmallest are documented equivalents of
+        # sorted(..., reverse=...)[:n], so ties keep input order.
+        pick = heapq.nlargest if reverse else heapq.nsmallest
+        return iter(pick(top_k, records, key=key))
 
     # -------------------------
     # CRM Rules
     # -------------------------
     @staticmethod
-    def _crm_rules(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _crm_select(data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         # Exclude churned customers
-        filtered = [
+        return (
             customer for customer in data
             if customer.get("status") != "churned"
-        ]
+        )
 
+    @staticmethod
+    def _crm_order(
+        data: Iterable[Dict[str, Any]],
+        top_k: int | None
+    ) -> Iterator[Dict[str, Any]]:
         # Sort by lifetime value descending
-        return sorted(
-            filtered,
+        return BusinessRulesEngine._ordered(
+            data,
             key=lambda x: x.get("lifetime_value", 0),
-            reverse=True
+            reverse=True,
+            top_k=top_k
         )
 
     # -------------------------
     # Support Rules
     # -------------------------
     @staticmethod
-    def _support_rules(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        priority_order = {
-            "critical": 4,
-            "high": 3,
-            "medium": 2,
-            "low": 1
-        }
-
-        actionable_statuses = {"open", "in_progress"}
-
-        filtered = [
+    def _support_select(data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        return (
             ticket for ticket in data
-            if ticket.get("status") in actionable_statuses
-        ]
+            if ticket.get("status") in ACTIONABLE_STATUSES
+        )
 
-        return sorted(
-            filtered,
-            key=lambda x: priority_order.get(x.get("priority", "low"), 1),
-            reverse=True
+    @staticmethod
+    def _support_order(
+        data: Iterable[Dict[str, Any]],
+        top_k: int | None
+    ) -> Iterator[Dict[str, Any]]:
+        return BusinessRulesEngine._ordered(
+            data,
+            key=lambda x: PRIORITY_ORDER.get(x.get("priority", "low"), 1),
+            reverse=True,
+            top_k=top_k
         )
 
     # -------------------------
     # Analytics Rules
     # -------------------------
     @staticmethod
-    def _analytics_rules(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        # Sort by timestamp if exists
-        if data and "timestamp" in data[0]:
-            return sorted(data, key=lambda x: x.get("timestamp"))
+    def _analytics_order(
+        data: Iterable[Dict[str, Any]],
+        top_k: int | None
+    ) -> Iterator[Dict[str, Any]]:
+        iterator = iter(data)
+        first = next(iterator, None)
+
+        if first is None:
+            return iter(())
 
-        return data
+        records = chain((first,), iterator)
+
+        # Sort by timestamp if exists
+        if "timestamp" in first:
+            return BusinessRulesEngine._ordered(
+                records,
+                key=lambda x: x.get("timestamp"),
+                reverse=False,
+                top_k=top_k
+            )
+
+        return records
 
 
 # from typing import List, Dict
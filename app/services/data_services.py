@@ -1,42 +1,45 @@
 from typing import Dict, Any
 
 from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
 from app.models.common import DataQuery
-from app.connectors.crm_connector import CRMConnector
-from app.connectors.support_connector import SupportConnector
-from app.connectors.analytics_connector import AnalyticsConnector
+from app.services.filter_compiler import FilterError
+from app.connectors.registry import REGISTRY, get_connector
 
 
-# -------------------------
-# Connector Registry
-# -------------------------
-
-CONNECTOR_REGISTRY = {
-    "crm": CRMConnector(),
-    "support": SupportConnector(),
-    "analytics": AnalyticsConnector(),
-}
+QUERY_OPTIONS = (
+    "start_date",
+    "end_date",
+    "aggregate",
+    "percentile",
+    "period",
+    "count_total",
+)
 
 
 # -------------------------
 # Fetch Data Service
 # -------------------------
 
-def fetch_data(
+def build_query(
     source: str,
     request: Request,
     limit: int,
     offset: int,
 ):
-    connector = CONNECTOR_REGISTRY.get(source)
-
-    if not connector:
+    """
+    Resolve the connector and DataQuery for a /data request.
+    """
+    if source not in REGISTRY:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported data source: {source}"
         )
 
+    connector = get_connector(source)
+
     # Extract dynamic query params
     raw_params = dict(request.query_params)
 
@@ -44,15 +47,54 @@ def fetch_data(
     raw_params.pop("limit", None)
     raw_params.pop("offset", None)
 
-    query = DataQuery(
-        source=source,
-        filters=raw_params if raw_params else None,
-        limit=limit,
-        offset=offset,
-        voice_context=True
-    )
+    # Query options are DataQuery fields, not record filters
+    options = {
+        name: raw_params.pop(name)
+        for name in QUERY_OPTIONS
+        if name in raw_params
+    }
+
+    try:
+        query = DataQuery(
+            source=source,
+            filters=raw_params if raw_params else None,
+            limit=limit,
+            offset=offset,
+            voice_context=True,
+            **options
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    return connector, query
+
+
+def fetch_data(
+    source: str,
+    request: Request,
+    limit: int,
+    offset: int,
+):
+    connector, query = build_query(source, request, limit, offset)
+
+    try:
+        return connector.execute(query)
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def afetch_data(
+    source: str,
+    request: Request,
+    limit: int,
+    offset: int,
+):
+    connector, query = build_query(source, request, limit, offset)
 
-    return connector.execute(query)
+    try:
+        return await connector.aexecute(query)
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 
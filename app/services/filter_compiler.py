@@ -0,0 +1,308 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Tuple
+
+
+# Fields holding ISO-8601 timestamps; range operators compare instants
+DATETIME_FIELDS = {"created_at", "timestamp", "last_activity_at", "resolved_at"}
+
+RANGE_OPERATORS = {"gt", "lt", "gte", "lte", "between"}
+EQUALITY_OPERATORS = {"eq", "ne", "in"}
+SUPPORTED_OPERATORS = RANGE_OPERATORS | EQUALITY_OPERATORS | {"contains"}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class FilterError(ValueError):
+    """
+    Raised when a filter key or value cannot be compiled.
+    """
+
+
+class FilterClause:
+    """
+    One compiled `field__op=value` condition.
+
+    `operand` is the normalized filter value (str, frozenset, number,
+    epoch microseconds or a (low, high) tuple) and `test` checks a
+    single record value against it.
+    """
+
+    __slots__ = ("field", "op", "operand", "kind", "test")
+
+    def __init__(
+        self,
+        field: str,
+        op: str,
+        operand: Any,
+        kind: str,
+        test: Callable[[Any], bool],
+    ):
+        self.field = field
+        self.op = op
+        self.operand = operand
+        self.kind = kind  # "text" | "number" | "datetime"
+        self.test = test
+
+    def __repr__(self) -> str:
+        return f"FilterClause({self.field}__{self.op}={self.operand!r})"
+
+
+class CompiledFilter:
+    """
+    Predicate built once per query from `DataQuery.filters`.
+    Calling it on a record does no key parsing or value coercion.
+    """
+
+    __slots__ = ("clauses", "_checks")
+
+    def __init__(self, clauses: List[FilterClause]):
+        self.clauses = clauses
+        self._checks: Tuple[Tuple[str, Callable[[Any], bool]], ...] = tuple(
+            (clause.field, clause.test) for clause in clauses
+        )
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        for field, test in self._checks:
+            if not test(record.get(field)):
+                return False
+        return True
+
+
+# -------------------------
+# Value Coercion
+# -------------------------
+def to_number(value: Any) -> float | None:
+    if value.__class__ is float or value.__class__ is int:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_epoch_us(value: str) -> int | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    delta = parsed - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def to_epoch_us(value: Any) -> int | None:
+    """
+    Normalize an ISO string or epoch-microsecond int to epoch microseconds.
+    """
+    if value.__class__ is int:
+        return value
+    if isinstance(value, str):
+        return _parse_epoch_us(value)
+    if isinstance(value, datetime):
+        return _parse_epoch_us(value.isoformat())
+    return None
+
+
+def render_epoch_us(value: int) -> str:
+    """
+    Inverse of to_epoch_us for UTC instants: epoch microseconds -> ISO string.
+    """
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def to_text(value: Any) -> str:
+    return value if value.__class__ is str else str(value)
+
+
+def datetime_text(value: Any) -> str:
+    """
+    Text form of a datetime field, whether stored as ISO string or
+    as epoch microseconds in a typed snapshot row.
+    """
+    if value.__class__ is int:
+        return render_epoch_us(value)
+    return to_text(value)
+
+
+def _split_values(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",")]
+    return [value]
+
+
+# -------------------------
+# Clause Builders
+# -------------------------
+def _range_operand(field: str, value: Any) -> Tuple[str, Any] | None:
+    """
+    Coerce a range bound once. Datetime fields accept ISO strings or
+    epoch seconds; other fields must be numeric.
+    """
+    if field in DATETIME_FIELDS:
+        epoch = to_epoch_us(value) if isinstance(value, (str, datetime)) else None
+        if epoch is not None:
+            return "datetime", epoch
+
+        number = to_number(value)
+        if number is not None:
+            return "datetime", int(number * 1_000_000)
+        return None
+
+    number = to_number(value)
+    if number is None:
+        return None
+    return "number", number
+
+
+def _compile_range(field: str, op: str, value: Any) -> FilterClause:
+    if op == "between":
+        bounds = _split_values(value)
+        if len(bounds) != 2:
+            raise FilterError(f"{field}__between expects two values, got {value!r}")
+
+        low = _range_operand(field, bounds[0])
+        high = _range_operand(field, bounds[1])
+        if low is None or high is None:
+            return FilterClause(field, op, None, "number", lambda v: False)
+
+        kind = low[0]
+        operand = (low[1], high[1])
+    else:
+        coerced = _range_operand(field, value)
+        if coerced is None:
+            # Non-comparable bound: nothing can match
+            return FilterClause(field, op, None, "number", lambda v: False)
+        kind, operand = coerced
+
+    coerce = to_epoch_us if kind == "datetime" else to_number
+
+    if op == "gt":
+        def test(v, bound=operand):
+            v = None if v is None else coerce(v)
+            return v is not None and v > bound
+    elif op == "lt":
+        def test(v, bound=operand):
+            v = None if v is None else coerce(v)
+            return v is not None and v < bound
+    elif op == "gte":
+        def test(v, bound=operand):
+            v = None if v is None else coerce(v)
+            return v is not None and v >= bound
+    elif op == "lte":
+        def test(v, bound=operand):
+            v = None if v is None else coerce(v)
+            return v is not None and v <= bound
+    else:
+        def test(v, low=operand[0], high=operand[1]):
+            v = None if v is None else coerce(v)
+            return v is not None and low <= v <= high
+
+    return FilterClause(field, op, operand, kind, test)
+
+
+def _compile_equality(field: str, op: str, value: Any) -> FilterClause:
+    # Datetime fields compare instants when the operand is a timestamp
+    if field in DATETIME_FIELDS:
+        values = _split_values(value) if op == "in" else [value]
+        instants = [
+            to_epoch_us(v) if isinstance(v, (str, datetime)) else None
+            for v in values
+        ]
+
+        if all(instant is not None for instant in instants):
+            targets = frozenset(instants)
+
+            def matches(v):
+                return v is not None and to_epoch_us(v) in targets
+
+            if op == "ne":
+                return FilterClause(field, op, targets, "datetime", lambda v: not matches(v))
+            return FilterClause(field, op, targets, "datetime", matches)
+
+    text = datetime_text if field in DATETIME_FIELDS else to_text
+
+    if op == "in":
+        targets = frozenset(to_text(v) for v in _split_values(value))
+        return FilterClause(
+            field, op, targets, "text",
+            lambda v: text(v) in targets
+        )
+
+    target = to_text(value)
+
+    if op == "ne":
+        return FilterClause(
+            field, op, target, "text",
+            lambda v: text(v) != target
+        )
+
+    return FilterClause(
+        field, "eq", target, "text",
+        lambda v: text(v) == target
+    )
+
+
+def _compile_contains(field: str, value: Any) -> FilterClause:
+    text = datetime_text if field in DATETIME_FIELDS else to_text
+    needle = to_text(value).lower()
+    return FilterClause(
+        field, "contains", needle, "text",
+        lambda v: v is not None and needle in text(v).lower()
+    )
+
+
+# -------------------------
+# Public API
+# -------------------------
+def compile_clause(key: str, value: Any) -> FilterClause:
+    """
+    Compile a single `field` or `field__op` filter entry.
+    """
+    if "__" in key:
+        field, op = key.split("__", 1)
+    else:
+        field, op = key, "eq"
+
+    if op not in SUPPORTED_OPERATORS:
+        raise FilterError(
+            f"Unsupported filter operator '{op}' in '{key}'. "
+            f"Supported: {', '.join(sorted(SUPPORTED_OPERATORS))}"
+        )
+
+    if op in RANGE_OPERATORS:
+        return _compile_range(field, op, value)
+
+    if op == "contains":
+        return _compile_contains(field, value)
+
+    return _compile_equality(field, op, value)
+
+
+def compile_filters(filters: Dict[str, Any] | None) -> CompiledFilter | None:
+    """
+    Turn a `DataQuery.filters` dict into a single predicate.
+
+    Supported forms:
+    - field=value            string equality
+    - field__ne=value        string inequality
+    - field__in=a,b          membership (list or comma-separated)
+    - field__contains=text   case-insensitive substring
+    - field__gt/gte/lt/lte   numeric, or instant for datetime fields
+    - field__between=a,b     inclusive range
+
+    Returns None when there is nothing to filter.
+    """
+    if not filters:
+        return None
+
+    return CompiledFilter([
+        compile_clause(key, value)
+        for key, value in filters.items()
+    ])
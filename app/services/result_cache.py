@@ -0,0 +1,141 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+from app.config import settings
+from app.models.common import DataQuery, DataResponse
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_CACHED_FRESHNESS = re.compile(r"^cached_(\d+)([smh])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+
+def ttl_for_freshness(freshness: str) -> float:
+    """
+    Cache lifetime derived from a connector's freshness indicator.
+    'cached_5m' -> 300s, 'real-time' -> RESULT_CACHE_REALTIME_TTL.
+    """
+    match = _CACHED_FRESHNESS.match(freshness)
+    if match:
+        return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+    if freshness == "real-time":
+        return settings.RESULT_CACHE_REALTIME_TTL
+
+    return settings.RESULT_CACHE_DEFAULT_TTL
+
+
+def query_key(query: DataQuery) -> str:
+    """
+    Canonical form of a query: field order and filter order do not
+    change the key.
+    """
+    return json.dumps(
+        query.model_dump(mode="json"),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+
+
+class ResultCache:
+    """
+    LRU cache of connector responses, bounded by approximate size.
+
+    Keys combine the connector, its dataset snapshot version and the
+    canonical query, so a changed dataset never serves stale entries.
+    Entries also expire after a TTL derived from `freshness()`.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[DataResponse, int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # -------------------------
+    # Lookup / Store
+    # -------------------------
+    def get(self, key: Tuple[str, str, str]) -> DataResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            response, size, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return response.model_copy(deep=True)
+
+    def put(self, key: Tuple[str, str, str], response: DataResponse, ttl: float) -> None:
+        if ttl <= 0:
+            return
+
+        size = len(response.model_dump_json())
+        if size > self.max_bytes:
+            return
+
+        stored = response.model_copy(deep=True)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (stored, size, time.monotonic() + ttl)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Tuple[str, str, str]) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+RESULT_CACHE = ResultCache(settings.RESULT_CACHE_MAX_BYTES)
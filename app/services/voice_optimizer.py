@@ -98,3 +98,58 @@ class VoiceOptimizer:
         summary = f"The latest value of {metric} is {value}."
 
         return data, summary
+
+    # -------------------------
+    # Aggregate Voice
+    # -------------------------
+    @staticmethod
+    def _aggregate_label(function: str, percentile: float | None) -> str:
+        if function == "avg":
+            return "average"
+        if function != "percentile":
+            return function
+
+        q = 50.0 if percentile is None else percentile
+        if q != int(q):
+            return f"{q:g}th percentile"
+
+        q = int(q)
+        suffix = "th" if 10 <= q % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(q % 10, "th")
+        return f"{q}{suffix} percentile"
+
+    @staticmethod
+    def summarize_aggregate(
+        rows: List[Dict[str, Any]],
+        function: str,
+        period: str | None = None,
+        percentile: float | None = None
+    ) -> str:
+        """
+        Spoken summary of aggregate rows. Pass every row, not one page:
+        resampled series are described by their most recent bucket.
+        """
+        if not rows:
+            return "No analytics data found for the requested window."
+
+        label = VoiceOptimizer._aggregate_label(function, percentile)
+
+        if period is None:
+            return " ".join(
+                f"The {label} of {row['metric_name']} for {row['period']} "
+                f"is {row['value']}."
+                for row in rows
+            )
+
+        cadence = {"day": "daily", "week": "weekly", "month": "monthly"}.get(period, period)
+
+        # Rows are grouped by metric, oldest bucket first
+        by_metric: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_metric.setdefault(row["metric_name"], []).append(row)
+
+        return " ".join(
+            f"There are {len(buckets)} {cadence} {label} values for "
+            f"{metric}. The most recent, {buckets[-1]['period']}, "
+            f"is {buckets[-1]['value']}."
+            for metric, buckets in by_metric.items()
+        )
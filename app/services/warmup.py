@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Dict, Any
+
+from app.config import settings
+from app.connectors.registry import REGISTRY
+from app.utils.executor import run_blocking
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Boot timings, filled in by the app lifespan and served on /metrics
+STARTUP: Dict[str, Any] = {
+    "import_seconds": 0.0,
+    "warmup_seconds": 0.0,
+    "ready_seconds": 0.0,
+    "warmup_seconds_by_source": {},
+}
+
+
+def _warm(source: str) -> float:
+    started = time.perf_counter()
+
+    # Creating the connector runs its startup() hook
+    REGISTRY.get(source).warmup()
+
+    if settings.SPECULATIVE_PREFETCH:
+        from app.llm.prefetch import known_values
+        known_values(source)
+
+    return time.perf_counter() - started
+
+
+async def warm_up() -> Dict[str, float]:
+    """
+    Start every registered connector and run its `warmup()` hook
+    (snapshot, indexes, columnar store, rollups) concurrently on the
+    blocking executor.
+    A connector that fails to warm up is logged and left to load on
+    first use. Returns seconds spent per source.
+    """
+    sources = REGISTRY.sources()
+
+    results = await asyncio.gather(
+        *(run_blocking(_warm, source) for source in sources),
+        return_exceptions=True
+    )
+
+    timings: Dict[str, float] = {}
+
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            logger.warning("Warmup of %s failed: %s", source, result)
+            continue
+        timings[source] = result
+        logger.info("Warmed up %s in %.1f ms", source, result * 1000)
+
+    return timings
+
+
+def startup_stats() -> Dict[str, Any]:
+    return dict(STARTUP)
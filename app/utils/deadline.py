@@ -0,0 +1,73 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List
+
+
+# Absolute time.monotonic() by which the current request must answer
+_DEADLINE: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+# Stages that cut corners to meet the deadline, in order
+_DEGRADED: ContextVar[List[str] | None] = ContextVar("degraded_stages", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised at a cancellation point once the request deadline passed.
+    """
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Run the enclosed request under a latency budget of `seconds`.
+    A nested deadline can shorten, but never extend, an outer one.
+    """
+    expires = None if seconds is None else time.monotonic() + seconds
+
+    outer = _DEADLINE.get()
+    if outer is not None and (expires is None or outer < expires):
+        expires = outer
+
+    deadline_token = _DEADLINE.set(expires)
+    degraded_token = _DEGRADED.set([])
+
+    try:
+        yield
+    finally:
+        _DEGRADED.reset(degraded_token)
+        _DEADLINE.reset(deadline_token)
+
+
+def remaining() -> float | None:
+    """
+    Seconds left in the current request's budget, None without one.
+    """
+    expires = _DEADLINE.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def below(seconds: float) -> bool:
+    """
+    Whether a deadline is set and fewer than `seconds` remain.
+    """
+    left = remaining()
+    return left is not None and left < seconds
+
+
+def check_deadline(stage: str) -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage}")
+
+
+def degrade(stage: str) -> None:
+    stages = _DEGRADED.get()
+    if stages is not None and stage not in stages:
+        stages.append(stage)
+
+
+def degraded_stages() -> List[str]:
+    return list(_DEGRADED.get() or ())
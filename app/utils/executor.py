@@ -0,0 +1,51 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, TypeVar
+
+from app.config import settings
+
+
+T = TypeVar("T")
+
+# Shared, bounded pool for blocking I/O and CPU-bound pipeline stages,
+# so async endpoints never run them on the event loop.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_WORKERS,
+    thread_name_prefix="blocking"
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run `func` on the bounded blocking executor and await its result.
+    The caller's context variables (e.g. the request deadline) are
+    visible to `func`.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _EXECUTOR,
+        functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def submit(func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """
+    `executor().submit` that carries the caller's context variables.
+    """
+    return _EXECUTOR.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def map_blocking(func: Callable[[Any], T], items: Iterable[Any]) -> List[T]:
+    """
+    Apply `func` to every item concurrently on the blocking executor,
+    each call in a copy of the caller's context. Results keep order.
+    """
+    futures = [submit(func, item) for item in items]
+    return [future.result() for future in futures]
+
+
+def executor() -> ThreadPoolExecutor:
+    return _EXECUTOR
@@ -1,10 +1,257 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator
 
+from app.config import settings
 
-def configure_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
\ No newline at end of file
+
+# Id of the request being served, attached to every log record
+_REQUEST_ID: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def current_request_id() -> str | None:
+    return _REQUEST_ID.get()
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+# -------------------------
+# Filters
+# -------------------------
+class RequestIdFilter(logging.Filter):
+    """
+    Stamp records with the current request id. Runs on the emitting
+    thread, where the request's context is visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _REQUEST_ID.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of INFO-and-below records per logger.
+
+    `rates` maps logger names to the fraction kept; a rate applies to
+    the logger and its children, the most specific name winning.
+    Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+
+        rate = self.rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+# -------------------------
+# Formatters
+# -------------------------
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, request_id,
+    any `extra=` fields and the formatted exception, if any.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str)
+
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | %(message)s"
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        return super().format(record)
+
+
+# -------------------------
+# Queue Handler
+# -------------------------
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that only interpolates the message on the emitting
+    thread (arguments may be mutated after the call returns) and
+    leaves formatting - JSON encoding, timestamps, tracebacks - to
+    the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(
+    level: str | None = None,
+    fmt: str | None = None,
+    sampling: Dict[str, float] | None = None,
+    stream=None
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue: request code only enqueues
+    records, a background listener formats and writes them.
+
+    Defaults come from LOG_LEVEL, LOG_FORMAT ("json" or "text") and
+    LOG_SAMPLING. Calling again replaces the previous configuration.
+    """
+    global _listener
+
+    level = level or settings.LOG_LEVEL
+    fmt = fmt or settings.LOG_FORMAT
+    sampling = settings.LOG_SAMPLING if sampling is None else sampling
+
+    if fmt not in ("json", "text"):
+        raise ValueError(f"Unsupported log format: {fmt}. Use 'json' or 'text'")
+
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else _TextFormatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the listener after writing every queued record.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+# -------------------------
+# Request Ids
+# -------------------------
+class RequestIdMiddleware:
+    """
+    ASGI middleware binding a request id for the lifetime of each HTTP
+    request (including streamed bodies). Reuses an incoming
+    X-Request-ID header and echoes the id on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:128]
+                break
+
+        request_id = request_id or new_request_id()
+        token = _REQUEST_ID.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _REQUEST_ID.reset(token)
+
+
+@contextmanager
+def request_scope(request_id: str | None = None) -> Iterator[str]:
+    """
+    Bind a request id outside HTTP (scripts, background jobs).
+    """
+    token = _REQUEST_ID.set(request_id or new_request_id())
+    try:
+        yield _REQUEST_ID.get()
+    finally:
+        _REQUEST_ID.reset(token)
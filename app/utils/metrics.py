@@ -0,0 +1,341 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import List, Dict, Any, Callable, Iterable, Sequence, Tuple
+
+from app.config import settings
+
+
+# Seconds: sub-millisecond connector stages up to slow LLM calls
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram per label set, rendered in the Prometheus
+    text format. `observe` is one bisect and a short locked update.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.observe_many(((value, labels),))
+
+    def observe_many(self, samples: Iterable[Tuple[float, LabelValues]]) -> None:
+        """
+        Record several (value, labels) samples under one lock.
+        """
+        buckets = self.buckets
+
+        with self._lock:
+            for value, labels in samples:
+                series = self._series.get(labels)
+                if series is None:
+                    # [bucket counts..., +Inf count, sum]
+                    series = self._series[labels] = [0] * (len(buckets) + 1) + [0.0]
+                series[bisect_left(buckets, value)] += 1
+                series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        lines = []
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter per label set.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = dict(self._values)
+        return [
+            f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+            for labels, value in sorted(snapshot.items())
+        ]
+
+
+# -------------------------
+# Stage Timing
+# -------------------------
+class StageClock:
+    """
+    Times consecutive stages of one operation: each `lap(stage)`
+    closes the stage that ran since the previous lap. `finish()`
+    records every stage into the histogram and returns the timings
+    in seconds.
+    """
+
+    __slots__ = ("histogram", "labels", "stages", "_last")
+
+    def __init__(self, histogram: Histogram, *labels: str):
+        self.histogram = histogram
+        self.labels = labels
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def finish(self) -> Dict[str, float]:
+        if settings.METRICS_ENABLED:
+            labels = self.labels
+            self.histogram.observe_many(
+                (seconds, labels + (stage,)) for stage, seconds in self.stages.items()
+            )
+        return self.stages
+
+
+class _NullClock:
+    """
+    Stand-in used while metrics are disabled.
+    """
+
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def finish(self) -> Dict[str, float]:
+        return {}
+
+
+NULL_CLOCK = _NullClock()
+
+
+def stage_clock(histogram: Histogram, *labels: str) -> StageClock | _NullClock:
+    """
+    A running StageClock, or a no-op clock when neither METRICS_ENABLED
+    nor DEBUG_TIMINGS is set.
+    """
+    if settings.METRICS_ENABLED or settings.DEBUG_TIMINGS:
+        return StageClock(histogram, *labels)
+    return NULL_CLOCK
+
+
+# -------------------------
+# Registry
+# -------------------------
+class MetricsRegistry:
+    """
+    Histograms and counters recorded in-process, plus collectors that
+    turn existing `stats()` dicts (caches, fast path, prefetcher) into
+    gauges at scrape time.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram | Counter] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, label_names, buckets))
+
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, label_names))
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def collector(self, prefix: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Expose numeric values of `stats()` as `<prefix>_<name>` gauges,
+        read at scrape time.
+        """
+        with self._lock:
+            self._collectors[prefix] = stats
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+
+        lines: List[str] = []
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+
+        for prefix, stats in collectors:
+            lines.extend(_gauges(prefix, stats()))
+
+        return "\n".join(lines) + "\n"
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _gauges(prefix: str, stats: Dict[str, Any]) -> Iterable[str]:
+    """
+    Flatten a stats dict into gauge lines. A dict of per-tier dicts
+    maps the tier to a label ({"plans": {"hits": 3}} ->
+    <prefix>_hits{tier="plans"}); a nested dict of numbers maps its
+    keys to a label ({"fired_by_source": {"crm": 2}} ->
+    <prefix>_fired_by_source{key="crm"}).
+    """
+    samples: Dict[str, List[Tuple[str, float]]] = {}
+
+    if stats and all(isinstance(value, dict) for value in stats.values()):
+        for tier, tier_stats in stats.items():
+            for name, value in tier_stats.items():
+                if _numeric(value):
+                    samples.setdefault(f"{prefix}_{name}", []).append((_labels(("tier",), (tier,)), value))
+    else:
+        for name, value in stats.items():
+            if isinstance(value, bool):
+                value = int(value)
+
+            if _numeric(value):
+                samples.setdefault(f"{prefix}_{name}", []).append(("", value))
+            elif isinstance(value, dict):
+                for key, inner in value.items():
+                    if _numeric(inner):
+                        samples.setdefault(f"{prefix}_{name}", []).append((_labels(("key",), (key,)), inner))
+
+    for name, values in samples.items():
+        yield f"# TYPE {name} gauge"
+        for labels, value in values:
+            yield f"{name}{labels} {_number(value)}"
+
+
+METRICS = MetricsRegistry()
+
+CONNECTOR_STAGE_SECONDS = METRICS.histogram(
+    "connector_stage_seconds",
+    "Time spent in each connector pipeline stage",
+    ("source", "stage"),
+)
+
+CONNECTOR_EXECUTE_SECONDS = METRICS.histogram(
+    "connector_execute_seconds",
+    "Connector execute() latency, by result cache outcome",
+    ("source", "cache"),
+)
+
+LLM_REQUEST_SECONDS = METRICS.histogram(
+    "llm_request_seconds",
+    "LLM completion latency (streams: until the last chunk)",
+    ("mode", "tools"),
+)
+
+LLM_FIRST_TOKEN_SECONDS = METRICS.histogram(
+    "llm_first_token_seconds",
+    "Time to the first streamed chunk of an LLM completion",
+    ("tools",),
+)
+
+LLM_TOKENS = METRICS.histogram(
+    "llm_tokens",
+    "Tokens per LLM completion",
+    ("kind",),
+    TOKEN_BUCKETS,
+)
+
+LLM_TOKENS_TOTAL = METRICS.counter(
+    "llm_tokens_total",
+    "Tokens used by LLM completions",
+    ("kind",),
+)
+
+LLM_ERRORS_TOTAL = METRICS.counter(
+    "llm_errors_total",
+    "LLM completions that raised",
+    ("error",),
+)
+
+CHAT_TURN_SECONDS = METRICS.histogram(
+    "chat_turn_seconds",
+    "End-to-end chat turn latency",
+    ("mode",),
+)
+
+
+def record_usage(usage: Any) -> None:
+    """
+    Record prompt/completion token counts from a completion's `usage`.
+    """
+    if usage is None or not settings.METRICS_ENABLED:
+        return
+
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens is None and isinstance(usage, dict):
+            tokens = usage.get(f"{kind}_tokens")
+        if isinstance(tokens, int) and tokens > 0:
+            LLM_TOKENS.observe(tokens, kind)
+            LLM_TOKENS_TOTAL.inc(tokens, kind)
@@ -1,116 +1,362 @@
+"""
+Deterministic mock data generator.
+
+    python -m app.utils.mock_data --customers 1000000 --tickets 5000000 \
+        --analytics-days 30 --granularity minute --format ndjson \
+        --seed 42 --as-of 2026-01-01 --workers 8 --out data
+
+Rows are produced in fixed-size chunks, each from its own seeded RNG,
+so the output depends only on the arguments (not on --workers). Each
+chunk is streamed to a part file by a worker process and the parts
+are concatenated in order, keeping memory flat at any size.
+"""
+import argparse
+import hashlib
 import json
+import math
+import os
 import random
-from datetime import datetime, timedelta,UTC
-from pathlib import Path
-from typing import List, Dict
+import shutil
+import tempfile
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Tuple
 
 
 DATA_DIR = Path("data")
-DATA_DIR.mkdir(exist_ok=True)
 
+FORMATS = ("json", "ndjson")
 
-# -------------------------
-# CRM MOCK DATA
-# -------------------------
+# Rows per unit of work; also the unit of determinism
+CHUNK_ROWS = 100_000
 
-def generate_customers(n: int = 50) -> List[Dict]:
-    statuses = ["active", "inactive", "churned"]
-    companies = ["Acme Corp", "Globex", "Initech", "Umbrella", "Wayne Enterprises"]
+GRANULARITY_SECONDS = {"minute": 60, "hour": 3600, "day": 86_400}
 
-    customers = []
+STATUSES = ["active", "inactive", "churned"]
+STATUS_WEIGHTS = [70, 20, 10]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Wayne Enterprises"]
 
-    for _ in range(n):
-        created_at = datetime.now(UTC) - timedelta(days=random.randint(30, 1000))
+PRIORITIES = ["low", "medium", "high", "critical"]
+PRIORITY_WEIGHTS = [45, 32, 16, 7]
 
-        customers.append({
-            "id": str(uuid.uuid4()),
-            "name": f"Customer_{random.randint(1000, 9999)}",
-            "email": f"user{random.randint(100,999)}@example.com",
-            "company": random.choice(companies),
-            "status": random.choice(statuses),
-            "lifetime_value": round(random.uniform(100, 20000), 2),
-            "created_at": created_at.isoformat(),
-            "last_activity_at": (
-                created_at + timedelta(days=random.randint(1, 365))
-            ).isoformat()
-        })
+METRICS = ["daily_active_users", "revenue", "new_signups"]
 
-    return customers
+# (baseline, daily swing as a share of baseline)
+METRIC_SHAPES = {
+    "daily_active_users": (5000.0, 0.35),
+    "revenue": (2500.0, 0.5),
+    "new_signups": (120.0, 0.6),
+}
 
 
 # -------------------------
-# SUPPORT MOCK DATA
+# Deterministic Randomness
 # -------------------------
+def _rng(seed: int, dataset: str, chunk: int) -> random.Random:
+    return random.Random(f"{seed}:{dataset}:{chunk}")
 
-def generate_support_tickets(n: int = 100) -> List[Dict]:
-    priorities = ["low", "medium", "high", "critical"]
-    statuses = ["open", "in_progress", "resolved", "closed"]
 
-    tickets = []
+def stable_uuid(seed: int, kind: str, index: int) -> str:
+    """
+    UUID fixed by (seed, kind, index): lets tickets reference customer
+    ids without keeping the customer table in memory.
+    """
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
 
-    for _ in range(n):
-        created_at = datetime.now(UTC) - timedelta(days=random.randint(0, 90))
 
-        tickets.append({
-            "id": str(uuid.uuid4()),
-            "customer_id": str(uuid.uuid4()),
-            "subject": f"Issue_{random.randint(1000,9999)}",
-            "description": "Auto-generated support ticket.",
-            "priority": random.choice(priorities),
-            "status": random.choice(statuses),
+def _chunks(rows: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + CHUNK_ROWS, rows)) for start in range(0, rows, CHUNK_ROWS)]
+
+
+# -------------------------
+# CRM MOCK DATA
+# -------------------------
+def iter_customers(start: int, stop: int, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    seed = options["seed"]
+    as_of = datetime.fromisoformat(options["as_of"])
+    rng = _rng(seed, "customers", start // CHUNK_ROWS)
+
+    for index in range(start, stop):
+        created_at = as_of - timedelta(days=rng.randint(30, 1000), seconds=rng.randint(0, 86_399))
+        last_activity_at = min(as_of, created_at + timedelta(days=rng.randint(1, 365)))
+
+        yield {
+            "id": stable_uuid(seed, "customer", index),
+            "name": f"Customer_{index + 1}",
+            "email": f"user{index + 1}@example.com",
+            "company": rng.choice(COMPANIES),
+            "status": rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+            # Long-tailed: most customers are small, a few are large
+            "lifetime_value": round(min(rng.lognormvariate(7.5, 1.0), 250_000.0), 2),
             "created_at": created_at.isoformat(),
-            "resolved_at": (
-                created_at + timedelta(days=random.randint(1, 10))
-            ).isoformat() if random.random() > 0.5 else None
-        })
+            "last_activity_at": last_activity_at.isoformat(),
+        }
 
-    return tickets
+
+# -------------------------
+# SUPPORT MOCK DATA
+# -------------------------
+def _ticket_status(rng: random.Random, age_days: float) -> str:
+    if age_days < 2:
+        return rng.choices(["open", "in_progress", "resolved"], [60, 35, 5])[0]
+    if age_days < 14:
+        return rng.choices(["open", "in_progress", "resolved", "closed"], [20, 25, 35, 20])[0]
+    return rng.choices(["open", "in_progress", "resolved", "closed"], [3, 2, 35, 60])[0]
+
+
+def iter_tickets(start: int, stop: int, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    seed = options["seed"]
+    as_of = datetime.fromisoformat(options["as_of"])
+    customers = options["customers"]
+    skew = options["skew"]
+    rng = _rng(seed, "tickets", start // CHUNK_ROWS)
+
+    if customers < 1:
+        raise ValueError("Tickets need at least one customer to reference")
+
+    for index in range(start, stop):
+        # Power-law customer choice: low indices file most tickets
+        customer = min(int(customers * rng.random() ** skew), customers - 1)
+
+        # More recent days carry more tickets
+        age_days = 90 * rng.random() ** 1.5
+        created_at = as_of - timedelta(days=age_days)
+        status = _ticket_status(rng, age_days)
+
+        resolved_at = None
+        if status in ("resolved", "closed"):
+            resolved_at = min(as_of, created_at + timedelta(hours=rng.expovariate(1 / 36))).isoformat()
+
+        yield {
+            "id": stable_uuid(seed, "ticket", index),
+            "customer_id": stable_uuid(seed, "customer", customer),
+            "subject": f"Issue_{index + 1}",
+            "description": "Auto-generated support ticket.",
+            "priority": rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+            "status": status,
+            "created_at": created_at.isoformat(),
+            "resolved_at": resolved_at,
+        }
 
 
 # -------------------------
 # ANALYTICS MOCK DATA
 # -------------------------
+def analytics_rows(options: Dict[str, Any]) -> int:
+    per_metric = options["days"] * 86_400 // GRANULARITY_SECONDS[options["granularity"]]
+    return per_metric * len(options["metrics"])
+
 
-def generate_analytics(days: int = 30) -> List[Dict]:
-    metrics = ["daily_active_users", "revenue", "new_signups"]
+def iter_analytics(start: int, stop: int, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    seed = options["seed"]
+    as_of = datetime.fromisoformat(options["as_of"])
+    metrics = options["metrics"]
+    step = GRANULARITY_SECONDS[options["granularity"]]
+    per_metric = options["days"] * 86_400 // step
+    rng = _rng(seed, "analytics", start // CHUNK_ROWS)
 
-    analytics = []
-    today = datetime.now(UTC)
+    for index in range(start, stop):
+        metric = metrics[index // per_metric]
+        offset = index % per_metric
+        timestamp = as_of - timedelta(seconds=offset * step)
 
-    for metric in metrics:
-        for i in range(days):
-            date = today - timedelta(days=i)
+        baseline, swing = METRIC_SHAPES.get(metric, (1000.0, 0.3))
 
-            analytics.append({
-                "metric_name": metric,
-                "timestamp": date.isoformat(),
-                "value": round(random.uniform(100, 10000), 2)
-            })
+        # Daily cycle peaking mid-afternoon UTC, plus noise
+        hour = timestamp.hour + timestamp.minute / 60
+        cycle = 1 + swing * math.sin((hour - 9) / 24 * 2 * math.pi)
+        value = max(0.0, rng.gauss(baseline * cycle, baseline * 0.05))
 
-    return analytics
+        yield {
+            "metric_name": metric,
+            "timestamp": timestamp.isoformat(),
+            "value": round(value, 2),
+        }
+
+
+ROW_FACTORIES: Dict[str, Callable[[int, int, Dict[str, Any]], Iterator[Dict[str, Any]]]] = {
+    "customers": iter_customers,
+    "support_tickets": iter_tickets,
+    "analytics": iter_analytics,
+}
 
 
 # -------------------------
-# WRITE TO FILES
+# Streaming Writers
 # -------------------------
+def _write_part(task: Tuple[str, int, int, Dict[str, Any], str, str]) -> str:
+    dataset, start, stop, options, fmt, part_path = task
+
+    with open(part_path, "w", encoding="utf-8") as f:
+        rows = ROW_FACTORIES[dataset](start, stop, options)
+
+        if fmt == "ndjson":
+            for row in rows:
+                f.write(json.dumps(row))
+                f.write("\n")
+        else:
+            f.write(json.dumps(next(rows)))
+            for row in rows:
+                f.write(",\n")
+                f.write(json.dumps(row))
+
+    return part_path
+
+
+def write_dataset(
+    dataset: str,
+    rows: int,
+    options: Dict[str, Any],
+    out_dir: Path = DATA_DIR,
+    fmt: str = "json",
+    workers: int = 1
+) -> Path:
+    """
+    Generate `rows` rows of `dataset` into out_dir/<dataset>.<fmt>.
+    The file is replaced atomically once complete.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}. Use one of {FORMATS}")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    target = out_dir / f"{dataset}.{fmt}"
+
+    with tempfile.TemporaryDirectory(dir=out_dir, prefix=f".{dataset}-") as scratch:
+        tasks = [
+            (dataset, start, stop, options, fmt, os.path.join(scratch, f"part-{i:06d}"))
+            for i, (start, stop) in enumerate(_chunks(rows))
+        ]
+
+        partial = Path(scratch) / target.name
+
+        with open(partial, "w", encoding="utf-8") as out:
+            if fmt == "json":
+                out.write("[\n")
+
+            if workers > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    _concatenate(out, pool.map(_write_part, tasks), fmt)
+            else:
+                _concatenate(out, map(_write_part, tasks), fmt)
+
+            if fmt == "json":
+                out.write("\n]\n")
+
+        os.replace(partial, target)
+
+    return target
+
+
+def _concatenate(out, part_paths: Iterator[str], fmt: str) -> None:
+    for i, part_path in enumerate(part_paths):
+        if fmt == "json" and i:
+            out.write(",\n")
+        with open(part_path, "r", encoding="utf-8") as part:
+            shutil.copyfileobj(part, out)
+        os.remove(part_path)
+
+
+def default_options(
+    seed: int | None = None,
+    as_of: datetime | None = None,
+    customers: int = 50,
+    skew: float = 2.5,
+    days: int = 30,
+    granularity: str = "day",
+    metrics: List[str] | None = None
+) -> Dict[str, Any]:
+    if granularity not in GRANULARITY_SECONDS:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+    return {
+        "seed": random.randrange(1 << 32) if seed is None else seed,
+        "as_of": (as_of or datetime.now(UTC)).isoformat(),
+        "customers": customers,
+        "skew": skew,
+        "days": days,
+        "granularity": granularity,
+        "metrics": list(metrics or METRICS),
+    }
 
-def write_mock_data():
-    customers = generate_customers()
-    tickets = generate_support_tickets()
-    analytics = generate_analytics()
 
-    with open(DATA_DIR / "customers.json", "w", encoding="utf-8") as f:
-        json.dump(customers, f, indent=2)
+# -------------------------
+# In-memory Helpers
+# -------------------------
+def generate_customers(n: int = 50, options: Dict[str, Any] | None = None) -> List[Dict]:
+    options = options or default_options(customers=n)
+    return list(iter_customers(0, n, options))
+
+
+def generate_support_tickets(n: int = 100, options: Dict[str, Any] | None = None) -> List[Dict]:
+    options = options or default_options()
+    return list(iter_tickets(0, n, options))
+
 
-    with open(DATA_DIR / "support_tickets.json", "w", encoding="utf-8") as f:
-        json.dump(tickets, f, indent=2)
+def generate_analytics(days: int = 30, options: Dict[str, Any] | None = None) -> List[Dict]:
+    options = options or default_options(days=days)
+    return list(iter_analytics(0, analytics_rows(options), options))
 
-    with open(DATA_DIR / "analytics.json", "w", encoding="utf-8") as f:
-        json.dump(analytics, f, indent=2)
 
-    print("Mock data generated successfully.")
+# -------------------------
+# WRITE TO FILES
+# -------------------------
+def write_mock_data(
+    customers: int = 50,
+    tickets: int = 100,
+    options: Dict[str, Any] | None = None,
+    out_dir: Path = DATA_DIR,
+    fmt: str = "json",
+    workers: int = 1
+) -> List[Path]:
+    options = options or default_options(customers=customers)
+    options["customers"] = customers
+
+    return [
+        write_dataset("customers", customers, options, out_dir, fmt, workers),
+        write_dataset("support_tickets", tickets, options, out_dir, fmt, workers),
+        write_dataset("analytics", analytics_rows(options), options, out_dir, fmt, workers),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--analytics-days", type=int, default=30)
+    parser.add_argument("--granularity", choices=sorted(GRANULARITY_SECONDS), default="day")
+    parser.add_argument("--metrics", nargs="+", default=METRICS)
+    parser.add_argument("--skew", type=float, default=2.5, help="ticket-per-customer skew (1 = uniform)")
+    parser.add_argument("--seed", type=int, default=None, help="fix for reproducible output")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=None, help="reference 'now' (UTC ISO date)")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    as_of = args.as_of
+    if as_of is not None and as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=UTC)
+
+    options = default_options(
+        seed=args.seed,
+        as_of=as_of,
+        customers=args.customers,
+        skew=args.skew,
+        days=args.analytics_days,
+        granularity=args.granularity,
+        metrics=args.metrics,
+    )
+
+    paths = write_mock_data(args.customers, args.tickets, options, args.out, args.format, args.workers)
+
+    print(f"Mock data generated successfully (seed={options['seed']}, as_of={options['as_of']}):")
+    for path in paths:
+        print(f"  {path} ({path.stat().st_size:,} bytes)")
 
 
 if __name__ == "__main__":
-    write_mock_data()
+    main()
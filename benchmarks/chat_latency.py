@@ -0,0 +1,210 @@
+"""
+Drive the chat endpoints at a fixed concurrency and report latency.
+
+This starts benchmarks.fake_groq and the app itself on background
+uvicorn threads, with the app's Groq clients pointed at the fake, so
+the numbers cover the whole chat hot path (HTTP included) except the
+real model:
+
+    python -m benchmarks.chat_latency --requests 200 --concurrency 16
+    python -m benchmarks.chat_latency --endpoint stream --latency-ms 300
+
+Reports p50/p95/p99 and mean latency, throughput, time to first byte
+for streaming, and a per-stage breakdown: time spent inside the fake
+LLM (tool choice, answer) versus in the app (connectors, encoding,
+framework overhead).
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import List, Dict, Any
+
+import httpx
+
+from benchmarks.fake_groq import FakeGroqScript, serve_app_in_thread, serve_in_thread
+
+
+DEFAULT_MESSAGES = [
+    "How many critical tickets are open?",
+    "Who are our top customers?",
+    "What is the average daily active users?",
+    "Show me active customers",
+    "Any escalated support tickets today?",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def stream_ok(body: bytes) -> bool:
+    """
+    Whether an NDJSON chat stream ended in a `done` event. Failures
+    after the headers are sent arrive as a final `error` event.
+    """
+    lines = body.strip().splitlines()
+    if not lines:
+        return False
+
+    try:
+        return json.loads(lines[-1]).get("event") == "done"
+    except ValueError:
+        return False
+
+
+async def _one(client: httpx.AsyncClient, endpoint: str, message: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    first_byte = None
+
+    if endpoint == "stream":
+        async with client.stream("POST", "/chat/stream?format=ndjson", json={"message": message}) as response:
+            body = bytearray()
+            async for chunk in response.aiter_raw():
+                if first_byte is None:
+                    first_byte = time.perf_counter()
+                body += chunk
+            ok = response.status_code == 200 and stream_ok(bytes(body))
+    else:
+        response = await client.post("/chat/", json={"message": message})
+        ok = response.status_code == 200
+
+    finished = time.perf_counter()
+
+    return {
+        "ok": ok,
+        "ms": (finished - started) * 1000,
+        "ttfb_ms": (first_byte - started) * 1000 if first_byte else None,
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    messages: List[str],
+    total: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(messages[i % len(messages)])
+
+    results: List[Dict[str, Any]] = []
+
+    async def worker():
+        while True:
+            try:
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            results.append(await _one(client, endpoint, message))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r["ms"] for r in results if r["ok"]]
+    ttfb = [r["ttfb_ms"] for r in results if r["ok"] and r["ttfb_ms"] is not None]
+
+    return {
+        "requests": len(results),
+        "errors": sum(1 for r in results if not r["ok"]),
+        "throughput_rps": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies) if latencies else float("nan"),
+        "ttfb_p50_ms": percentile(ttfb, 50) if ttfb else None,
+    }
+
+
+def breakdown(report: Dict[str, Any], fake_stats: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Mean time per request inside the fake LLM by call kind, and the
+    remainder spent in the app.
+    """
+    requests = max(report["requests"] - report["errors"], 1)
+    stages = {
+        f"llm_{kind}": fake_stats["mean_ms"][kind] * count / requests
+        for kind, count in fake_stats["calls"].items()
+    }
+    stages["app"] = report["mean_ms"] - sum(stages.values())
+    return stages
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    script = FakeGroqScript(
+        latency_ms=args.latency_ms,
+        token_ms=args.token_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server, base_url = serve_in_thread(script)
+
+    # Settings and clients are read at import: configure first
+    os.environ["LLM_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "fake")
+    os.environ["CHAT_CACHE_ENABLED"] = "true" if args.chat_cache else "false"
+    os.environ["LLM_MAX_RETRIES"] = "0"
+
+    from app.main import app
+
+    app_server, app_url = serve_app_in_thread(app)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=app_url, timeout=60, limits=limits) as client:
+            # Warm snapshots, indexes and connections outside the measurement
+            await drive(client, args.endpoint, DEFAULT_MESSAGES, len(DEFAULT_MESSAGES), 1)
+
+            async with httpx.AsyncClient(base_url=base_url) as fake:
+                await fake.post("/_reset")
+                report = await drive(client, args.endpoint, DEFAULT_MESSAGES, args.requests, args.concurrency)
+                report["stages_ms"] = breakdown(report, (await fake.get("/_stats")).json())
+    finally:
+        app_server.should_exit = True
+        server.should_exit = True
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--endpoint", choices=("chat", "stream"), default="chat")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake LLM time to first token")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="fake LLM delay per token")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chat-cache", action="store_true", help="keep the chat answer/plan cache enabled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"requests {report['requests']}  errors {report['errors']}  throughput {report['throughput_rps']:.1f} req/s")
+    print(
+        f"latency  p50 {report['p50_ms']:.1f} ms  p95 {report['p95_ms']:.1f} ms  "
+        f"p99 {report['p99_ms']:.1f} ms  mean {report['mean_ms']:.1f} ms"
+    )
+    if report["ttfb_p50_ms"] is not None:
+        print(f"first byte p50 {report['ttfb_p50_ms']:.1f} ms")
+    print("per request: " + "  ".join(f"{stage} {ms:.1f} ms" for stage, ms in report["stages_ms"].items()))
+
+
+if __name__ == "__main__":
+    main()
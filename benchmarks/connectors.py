@@ -0,0 +1,518 @@
+"""
+Benchmark the connector pipeline across dataset sizes.
+
+Generates deterministic datasets with app.utils.mock_data (cached on
+disk per seed and size), points each connector at them and drives
+`BaseConnector.execute` over a matrix of filter shapes, pagination
+depths and voice_context on/off. Every case records wall time and,
+in a separate tracemalloc pass, peak and retained memory and the net
+number of allocated blocks, for these stages:
+
+    load     parse the dataset file into a snapshot
+    index    build the snapshot's indexes (and analytics' columnar store
+             and rollups)
+    execute  run the pipeline with the result cache bypassed
+    pipeline each stage of that run, as laid out by the connector's
+             StageClock (fetch, select, count, materialize, voice,
+             metadata; aggregate for analytics aggregates)
+    cached   answer the same query from the result cache
+
+Results are written as JSON and can be compared against a saved
+baseline; regressions beyond the threshold exit with status 1:
+
+    python -m benchmarks.connectors --sizes 1k 100k --out results.json
+    python -m benchmarks.connectors --sizes 1k 100k --baseline results.json
+    python -m benchmarks.connectors --sizes 1m 10m --sources crm --repeat 3
+
+10M rows need several GB of memory per source; sources are loaded
+and released one at a time.
+"""
+import argparse
+import gc
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Tuple
+
+from app.connectors.analytics_connector import AnalyticsConnector
+from app.connectors.base import BaseConnector
+from app.connectors.crm_connector import CRMConnector
+from app.connectors.snapshot import SNAPSHOT_CACHE
+from app.connectors.support_connector import SupportConnector
+from app.models.common import DataQuery
+from app.services.result_cache import RESULT_CACHE
+from app.utils.metrics import CONNECTOR_STAGE_SECONDS, StageClock
+from app.utils.mock_data import METRICS, default_options, write_dataset
+
+
+SEED = 1234
+AS_OF = datetime.fromisoformat("2025-01-01T00:00:00+00:00")
+
+DEFAULT_SIZES = ["1k", "10k", "100k"]
+DEFAULT_OFFSETS = [0, 1_000, 100_000]
+
+SOURCES: Dict[str, Tuple[type, str]] = {
+    "crm": (CRMConnector, "customers"),
+    "support": (SupportConnector, "support_tickets"),
+    "analytics": (AnalyticsConnector, "analytics"),
+}
+
+# Filter shapes per source: no filter, equality (hash index), range
+# (sorted index) and a date window through `scope`
+SHAPES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "crm": {
+        "none": {},
+        "equality": {"filters": {"status": "active"}},
+        "range": {"filters": {"lifetime_value__gte": 5000}},
+        "window": {"start_date": AS_OF - timedelta(days=90)},
+    },
+    "support": {
+        "none": {},
+        "equality": {"filters": {"priority": "critical"}},
+        "range": {"filters": {"created_at__gte": (AS_OF - timedelta(days=7)).isoformat()}},
+        "window": {"start_date": AS_OF - timedelta(days=7)},
+    },
+    "analytics": {
+        "none": {},
+        "equality": {"filters": {"metric_name": "revenue"}},
+        "range": {"filters": {"value__gte": 1000}},
+        "window": {"start_date": AS_OF - timedelta(hours=6)},
+        "aggregate": {"filters": {"metric_name": "revenue"}, "aggregate": "avg", "period": "day"},
+    },
+}
+
+# Deltas below these are treated as noise, whatever the ratio
+MIN_TIME_DELTA_MS = 0.05
+MIN_MEMORY_DELTA_BYTES = 64 * 1024
+
+
+def parse_size(text: str) -> int:
+    """
+    '1k' -> 1000, '10M' -> 10000000, '2500' -> 2500.
+    """
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:])
+    if scale is None:
+        return int(text)
+    return int(float(text[:-1]) * scale)
+
+
+# -------------------------
+# Datasets
+# -------------------------
+def dataset_paths(size: int, data_dir: Path, workers: int) -> Dict[str, Path]:
+    """
+    Files holding ~`size` rows per dataset, generated on first use.
+    Analytics is per-minute over as many days as `size` needs.
+    """
+    days = max(1, math.ceil(size / (1440 * len(METRICS))))
+    options = default_options(seed=SEED, as_of=AS_OF, customers=size, days=days, granularity="minute")
+    rows = {
+        "customers": size,
+        "support_tickets": size,
+        "analytics": days * 1440 * len(METRICS),
+    }
+
+    directory = Path(data_dir) / f"seed{SEED}-{size}"
+    paths = {}
+
+    for dataset, count in rows.items():
+        path = directory / f"{dataset}.ndjson"
+        if not path.exists():
+            print(f"generating {count:,} {dataset} rows into {directory}", file=sys.stderr)
+            write_dataset(dataset, count, options, directory, "ndjson", workers)
+        paths[dataset] = path
+
+    return paths
+
+
+def bench_connector(source: str, path: Path) -> BaseConnector:
+    """
+    A connector of `source` serving `path` instead of its configured file.
+    """
+    connector_class, _ = SOURCES[source]
+    connector = connector_class()
+    connector.data_path = path
+    return connector
+
+
+# -------------------------
+# Measurement
+# -------------------------
+def _timings(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _memory(func: Callable[[], Any], setup: Callable[[], Any] | None = None) -> Dict[str, int]:
+    """
+    Peak and retained bytes plus net allocated blocks of one call.
+    """
+    if setup is not None:
+        setup()
+    gc.collect()
+
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = func()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    return {
+        "peak_bytes": peak - before,
+        "retained_bytes": after - before,
+        "allocated_blocks": blocks,
+    }
+
+
+def _summary(samples: List[float]) -> Dict[str, Any]:
+    ordered = sorted(samples)
+
+    return {
+        "runs": len(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)],
+        "min_ms": ordered[0],
+    }
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int,
+    memory: bool,
+    setup: Callable[[], Any] | None = None
+) -> Dict[str, Any]:
+    result = _summary(_timings(func, repeat, setup))
+
+    if memory:
+        result.update(_memory(func, setup))
+
+    return result
+
+
+class _RecordingClock(StageClock):
+    """
+    StageClock handing each run's stage seconds to `sink` instead of
+    the metrics histogram.
+    """
+
+    __slots__ = ("sink",)
+
+    def __init__(self, sink: List[Dict[str, float]]):
+        super().__init__(CONNECTOR_STAGE_SECONDS)
+        self.sink = sink
+
+    def finish(self) -> Dict[str, float]:
+        self.sink.append(self.stages)
+        return self.stages
+
+
+class _MemoryClock(_RecordingClock):
+    """
+    Per-stage peak and retained bytes plus net allocated blocks of one
+    run, handed to `sink`. Only meaningful while tracemalloc traces.
+    """
+
+    __slots__ = ("usage", "_current", "_blocks")
+
+    def __init__(self, sink: List[Dict[str, Dict[str, int]]]):
+        super().__init__(sink)
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self._current = tracemalloc.get_traced_memory()[0]
+        self._blocks = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+
+    def lap(self, stage: str) -> None:
+        super().lap(stage)
+
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+
+        usage = self.usage.setdefault(stage, {"peak_bytes": 0, "retained_bytes": 0, "allocated_blocks": 0})
+        usage["peak_bytes"] = max(usage["peak_bytes"], peak - self._current)
+        usage["retained_bytes"] += current - self._current
+        usage["allocated_blocks"] += blocks - self._blocks
+
+        self._current = current
+        self._blocks = blocks
+        tracemalloc.reset_peak()
+
+    def finish(self) -> Dict[str, float]:
+        self.sink.append(self.usage)
+        return self.stages
+
+
+def measure_stages(
+    connector: BaseConnector,
+    func: Callable[[], Any],
+    repeat: int,
+    memory: bool
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    `measure` for a call running the connector pipeline, plus the same
+    figures for each pipeline stage.
+    """
+    timings: List[Dict[str, float]] = []
+    connector.stage_clock = lambda: _RecordingClock(timings)
+
+    try:
+        result = _summary(_timings(func, repeat))
+
+        usage: List[Dict[str, Dict[str, int]]] = []
+        if memory:
+            connector.stage_clock = lambda: _MemoryClock(usage)
+            result.update(_memory(func))
+    finally:
+        # Back to the class's clock
+        del connector.stage_clock
+
+    stages = {}
+    for stage in timings[0]:
+        stages[stage] = _summary([run[stage] * 1000 for run in timings if stage in run])
+        if usage:
+            stages[stage].update(usage[-1].get(stage, {}))
+
+    return result, stages
+
+
+# -------------------------
+# Matrix
+# -------------------------
+def queries(source: str, offsets: List[int], size: int) -> Iterator[Tuple[str, DataQuery]]:
+    for shape, fields in SHAPES[source].items():
+        for offset in offsets:
+            if offset and offset >= size:
+                continue
+            for voice_context in (True, False):
+                if shape == "aggregate" and (offset or not voice_context):
+                    continue
+                query = DataQuery(
+                    source=source,
+                    limit=10,
+                    offset=offset,
+                    voice_context=voice_context,
+                    **fields
+                )
+                yield f"{shape}/offset={offset}/voice={'on' if voice_context else 'off'}", query
+
+
+def bench_source(
+    source: str,
+    size: int,
+    path: Path,
+    offsets: List[int],
+    repeat: int,
+    memory: bool
+) -> List[Dict[str, Any]]:
+    connector = bench_connector(source, path)
+    rows = []
+
+    def case(stage: str, name: str, result: Dict[str, Any]) -> None:
+        result.update({
+            "key": f"{source}/{size}/{stage}/{name}",
+            "source": source,
+            "size": size,
+            "stage": stage,
+            "case": name,
+        })
+        rows.append(result)
+
+    def drop():
+        SNAPSHOT_CACHE.invalidate(path)
+
+    # Loading is slow at scale: time it fewer times than queries
+    case("load", "snapshot", measure(connector.snapshot, max(1, repeat // 10), memory, drop))
+
+    records = len(connector.snapshot())
+
+    def build_indexes():
+        snapshot = connector.snapshot()
+        built = [snapshot.index(connector.hash_index_fields, connector.sorted_index_fields)]
+        if isinstance(connector, AnalyticsConnector):
+            built += [connector.columnar(), connector.rollups()]
+        return built
+
+    def fresh_snapshot():
+        drop()
+        connector.snapshot()
+
+    case("index", "all", measure(build_indexes, max(1, repeat // 10), memory, fresh_snapshot))
+    build_indexes()
+
+    for name, query in queries(source, offsets, records):
+        connector.cacheable = False
+        result, stages = measure_stages(connector, lambda: connector.execute(query), repeat, memory)
+        case("execute", name, result)
+        for stage, stage_result in stages.items():
+            case("pipeline", f"{name}/{stage}", stage_result)
+
+        connector.cacheable = True
+        RESULT_CACHE.clear()
+        connector.execute(query)
+        case("cached", name, measure(lambda: connector.execute(query), repeat, memory))
+
+    for row in rows:
+        row["records"] = records
+
+    drop()
+    RESULT_CACHE.clear()
+    gc.collect()
+
+    return rows
+
+
+def run(
+    sizes: List[int],
+    sources: List[str],
+    offsets: List[int],
+    repeat: int,
+    memory: bool,
+    data_dir: Path,
+    workers: int = 1
+) -> Dict[str, Any]:
+    cases = []
+
+    for size in sizes:
+        paths = dataset_paths(size, data_dir, workers)
+        for source in sources:
+            print(f"benchmarking {source} at {size:,} rows", file=sys.stderr)
+            cases += bench_source(source, size, paths[SOURCES[source][1]], offsets, repeat, memory)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": SEED,
+            "repeat": repeat,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "cases": cases,
+    }
+
+
+# -------------------------
+# Baseline Comparison
+# -------------------------
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """
+    Cases slower (median time) or hungrier (peak memory) than the
+    baseline by more than `threshold`, ignoring deltas within noise.
+    """
+    previous = {case["key"]: case for case in baseline.get("cases", [])}
+    regressions = []
+
+    for case in current.get("cases", []):
+        before = previous.get(case["key"])
+        if before is None:
+            continue
+
+        checks = [("median_ms", MIN_TIME_DELTA_MS)]
+        if "peak_bytes" in case and "peak_bytes" in before:
+            checks.append(("peak_bytes", MIN_MEMORY_DELTA_BYTES))
+
+        for metric, noise in checks:
+            old, new = before[metric], case[metric]
+            if new - old <= noise:
+                continue
+            if old > 0 and new / old <= 1 + threshold:
+                continue
+
+            regressions.append({
+                "key": case["key"],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "ratio": new / old if old > 0 else float("inf"),
+            })
+
+    return regressions
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="rows per dataset, e.g. 1k 100k 10m")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=list(SOURCES))
+    parser.add_argument("--offsets", nargs="+", type=int, default=DEFAULT_OFFSETS, help="pagination depths")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "connector-bench")
+    parser.add_argument("--workers", type=int, default=1, help="dataset generation processes")
+    parser.add_argument("--out", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=None, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Connector INFO logs would dominate sub-millisecond stages
+    logging.disable(logging.INFO)
+
+    results = run(
+        [parse_size(size) for size in args.sizes],
+        args.sources,
+        args.offsets,
+        args.repeat,
+        not args.no_memory,
+        args.data_dir,
+        args.workers
+    )
+
+    print(f"{'case':<64}{'median ms':>11}{'p95 ms':>10}{'peak':>11}{'blocks':>10}")
+    for case in results["cases"]:
+        peak = _format_bytes(case["peak_bytes"]) if "peak_bytes" in case else "-"
+        blocks = case.get("allocated_blocks", "-")
+        print(f"{case['key']:<64}{case['median_ms']:>11.3f}{case['p95_ms']:>10.3f}{peak:>11}{blocks:>10}")
+
+    if args.out is not None:
+        args.out.write_text(json.dumps(results, indent=2))
+        print(f"results written to {args.out}", file=sys.stderr)
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['key']} {regression['metric']}: "
+                f"{regression['baseline']:.3f} -> {regression['current']:.3f} "
+                f"(x{regression['ratio']:.2f})"
+            )
+
+        if regressions:
+            sys.exit(1)
+
+        print(f"no regressions against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Local stand-in for the Groq chat-completions API.
+
+Speaks the OpenAI-compatible wire format the Groq SDK uses
+(POST /openai/v1/chat/completions, JSON or SSE streaming) and returns
+scripted tool calls and answers with configurable latency and
+injected failures. Point the app at it with LLM_BASE_URL:
+
+    python -m benchmarks.fake_groq --port 8099 --latency-ms 250
+    LLM_BASE_URL=http://127.0.0.1:8099 GROQ_API_KEY=fake uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import List, Dict, Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+
+class ScriptedCall(BaseModel):
+    """
+    Tool call returned when `match` occurs in the user message.
+    """
+    match: str = ""
+    arguments: Dict[str, Any]
+
+
+class FakeGroqScript(BaseModel):
+    latency_ms: float = Field(default=200.0, description="Time to first token (whole response when not streaming)")
+    token_ms: float = Field(default=5.0, description="Delay between streamed tokens")
+    jitter: float = Field(default=0.1, description="Relative random variation of latency_ms")
+    error_rate: float = Field(default=0.0, description="Share of calls answered with HTTP 500")
+    rate_limit_rate: float = Field(default=0.0, description="Share of calls answered with HTTP 429")
+    hang_rate: float = Field(default=0.0, description="Share of calls that never answer within hang_seconds")
+    hang_seconds: float = 30.0
+    answer_tokens: int = Field(default=30, description="Words in a final answer")
+    tool_calls: List[ScriptedCall] = Field(
+        default_factory=lambda: [
+            ScriptedCall(match="ticket", arguments={"source": "support", "filters": {"priority": "critical"}}),
+            ScriptedCall(match="customer", arguments={"source": "crm", "filters": {"status": "active"}}),
+            ScriptedCall(match="", arguments={"source": "analytics", "aggregate": "avg"}),
+        ],
+        description="First matching rule wins; an empty match always matches"
+    )
+    seed: int | None = None
+
+
+class FakeGroqStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls: Dict[str, int] = {}
+            self.served_ms: Dict[str, List[float]] = {}
+            self.failures: Dict[str, int] = {}
+
+    def record(self, kind: str, served_ms: float) -> None:
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            self.served_ms.setdefault(kind, []).append(served_ms)
+
+    def fail(self, kind: str) -> None:
+        with self._lock:
+            self.failures[kind] = self.failures.get(kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "failures": dict(self.failures),
+                "mean_ms": {
+                    kind: sum(values) / len(values)
+                    for kind, values in self.served_ms.items()
+                },
+            }
+
+
+# -------------------------
+# Wire Format
+# -------------------------
+def _estimate_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value)) // 4)
+
+
+def _completion(completion_id: str, model: str, message: Dict[str, Any], finish: str, usage: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish, "logprobs": None}],
+        "usage": usage,
+    }
+
+
+def _chunk(
+    completion_id: str,
+    model: str,
+    delta: Dict[str, Any],
+    finish: str | None = None,
+    usage: Dict[str, int] | None = None
+) -> str:
+    body = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}],
+    }
+    if usage is not None:
+        # Groq reports streamed usage on the final chunk
+        body["x_groq"] = {"id": completion_id, "usage": usage}
+    return f"data: {json.dumps(body)}\n\n"
+
+
+def _user_message(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def _answer(messages: List[Dict[str, Any]], words: int) -> List[str]:
+    tool_results = [m for m in messages if m.get("role") == "tool"]
+    opening = f"Based on {len(tool_results)} result(s), here is the summary."
+    filler = ["The", "numbers", "look", "steady", "overall."]
+    tokens = opening.split() + [filler[i % len(filler)] for i in range(max(0, words - 8))]
+    return [token + " " for token in tokens[:max(words, 1)]]
+
+
+# -------------------------
+# App
+# -------------------------
+def create_app(script: FakeGroqScript | None = None) -> FastAPI:
+    script = script or FakeGroqScript()
+    rng = random.Random(script.seed)
+    stats = FakeGroqStats()
+    counter = iter(range(1, 1 << 62))
+
+    app = FastAPI(title="Fake Groq")
+    app.state.script = script
+    app.state.stats = stats
+
+    async def _wait(seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def _latency() -> float:
+        spread = script.latency_ms * script.jitter
+        return max(0.0, rng.uniform(script.latency_ms - spread, script.latency_ms + spread)) / 1000
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        started = time.perf_counter()
+        body = await request.json()
+
+        messages = body.get("messages", [])
+        model = body.get("model", "fake-model")
+        stream = bool(body.get("stream"))
+        completion_id = f"chatcmpl-fake-{next(counter)}"
+
+        wants_tool = bool(body.get("tools")) and messages and messages[-1].get("role") == "user"
+        scripted = None
+        if wants_tool:
+            text = _user_message(messages).lower()
+            scripted = next((call for call in script.tool_calls if call.match.lower() in text), None)
+
+        kind = "tool_call" if scripted else "answer"
+
+        # Failure injection
+        roll = rng.random()
+        if roll < script.hang_rate:
+            stats.fail("hang")
+            await asyncio.sleep(script.hang_seconds)
+        roll -= script.hang_rate
+        if roll < script.error_rate:
+            stats.fail("server_error")
+            return JSONResponse({"error": {"message": "Injected failure", "type": "internal_server_error"}}, status_code=500)
+        roll -= script.error_rate
+        if roll < script.rate_limit_rate:
+            stats.fail("rate_limit")
+            return JSONResponse(
+                {"error": {"message": "Injected rate limit", "type": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": "0"}
+            )
+
+        prompt_tokens = _estimate_tokens(messages)
+
+        if scripted:
+            call = {
+                "id": f"call_{completion_id}",
+                "type": "function",
+                "function": {"name": "query_data", "arguments": json.dumps(scripted.arguments)},
+            }
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": _estimate_tokens(call), "total_tokens": 0}
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+            if not stream:
+                await _wait(_latency())
+                stats.record(kind, (time.perf_counter() - started) * 1000)
+                message = {"role": "assistant", "content": None, "tool_calls": [call]}
+                return JSONResponse(_completion(completion_id, model, message, "tool_calls", usage))
+
+            async def tool_stream():
+                await _wait(_latency())
+                yield _chunk(completion_id, model, {"role": "assistant", "tool_calls": [dict(call, index=0)]})
+                yield _chunk(completion_id, model, {}, "tool_calls", usage)
+                yield "data: [DONE]\n\n"
+                stats.record(kind, (time.perf_counter() - started) * 1000)
+
+            return StreamingResponse(tool_stream(), media_type="text/event-stream")
+
+        tokens = _answer(messages, script.answer_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+
+        if not stream:
+            await _wait(_latency() + len(tokens) * script.token_ms / 1000)
+            stats.record(kind, (time.perf_counter() - started) * 1000)
+            message = {"role": "assistant", "content": "".join(tokens).strip()}
+            return JSONResponse(_completion(completion_id, model, message, "stop", usage))
+
+        async def answer_stream():
+            await _wait(_latency())
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            for token in tokens:
+                await _wait(script.token_ms / 1000)
+                yield _chunk(completion_id, model, {"content": token})
+            yield _chunk(completion_id, model, {}, "stop", usage)
+            yield "data: [DONE]\n\n"
+            stats.record(kind, (time.perf_counter() - started) * 1000)
+
+        return StreamingResponse(answer_stream(), media_type="text/event-stream")
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats.snapshot()
+
+    @app.post("/_reset")
+    async def reset_stats():
+        stats.reset()
+        return {"status": "ok"}
+
+    return app
+
+
+def serve_app_in_thread(app: FastAPI, host: str = "127.0.0.1", port: int = 0):
+    """
+    Serve an ASGI app with uvicorn on a background thread.
+    Returns (server, base_url); set `server.should_exit = True` to stop.
+    """
+    import socket
+
+    import uvicorn
+
+    if port == 0:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name=f"uvicorn-{port}", daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    return server, f"http://{host}:{port}"
+
+
+def serve_in_thread(script: FakeGroqScript, host: str = "127.0.0.1", port: int = 0):
+    return serve_app_in_thread(create_app(script), host, port)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--script", help="JSON file with a FakeGroqScript")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script) as f:
+            script = FakeGroqScript.model_validate_json(f.read())
+    else:
+        script = FakeGroqScript(
+            latency_ms=args.latency_ms,
+            token_ms=args.token_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            hang_rate=args.hang_rate,
+        )
+
+    uvicorn.run(create_app(script), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
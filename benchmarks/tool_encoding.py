@@ -0,0 +1,82 @@
+"""
+Compare tool-result encodings sent back to the LLM.
+
+For a set of representative queries this reports, per encoding, the
+encoded size, estimated prompt tokens and encoding time, and the
+prefill time saved at a given prompt-processing rate.
+
+    python -m benchmarks.tool_encoding [--budget 800] [--prefill-tps 2000]
+"""
+import argparse
+import time
+from typing import List, Dict, Any, Callable
+
+from app.connectors.registry import get_connector
+from app.llm.result_encoder import encode_compact, encode_json, estimate_tokens
+from app.models.common import DataQuery
+
+
+QUERIES = [
+    DataQuery(source="crm", limit=10),
+    DataQuery(source="crm", limit=50, voice_context=False),
+    DataQuery(source="support", filters={"priority": "critical"}, limit=10),
+    DataQuery(source="support", limit=50, voice_context=False),
+    DataQuery(source="analytics", limit=10),
+    DataQuery(source="analytics", aggregate="avg", period="day", limit=50),
+]
+
+
+def _time_us(encode: Callable[[], str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(budget: int, prefill_tps: float, repeat: int) -> List[Dict[str, Any]]:
+    rows = []
+
+    for query in QUERIES:
+        result = get_connector(query.source).execute(query)
+
+        before = encode_json(result)
+        after = encode_compact(result, token_budget=budget)
+
+        before_tokens = estimate_tokens(before)
+        after_tokens = estimate_tokens(after)
+
+        rows.append({
+            "query": f"{query.source.value} limit={query.limit}"
+                     + (f" {query.aggregate.value}/{query.period.value}" if query.aggregate else "")
+                     + ("" if query.voice_context else " raw"),
+            "json_tokens": before_tokens,
+            "compact_tokens": after_tokens,
+            "saved": 1 - after_tokens / before_tokens if before_tokens else 0.0,
+            "json_us": _time_us(lambda: encode_json(result), repeat),
+            "compact_us": _time_us(lambda: encode_compact(result, token_budget=budget), repeat),
+            "prefill_saved_ms": (before_tokens - after_tokens) / prefill_tps * 1000,
+        })
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=800, help="compact token budget")
+    parser.add_argument("--prefill-tps", type=float, default=2000.0, help="prompt tokens processed per second")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = run(args.budget, args.prefill_tps, args.repeat)
+
+    print(f"{'query':<36}{'json tok':>10}{'compact tok':>13}{'saved':>8}{'json µs':>10}{'compact µs':>12}{'prefill ms saved':>18}")
+    for row in rows:
+        print(
+            f"{row['query']:<36}{row['json_tokens']:>10}{row['compact_tokens']:>13}"
+            f"{row['saved']:>8.0%}{row['json_us']:>10.0f}{row['compact_us']:>12.0f}"
+            f"{row['prefill_saved_ms']:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import pytest
+
+from app.llm.chat_cache import CHAT_CACHE
+
+
+@pytest.fixture(autouse=True)
+def clear_chat_cache():
+    CHAT_CACHE.clear()
+    yield
+    CHAT_CACHE.clear()
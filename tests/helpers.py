@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+
+# -------------------------
+# Mock LLM Completions
+# -------------------------
+def tool_call(arguments, call_id="call_1"):
+    call = MagicMock()
+    call.id = call_id
+    call.function.name = "query_data"
+    call.function.arguments = arguments
+    return call
+
+
+def tool_round(*calls):
+    """
+    Completion asking for `calls` (see `tool_call`).
+    """
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(tool_calls=list(calls)))]
+    return response
+
+
+def answer(content):
+    """
+    Completion with a final text answer and no tool calls.
+    """
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content, tool_calls=None))]
+    return response
+
+
+def tool_turn(arguments, content):
+    """
+    One query_data call with `arguments`, then `content` as the answer.
+    """
+    return [tool_round(tool_call(arguments)), answer(content)]
@@ -0,0 +1,214 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.connectors.analytics_connector import AnalyticsConnector
+from app.connectors.timeseries import resample
+from app.models.common import DataQuery, DataType
+
+
+def _revenue_points():
+    return [
+        r for r in AnalyticsConnector().fetch()
+        if r["metric_name"] == "revenue"
+    ]
+
+
+def test_sum_matches_raw_points():
+    connector = AnalyticsConnector()
+    response = connector.execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        aggregate="sum",
+    ))
+
+    expected = round(sum(p["value"] for p in _revenue_points()), 2)
+
+    assert response.metadata.data_type == DataType.AGGREGATED
+    assert response.data[0]["value"] == expected
+    assert response.data[0]["points"] == len(_revenue_points())
+
+
+def test_timestamp_window_and_weekly_resample():
+    points = _revenue_points()
+    cutoff = sorted(p["timestamp"] for p in points)[10]
+
+    response = AnalyticsConnector().execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue", "timestamp__gte": cutoff},
+        aggregate="count",
+        period="week",
+        limit=50,
+    ))
+
+    assert sum(row["points"] for row in response.data) == len(points) - 10
+    assert all(row["period"].startswith("week of") for row in response.data)
+
+
+def test_resample_month_buckets():
+    stamps = np.array([
+        int(datetime.fromisoformat(s).timestamp() * 1_000_000)
+        for s in ["2026-01-30T00:00:00+00:00", "2026-01-31T00:00:00+00:00", "2026-02-01T00:00:00+00:00"]
+    ], dtype=np.int64)
+    values = np.array([1.0, 2.0, 5.0])
+
+    starts, sums, counts = resample(stamps, values, "month", "sum")
+
+    assert sums.tolist() == [3.0, 5.0]
+    assert counts.tolist() == [2, 1]
+
+
+def test_time_window_matches_timestamp_filters():
+    connector = AnalyticsConnector()
+    stamps = sorted(p["timestamp"] for p in _revenue_points())
+    start, end = stamps[5], stamps[12]
+
+    windowed = connector.execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        start_date=start,
+        end_date=end,
+        limit=50,
+        voice_context=False,
+        count_total=True,
+    ))
+    filtered = connector.execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue", "timestamp__between": f"{start},{end}"},
+        limit=50,
+        voice_context=False,
+        count_total=True,
+    ))
+
+    assert windowed.data == filtered.data
+    assert len(windowed.data) == 8
+
+
+def test_time_window_on_aggregate():
+    stamps = sorted(p["timestamp"] for p in _revenue_points())
+
+    response = AnalyticsConnector().execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        start_date=stamps[-7],
+        aggregate="sum",
+    ))
+
+    expected = sum(p["value"] for p in _revenue_points() if p["timestamp"] >= stamps[-7])
+    assert response.data[0]["value"] == round(expected, 2)
+    assert response.data[0]["points"] == 7
+
+
+def _aggregate(connector, **kwargs):
+    return connector.execute(DataQuery(source="analytics", limit=50, **kwargs))
+
+
+def test_rollups_match_vectorized_scan():
+    connector = AnalyticsConnector()
+    stamps = sorted(p["timestamp"] for p in _revenue_points())
+
+    for function in ["sum", "avg", "min", "max", "count"]:
+        for period in [None, "day", "week", "month"]:
+            window = dict(start_date=stamps[3], end_date=stamps[-2])
+            routed = _aggregate(
+                connector,
+                filters={"metric_name": "revenue"},
+                aggregate=function,
+                period=period,
+                **window
+            )
+            # A value clause disables rollup routing
+            scanned = _aggregate(
+                connector,
+                filters={"metric_name": "revenue", "value__gte": -1e18},
+                aggregate=function,
+                period=period,
+                **window
+            )
+
+            assert scanned.metadata.rollup is None
+            assert [r["period"] for r in routed.data] == [r["period"] for r in scanned.data]
+            for a, b in zip(routed.data, scanned.data):
+                assert abs(a["value"] - b["value"]) < 0.02
+                assert a["points"] == b["points"]
+
+
+def test_coarsest_rollup_is_reported():
+    response = _aggregate(
+        AnalyticsConnector(),
+        filters={"metric_name": "revenue"},
+        aggregate="sum",
+    )
+
+    assert response.metadata.rollup == "month"
+
+
+def test_ingest_updates_rollups_incrementally(tmp_path):
+    class TempAnalytics(AnalyticsConnector):
+        data_path = tmp_path / "analytics.json"
+
+    TempAnalytics.data_path.write_text(
+        '[{"metric_name": "revenue", "timestamp": "2026-01-05T10:00:00+00:00", "value": 10.0}]'
+    )
+    connector = TempAnalytics()
+    before = connector.rollups()
+    version = connector.snapshot_version()
+
+    new_version = connector.ingest([
+        {"metric_name": "revenue", "timestamp": "2026-01-06T10:00:00+00:00", "value": 5.0},
+        {"metric_name": "revenue", "timestamp": "2026-02-01T00:00:00+00:00", "value": 1.0},
+    ])
+
+    assert new_version != version
+    assert before.tables[("revenue", "month")].totals == [10.0]
+    assert connector.rollups().tables[("revenue", "month")].totals == [15.0, 1.0]
+
+    response = _aggregate(connector, filters={"metric_name": "revenue"}, aggregate="sum", period="month")
+    assert [r["value"] for r in response.data] == [15.0, 1.0]
+
+
+def test_scope_ignores_positions_of_a_newer_snapshot(tmp_path):
+    class TempAnalytics(AnalyticsConnector):
+        data_path = tmp_path / "analytics.json"
+
+    TempAnalytics.data_path.write_text(
+        '[{"metric_name": "revenue", "timestamp": "2026-01-05T10:00:00+00:00", "value": 10.0},'
+        ' {"metric_name": "revenue", "timestamp": "2026-01-07T10:00:00+00:00", "value": 20.0}]'
+    )
+    connector = TempAnalytics()
+    connector.warmup()
+    records = connector.records()
+
+    # The new point lands in the window at a position `records` lacks
+    connector.ingest([
+        {"metric_name": "revenue", "timestamp": "2026-01-08T00:00:00+00:00", "value": 1.0},
+    ])
+
+    scoped = list(connector.scope(records, DataQuery(source="analytics", start_date="2026-01-06")))
+
+    assert [r["value"] for r in scoped] == [20.0]
+
+
+def test_resampled_context_names_the_latest_bucket_across_pages():
+    response = AnalyticsConnector().execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        aggregate="sum",
+        period="day",
+        limit=5,
+    ))
+    latest = max(p["timestamp"] for p in _revenue_points())[:10]
+
+    assert response.metadata.total_results > 5
+    assert f"The most recent, {latest}," in response.context
+
+
+def test_percentile_context_names_the_percentile():
+    response = AnalyticsConnector().execute(DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        aggregate="percentile",
+        percentile=95,
+    ))
+
+    assert response.context.startswith("The 95th percentile of revenue")
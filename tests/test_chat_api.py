@@ -5,7 +5,7 @@ from unittest.mock import patch
 client = TestClient(app)
 
 
-@patch("app.llm.handler.LLMHandler.process_user_message")
+@patch("app.llm.handler.LLMHandler.aprocess_user_message")
 def test_chat_endpoint(mock_llm):
     mock_llm.return_value = "Mocked response"
 
@@ -15,4 +15,29 @@ def test_chat_endpoint(mock_llm):
     )
 
     assert response.status_code == 200
-    assert response.json()["response"] == "Mocked response"
\ No newline at end of file
+    assert response.json()["response"] == "Mocked response"
+
+def test_chat_stream_relays_events():
+    import json
+
+    async def events(message):
+        yield {"event": "context", "tool_call_id": "c1", "context": "Two critical tickets."}
+        yield {"event": "token", "text": "There are "}
+        yield {"event": "token", "text": "two."}
+        yield {"event": "done"}
+
+    with patch("app.llm.handler.LLMHandler.astream_user_message", side_effect=events):
+        sse = client.post("/chat/stream", json={"message": "Critical tickets?"})
+        ndjson = client.post("/chat/stream?format=ndjson", json={"message": "Critical tickets?"})
+
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith('event: context\ndata: {"tool_call_id": "c1"')
+
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [e["event"] for e in lines] == ["context", "token", "token", "done"]
+    assert "".join(e["text"] for e in lines if e["event"] == "token") == "There are two."
+
+
+def test_chat_stream_rejects_unknown_format():
+    response = client.post("/chat/stream?format=xml", json={"message": "hi"})
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from app.connectors.registry import get_connector
+from app.llm.chat_cache import CHAT_CACHE, LRUCache, normalize_message
+from app.llm.handler import LLMHandler
+
+from tests.helpers import answer, tool_turn
+
+
+def _responses():
+    return tool_turn('{"source": "support", "filters": {"priority": "critical"}}', "Two critical tickets")
+
+
+def test_normalize_message_ignores_case_punctuation_and_spacing():
+    assert normalize_message("  How many CRITICAL tickets?? ") == normalize_message("how many critical tickets")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1, ttl=60)
+    cache.put("b", 2, ttl=60)
+    cache.get("a")
+    cache.put("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+@patch("app.llm.handler.client")
+def test_repeated_question_is_answered_from_cache(mock_client):
+    first, final = _responses()
+    mock_client.chat.completions.create.side_effect = [first, final]
+
+    assert LLMHandler.process_user_message("How many critical tickets?") == "Two critical tickets"
+    assert LLMHandler.process_user_message("how many critical tickets") == "Two critical tickets"
+
+    assert mock_client.chat.completions.create.call_count == 2
+    assert CHAT_CACHE.stats()["answers"]["hits"] == 1
+
+
+@patch("app.llm.handler.client")
+def test_changed_snapshot_reuses_plan_but_not_answer(mock_client, monkeypatch):
+    first, final = _responses()
+    mock_client.chat.completions.create.side_effect = [first, final, answer("Now three")]
+
+    LLMHandler.process_user_message("How many critical tickets?")
+
+    support = get_connector("support")
+    monkeypatch.setattr(support, "cache_version", lambda: "changed")
+
+    assert LLMHandler.process_user_message("How many critical tickets?") == "Now three"
+
+    # Only the phrasing call was repeated: the tool plan came from cache
+    assert mock_client.chat.completions.create.call_count == 3
+    assert "tools" in mock_client.chat.completions.create.call_args.kwargs
+    assert CHAT_CACHE.stats()["answers"]["invalidations"] == 1
+    assert CHAT_CACHE.stats()["plans"]["hits"] == 1
@@ -0,0 +1,59 @@
+from benchmarks.connectors import compare, parse_size, run
+
+
+def test_parse_size():
+    assert parse_size("1k") == 1_000
+    assert parse_size("10M") == 10_000_000
+    assert parse_size("2500") == 2_500
+
+
+def test_run_covers_every_stage(tmp_path):
+    results = run([200], ["crm", "analytics"], [0], repeat=1, memory=True, data_dir=tmp_path)
+
+    stages = {(case["source"], case["stage"]) for case in results["cases"]}
+    for source in ("crm", "analytics"):
+        for stage in ("load", "index", "execute", "cached"):
+            assert (source, stage) in stages
+
+    execute = [case for case in results["cases"] if case["stage"] == "execute"]
+    assert {case["case"].split("/")[0] for case in execute if case["source"] == "crm"} == {
+        "none", "equality", "range", "window"
+    }
+    assert all(case["peak_bytes"] >= 0 and case["median_ms"] > 0 for case in execute)
+    assert results["cases"][0]["records"] == 200
+
+
+def test_run_breaks_execute_down_by_pipeline_stage(tmp_path):
+    results = run([200], ["crm", "analytics"], [0], repeat=2, memory=True, data_dir=tmp_path)
+
+    pipeline = {
+        (case["source"], case["case"]): case
+        for case in results["cases"]
+        if case["stage"] == "pipeline"
+    }
+
+    for stage in ("fetch", "select", "materialize", "voice", "metadata"):
+        case = pipeline[("crm", f"equality/offset=0/voice=on/{stage}")]
+        assert case["runs"] == 2
+        assert case["median_ms"] >= 0
+        assert {"peak_bytes", "retained_bytes", "allocated_blocks"} <= set(case)
+
+    assert ("analytics", "aggregate/offset=0/voice=on/aggregate") in pipeline
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"cases": [
+        {"key": "crm/1000/execute/a", "median_ms": 10.0, "peak_bytes": 1_000_000},
+        {"key": "crm/1000/execute/b", "median_ms": 0.01, "peak_bytes": 1_000},
+    ]}
+    current = {"cases": [
+        {"key": "crm/1000/execute/a", "median_ms": 15.0, "peak_bytes": 1_100_000},
+        # Tripled, but within timing and memory noise
+        {"key": "crm/1000/execute/b", "median_ms": 0.03, "peak_bytes": 3_000},
+        {"key": "crm/1000/execute/new", "median_ms": 99.0},
+    ]}
+
+    regressions = compare(current, baseline, threshold=0.2)
+
+    assert [(r["key"], r["metric"]) for r in regressions] == [("crm/1000/execute/a", "median_ms")]
+    assert regressions[0]["ratio"] == 1.5
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.connectors.registry import get_connector
+from app.llm.handler import LLMHandler
+from app.models.common import DataQuery
+from app.utils.deadline import DeadlineExceeded, deadline, degraded_stages, remaining
+from app.utils.executor import run_blocking
+
+from tests.helpers import tool_call, tool_round
+
+
+def test_nested_deadline_never_extends_outer():
+    assert remaining() is None
+
+    with deadline(1.0):
+        with deadline(60.0):
+            assert remaining() <= 1.0
+        with deadline(0.1):
+            assert remaining() <= 0.1
+
+    assert remaining() is None
+
+
+def test_deadline_reaches_blocking_executor():
+    async def probe():
+        with deadline(5.0):
+            return await run_blocking(remaining)
+
+    assert 0 < asyncio.run(probe()) <= 5.0
+
+
+def test_connector_returns_fewer_rows_when_budget_is_low():
+    query = DataQuery(source="crm", limit=20, voice_context=False)
+
+    with deadline(1.5):
+        response = get_connector("crm").execute(query)
+        stages = degraded_stages()
+
+    assert len(response.data) == 5
+    assert response.metadata.degraded == ["connector_rows"]
+    assert stages == ["connector_rows"]
+
+    # The narrowed response was not cached under the full query
+    assert len(get_connector("crm").execute(query).data) == 20
+
+
+def test_connector_returns_summary_only_when_budget_is_nearly_spent():
+    with deadline(0.5):
+        response = get_connector("support").execute(DataQuery(source="support", limit=20))
+
+    assert response.data == []
+    assert response.context
+    assert response.metadata.degraded == ["connector_rows", "connector_summary_only"]
+
+
+def test_connector_fails_fast_after_deadline():
+    with deadline(0.001):
+        time.sleep(0.002)
+        with pytest.raises(DeadlineExceeded):
+            get_connector("crm").execute(DataQuery(source="crm", filters={"status": "active"}))
+
+
+@patch("app.llm.handler.client")
+def test_second_llm_call_is_skipped_when_budget_is_low(mock_client):
+    mock_client.chat.completions.create.return_value = tool_round(
+        tool_call('{"source": "support", "filters": {"priority": "critical"}}')
+    )
+
+    with deadline(0.3):
+        answer = LLMHandler.process_user_message("Critical tickets?")
+        stages = degraded_stages()
+
+    assert answer.startswith("There are")
+    assert mock_client.chat.completions.create.call_count == 1
+    assert "timeout" in mock_client.chat.completions.create.call_args.kwargs
+    assert "llm_answer" in stages
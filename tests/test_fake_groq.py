@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from groq import AsyncGroq, Groq, InternalServerError
+
+from app.llm.handler import LLMHandler
+from benchmarks.fake_groq import FakeGroqScript, create_app
+
+
+def _clients(script):
+    app = create_app(script)
+    sync_client = Groq(api_key="fake", base_url="http://testserver", max_retries=0, http_client=TestClient(app))
+    async_client = AsyncGroq(
+        api_key="fake",
+        base_url="http://testserver",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+    )
+    return app, sync_client, async_client
+
+
+def test_chat_loop_runs_against_fake_server():
+    app, sync_client, _ = _clients(FakeGroqScript(latency_ms=0, token_ms=0, answer_tokens=8))
+
+    with patch("app.llm.handler.client", sync_client):
+        answer = LLMHandler.process_user_message("Any critical tickets?")
+
+    assert answer.startswith("Based on 1 result(s)")
+    assert app.state.stats.snapshot()["calls"] == {"tool_call": 1, "answer": 1}
+
+
+def test_streaming_against_fake_server():
+    _, _, async_client = _clients(FakeGroqScript(latency_ms=0, token_ms=0, answer_tokens=8))
+
+    async def collect():
+        return [event async for event in LLMHandler.astream_user_message("Show active customers")]
+
+    with patch("app.llm.handler.async_client", async_client):
+        events = asyncio.run(collect())
+
+    kinds = [event["event"] for event in events]
+    assert kinds[0] == "context"
+    assert kinds.count("token") == 8
+    assert kinds[-1] == "done"
+
+
+def test_fake_server_injects_failures():
+    _, sync_client, _ = _clients(FakeGroqScript(latency_ms=0, error_rate=1.0))
+
+    with patch("app.llm.handler.client", sync_client), pytest.raises(InternalServerError):
+        LLMHandler.process_user_message("Any critical tickets?")
+
+
+def test_latency_benchmark_counts_in_stream_errors():
+    from app.main import app
+    from benchmarks.chat_latency import drive
+
+    _, _, async_client = _clients(FakeGroqScript(latency_ms=0, error_rate=1.0))
+
+    async def measure():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await drive(client, "stream", ["Any critical tickets?"], total=2, concurrency=1)
+
+    with patch("app.llm.handler.async_client", async_client):
+        report = asyncio.run(measure())
+
+    assert report["requests"] == 2
+    assert report["errors"] == 2
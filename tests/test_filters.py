@@ -0,0 +1,95 @@
+import pytest
+
+from app.connectors.support_connector import SupportConnector
+from app.connectors.crm_connector import CRMConnector
+from app.models.common import DataQuery
+from app.services.filter_compiler import compile_filters, FilterError
+
+
+RECORDS = [
+    {"id": "a", "status": "open", "priority": "high", "value": 10, "created_at": "2026-01-01T00:00:00+00:00"},
+    {"id": "b", "status": "closed", "priority": "low", "value": "25.5", "created_at": "2026-01-05T12:00:00+00:00"},
+    {"id": "c", "status": "open", "priority": "critical", "value": None, "created_at": "2026-02-01T00:00:00+00:00"},
+]
+
+
+def _ids(filters):
+    predicate = compile_filters(filters)
+    return [r["id"] for r in RECORDS if predicate(r)]
+
+
+def test_equality_and_numeric_ranges():
+    assert _ids({"status": "open"}) == ["a", "c"]
+    assert _ids({"value__gt": "12"}) == ["b"]
+    assert _ids({"value__lte": 10}) == ["a"]
+    assert _ids({"value__gt": "not-a-number"}) == []
+
+
+def test_new_operators():
+    assert _ids({"status__ne": "open"}) == ["b"]
+    assert _ids({"priority__in": "high,critical"}) == ["a", "c"]
+    assert _ids({"priority__in": ["low"]}) == ["b"]
+    assert _ids({"priority__contains": "CRIT"}) == ["c"]
+    assert _ids({"value__between": "5,20"}) == ["a"]
+
+
+def test_datetime_comparisons():
+    assert _ids({"created_at__gte": "2026-01-05"}) == ["b", "c"]
+    assert _ids({"created_at__between": ["2026-01-01", "2026-01-31"]}) == ["a", "b"]
+    assert _ids({"created_at": "2026-01-01T00:00:00Z"}) == ["a"]
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(FilterError):
+        compile_filters({"value__approx": 3})
+
+
+def test_connector_filters_match_manual_scan():
+    connector = CRMConnector()
+    records = connector.fetch()
+
+    result = connector.apply_filters(records, {"lifetime_value__gt": 5000, "status": "active"})
+
+    assert result == [
+        r for r in records
+        if float(r["lifetime_value"]) > 5000 and r["status"] == "active"
+    ]
+
+
+def test_support_filters_by_priority():
+    connector = SupportConnector()
+    result = connector.apply_filters(connector.fetch(), {"priority": "critical"})
+
+    assert result
+    assert all(t["priority"] == "critical" for t in result)
+
+
+def test_indexed_filters_match_full_scan():
+    connector = SupportConnector()
+    records = connector.records()
+    dicts = connector.fetch()
+
+    for filters in [
+        {"priority": "critical"},
+        {"status__in": "open,in_progress", "priority": "high"},
+        {"created_at__gte": "2026-01-15"},
+        {"created_at__between": "2026-01-01,2026-02-01", "status": "open"},
+        {"priority": "low", "subject__contains": "1"},
+        {"customer_id": "does-not-exist"},
+    ]:
+        indexed = connector.apply_filters(records, filters)
+        assert [r.to_dict() for r in indexed] == connector.apply_filters(dicts, filters)
+
+
+def test_aggregation_options_are_rejected_outside_analytics():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+
+    assert client.get("/data/crm?aggregate=sum&limit=2").status_code == 400
+    assert client.get("/data/support?period=day").status_code == 400
+    assert client.get("/data/analytics?metric_name=revenue&aggregate=sum").status_code == 200
+
+    with pytest.raises(FilterError):
+        SupportConnector().execute(DataQuery(source="support", aggregate="count"))
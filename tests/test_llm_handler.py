@@ -1,6 +1,8 @@
 from unittest.mock import patch, MagicMock
 from app.llm.handler import LLMHandler
 
+from tests.helpers import answer, tool_call, tool_round, tool_turn
+
 
 @patch("app.llm.handler.client")
 def test_process_message_without_function(mock_client):
@@ -23,4 +25,155 @@ def test_process_message_without_function(mock_client):
 
     response = LLMHandler.process_user_message("Hello")
 
-    assert response == "Simple reply"
\ No newline at end of file
+    assert response == "Simple reply"
+
+@patch("app.llm.handler.async_client")
+def test_async_process_message_executes_tool_call(mock_client):
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    mock_client.chat.completions.create = AsyncMock(side_effect=tool_turn(
+        '{"source": "support", "filters": {"priority": "critical"}}', "Two critical tickets"
+    ))
+
+    response = asyncio.run(LLMHandler.aprocess_user_message("Any critical tickets?"))
+
+    assert response == "Two critical tickets"
+    tool_message = mock_client.chat.completions.create.call_args_list[1].kwargs["messages"][-1]
+    assert tool_message["role"] == "tool"
+    assert tool_message["tool_call_id"] == "call_1"
+
+
+@patch("app.llm.handler.async_client")
+def test_async_runs_every_tool_call_in_one_round(mock_client):
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    first = tool_round(
+        tool_call('{"source": "crm", "limit": 2}', "call_crm"),
+        tool_call('{"source": "crm", "filters": {"x__nope": 1}}', "call_bad"),
+        tool_call('{"source": "analytics", "aggregate": "sum"}', "call_analytics"),
+    )
+
+    mock_client.chat.completions.create = AsyncMock(side_effect=[first, answer("Done")])
+
+    assert asyncio.run(LLMHandler.aprocess_user_message("Overview")) == "Done"
+
+    sent = mock_client.chat.completions.create.call_args_list[1].kwargs["messages"]
+    tool_messages = [m for m in sent if isinstance(m, dict) and m["role"] == "tool"]
+
+    assert [m["tool_call_id"] for m in tool_messages] == ["call_crm", "call_bad", "call_analytics"]
+    assert "error" in tool_messages[1]["content"]
+
+
+@patch("app.llm.handler.client")
+def test_tool_rounds_are_bounded(mock_client):
+    from app.config import settings
+
+    looping = tool_round(tool_call('{"source": "crm"}', "c"))
+
+    mock_client.chat.completions.create.side_effect = (
+        [looping] * settings.LLM_MAX_TOOL_ROUNDS + [answer("Answer")]
+    )
+
+    assert LLMHandler.process_user_message("loop") == "Answer"
+    assert mock_client.chat.completions.create.call_count == settings.LLM_MAX_TOOL_ROUNDS + 1
+    assert "tools" not in mock_client.chat.completions.create.call_args.kwargs
+
+
+def _chunk(content=None, tool_calls=None):
+    delta = MagicMock(content=content, tool_calls=tool_calls)
+    return MagicMock(choices=[MagicMock(delta=delta)])
+
+
+def _stream(*chunks):
+    async def generate():
+        for chunk in chunks:
+            yield chunk
+    return generate()
+
+
+@patch("app.llm.handler.async_client")
+def test_stream_emits_context_before_tokens(mock_client):
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    # Tool call arguments arrive split across deltas
+    head = MagicMock(index=0, id="call_1")
+    head.function.name = "query_data"
+    head.function.arguments = '{"source": "support", '
+    rest = MagicMock(index=0, id=None)
+    rest.function.name = None
+    rest.function.arguments = '"filters": {"priority": "critical"}}'
+
+    mock_client.chat.completions.create = AsyncMock(side_effect=[
+        _stream(_chunk(tool_calls=[head]), _chunk(tool_calls=[rest])),
+        _stream(_chunk("Two "), _chunk("critical "), _chunk(None), _chunk("tickets.")),
+    ])
+
+    async def collect():
+        return [event async for event in LLMHandler.astream_user_message("Critical?")]
+
+    events = asyncio.run(collect())
+
+    assert events[0]["event"] == "context"
+    assert events[0]["tool_call_id"] == "call_1"
+    assert "".join(e["text"] for e in events if e["event"] == "token") == "Two critical tickets."
+    assert events[-1] == {"event": "done"}
+
+    sent = mock_client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[-2]["tool_calls"][0]["function"]["arguments"].endswith('"critical"}}')
+    assert sent[-1]["role"] == "tool"
+
+
+@patch("app.llm.handler.client")
+def test_fast_path_answers_from_connector_context(mock_client, monkeypatch):
+    from app.config import settings
+    from app.llm.fast_path import FAST_PATH
+
+    monkeypatch.setattr(settings, "FAST_PATH_ENABLED", True)
+    fired = FAST_PATH.stats()["fired"]
+
+    mock_client.chat.completions.create.return_value = tool_round(tool_call(
+        '{"source": "analytics", "aggregate": "sum", "filters": {"metric_name": "daily_active_users"}}'
+    ))
+
+    answer = LLMHandler.process_user_message("Total daily active users?")
+
+    assert answer.startswith("The sum of daily_active_users")
+    assert mock_client.chat.completions.create.call_count == 1
+    assert FAST_PATH.stats()["fired"] == fired + 1
+
+
+def test_fast_path_skips_results_truncated_by_limit(monkeypatch):
+    from app.config import settings
+    from app.connectors.analytics_connector import AnalyticsConnector
+    from app.llm.fast_path import FAST_PATH
+    from app.models.common import DataQuery
+
+    monkeypatch.setattr(settings, "FAST_PATH_ENABLED", True)
+
+    query = DataQuery(
+        source="analytics",
+        filters={"metric_name": "revenue"},
+        aggregate="sum",
+        period="day",
+        limit=5,
+    )
+    result = AnalyticsConnector().execute(query)
+
+    assert result.metadata.total_results > result.metadata.returned_results
+    assert FAST_PATH.answer(query, result) is None
+
+
+@patch("app.llm.handler.client")
+def test_fast_path_leaves_unmatched_shapes_to_the_model(mock_client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "FAST_PATH_ENABLED", True)
+
+    mock_client.chat.completions.create.side_effect = tool_turn(
+        '{"source": "support", "filters": {"priority": "critical"}}', "Phrased"
+    )
+
+    assert LLMHandler.process_user_message("Critical tickets?") == "Phrased"
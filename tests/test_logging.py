@@ -0,0 +1,94 @@
+import io
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.logging import configure_logging, request_scope, shutdown_logging
+
+
+@pytest.fixture
+def log_output():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    stream = io.StringIO()
+
+    def lines(**options):
+        configure_logging(stream=stream, **options)
+        return stream
+
+    yield lines
+
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    configure_logging()
+
+
+def _entries(stream):
+    shutdown_logging()  # drains the queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_carry_request_id_and_extra_fields(log_output):
+    stream = log_output(fmt="json")
+    logger = logging.getLogger("app.test")
+
+    with request_scope("req-1"):
+        logger.info("Fetched %d rows", 3, extra={"source": "crm"})
+    logger.warning("Outside a request")
+
+    first, second = _entries(stream)
+
+    assert first["message"] == "Fetched 3 rows"
+    assert first["request_id"] == "req-1"
+    assert first["source"] == "crm"
+    assert first["level"] == "INFO" and first["logger"] == "app.test"
+    assert "request_id" not in second
+
+
+def test_message_is_interpolated_when_logged(log_output):
+    stream = log_output(fmt="json")
+    filters = {"status": "active"}
+
+    logging.getLogger("app.test").info("Query filters: %s", filters)
+    filters["status"] = "churned"
+
+    assert _entries(stream)[0]["message"] == "Query filters: {'status': 'active'}"
+
+
+def test_sampling_drops_info_but_keeps_warnings(log_output):
+    stream = log_output(fmt="json", sampling={"app.noisy": 0.0})
+
+    logging.getLogger("app.noisy.child").info("dropped")
+    logging.getLogger("app.noisy").warning("kept")
+    logging.getLogger("app.quiet").info("kept too")
+
+    assert [entry["message"] for entry in _entries(stream)] == ["kept", "kept too"]
+
+
+def test_middleware_echoes_or_assigns_request_id():
+    client = TestClient(app)
+
+    given = client.get("/health", headers={"X-Request-ID": "abc123"})
+    assigned = client.get("/health")
+
+    assert given.headers["x-request-id"] == "abc123"
+    assert len(assigned.headers["x-request-id"]) == 32
+
+
+def test_user_messages_stay_out_of_info_logs(log_output):
+    from unittest.mock import patch
+
+    from app.llm.handler import LLMHandler
+    from tests.helpers import answer
+
+    stream = log_output(fmt="json", level="INFO")
+
+    with patch("app.llm.handler.client") as mock_client:
+        mock_client.chat.completions.create.return_value = answer("Hi")
+        LLMHandler.process_user_message("my secret account question")
+
+    assert all("secret" not in entry["message"] for entry in _entries(stream))
@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+from groq import AsyncGroq, Groq
+
+from app.config import settings
+from app.connectors.registry import get_connector
+from app.llm.handler import LLMHandler
+from app.main import app
+from app.models.common import DataQuery
+from app.utils.metrics import (
+    CONNECTOR_STAGE_SECONDS,
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_TOKENS_TOTAL,
+    MetricsRegistry,
+    NULL_CLOCK,
+    stage_clock,
+)
+from benchmarks.fake_groq import FakeGroqScript, create_app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo", ("stage",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "fetch")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE demo_seconds histogram" in lines
+    assert 'demo_seconds_bucket{stage="fetch",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="fetch",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{stage="fetch",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{stage="fetch"} 4' in lines
+
+
+def test_collector_flattens_nested_stats():
+    registry = MetricsRegistry()
+    registry.collector("chat_cache", lambda: {"plans": {"hits": 3, "hit_rate": 0.5}, "answers": {"hits": 1}})
+    registry.collector("fast_path", lambda: {"fired": 2, "enabled": True, "fired_by_source": {"crm": 2}})
+
+    lines = registry.render().splitlines()
+
+    assert 'chat_cache_hits{tier="plans"} 3' in lines
+    assert 'chat_cache_hits{tier="answers"} 1' in lines
+    assert 'chat_cache_hit_rate{tier="plans"} 0.5' in lines
+    assert "fast_path_fired 2" in lines
+    assert "fast_path_enabled 1" in lines
+    assert 'fast_path_fired_by_source{key="crm"} 2' in lines
+
+
+def test_stage_clock_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    monkeypatch.setattr(settings, "DEBUG_TIMINGS", False)
+
+    assert stage_clock(CONNECTOR_STAGE_SECONDS, "crm") is NULL_CLOCK
+
+
+def test_debug_timings_attach_connector_stages(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG_TIMINGS", True)
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+    before = CONNECTOR_STAGE_SECONDS.count("support", "select")
+
+    response = get_connector("support").execute(DataQuery(source="support", count_total=True))
+
+    assert set(response.metadata.timings) == {"fetch", "select", "materialize", "count", "voice", "metadata"}
+    assert all(ms >= 0 for ms in response.metadata.timings.values())
+    assert CONNECTOR_STAGE_SECONDS.count("support", "select") == before + 1
+
+
+def test_timings_are_omitted_by_default():
+    response = get_connector("analytics").execute(DataQuery(source="analytics", aggregate="avg"))
+    assert response.metadata.timings is None
+
+
+def test_metrics_endpoint_exposes_llm_and_cache_metrics():
+    fake = create_app(FakeGroqScript(latency_ms=0, token_ms=0, answer_tokens=8))
+    sync_client = Groq(api_key="fake", base_url="http://testserver", max_retries=0, http_client=TestClient(fake))
+    async_client = AsyncGroq(
+        api_key="fake",
+        base_url="http://testserver",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://testserver")
+    )
+    prompt_tokens = LLM_TOKENS_TOTAL.value("prompt")
+    first_tokens = LLM_FIRST_TOKEN_SECONDS.count("true")
+
+    async def stream():
+        return [event async for event in LLMHandler.astream_user_message("Show active customers")]
+
+    with patch("app.llm.handler.client", sync_client), patch("app.llm.handler.async_client", async_client):
+        LLMHandler.process_user_message("Any critical tickets?")
+        asyncio.run(stream())
+
+    # Both streamed rounds offer tools: the tool call and the answer
+    assert LLM_TOKENS_TOTAL.value("prompt") > prompt_tokens
+    assert LLM_FIRST_TOKEN_SECONDS.count("true") == first_tokens + 2
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'llm_request_seconds_count{mode="sync",tools="true"}' in body
+    assert 'llm_request_seconds_count{mode="stream",tools="true"}' in body
+    assert 'chat_turn_seconds_count{mode="stream"}' in body
+    assert 'connector_stage_seconds_count{source="support",stage="serialize"}' in body
+    assert "result_cache_hit_rate " in body
+    assert 'chat_cache_entries{tier="answers"}' in body
+    assert "prefetch_speculations " in body
+    assert "fast_path_considered " in body
@@ -0,0 +1,38 @@
+import json
+from datetime import datetime, UTC
+
+from app.connectors.snapshot import SnapshotCache
+from app.utils.mock_data import analytics_rows, default_options, write_mock_data
+
+
+def _options(**overrides):
+    return default_options(seed=11, as_of=datetime(2026, 1, 1, tzinfo=UTC), **overrides)
+
+
+def test_same_seed_writes_identical_files(tmp_path):
+    first = write_mock_data(30, 60, _options(customers=30), tmp_path / "a")
+    second = write_mock_data(30, 60, _options(customers=30), tmp_path / "b")
+
+    for a, b in zip(first, second):
+        assert a.read_bytes() == b.read_bytes()
+
+
+def test_tickets_reference_generated_customers(tmp_path):
+    customers, tickets, _ = write_mock_data(40, 200, _options(customers=40), tmp_path)
+
+    customer_ids = {c["id"] for c in json.loads(customers.read_text())}
+    ticket_rows = json.loads(tickets.read_text())
+
+    assert len(ticket_rows) == 200
+    assert {t["customer_id"] for t in ticket_rows} <= customer_ids
+
+
+def test_per_minute_analytics_load_as_ndjson_snapshot(tmp_path):
+    options = _options(days=1, granularity="minute", metrics=["revenue"])
+    _, _, analytics = write_mock_data(5, 5, options, tmp_path, fmt="ndjson")
+
+    snapshot = SnapshotCache().get(analytics)
+
+    assert analytics_rows(options) == 1440
+    assert len(snapshot) == 1440
+    assert snapshot.records[0].get("timestamp") - snapshot.records[1].get("timestamp") == 60_000_000
@@ -0,0 +1,97 @@
+from app.connectors.base import BaseConnector
+from app.connectors.crm_connector import CRMConnector
+from app.connectors.support_connector import SupportConnector
+from app.models.common import DataQuery
+from app.services.business_rules import BusinessRulesEngine
+
+
+def test_take_page_stops_pulling_after_window():
+    pulled = []
+
+    def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield {"id": i}
+
+    page, total = BaseConnector.take_page(source(), limit=5, offset=10)
+
+    assert [r["id"] for r in page] == list(range(10, 15))
+    assert total is None
+    assert len(pulled) == 15
+
+
+def test_take_page_counts_total_when_requested():
+    records = ({"id": i} for i in range(42))
+
+    page, total = BaseConnector.take_page(records, limit=5, offset=40, count_total=True)
+
+    assert [r["id"] for r in page] == [40, 41]
+    assert total == 42
+
+
+def test_streaming_execute_matches_list_pipeline():
+    connector = SupportConnector()
+    query = DataQuery(
+        source="support",
+        filters={"priority": "high"},
+        limit=3,
+        offset=1,
+        voice_context=False,
+        count_total=True,
+    )
+
+    expected = BusinessRulesEngine.apply(
+        "support",
+        connector.apply_filters(connector.fetch(), query.filters)
+    )
+
+    response = connector.execute(query)
+
+    assert response.data == expected[1:4]
+    assert response.metadata.total_results == len(expected)
+
+
+def test_execute_reports_raw_total_by_default():
+    connector = CRMConnector()
+    response = connector.execute(DataQuery(source="crm", voice_context=False))
+
+    assert response.metadata.total_results == len(connector.fetch())
+
+
+def test_top_k_matches_full_sort_including_ties():
+    records = [
+        {"id": i, "status": "open", "priority": p}
+        for i, p in enumerate(["low", "high", "critical", "high", "medium", "high", "critical"])
+    ]
+
+    full = BusinessRulesEngine.apply("support", records)
+
+    for k in range(1, len(records) + 1):
+        assert BusinessRulesEngine.apply("support", records, top_k=k) == full[:k]
+
+
+def test_created_at_window_for_tabular_sources():
+    connector = SupportConnector()
+    response = connector.execute(DataQuery(
+        source="support",
+        start_date="2026-01-15T00:00:00+00:00",
+        limit=50,
+        voice_context=False,
+        count_total=True,
+    ))
+
+    expected = BusinessRulesEngine.apply(
+        "support",
+        connector.apply_filters(connector.fetch(), {"created_at__gte": "2026-01-15"})
+    )
+
+    assert response.metadata.total_results == len(expected)
+
+
+def test_aexecute_matches_execute():
+    import asyncio
+
+    connector = SupportConnector()
+    query = DataQuery(source="support", filters={"status": "open"}, limit=4)
+
+    assert asyncio.run(connector.aexecute(query)) == connector.execute(query)
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.config import settings
+from app.llm.handler import LLMHandler
+from app.llm.prefetch import PREFETCHER, predict_query
+
+from tests.helpers import tool_turn
+
+
+def test_predict_query_uses_source_keywords_and_known_values():
+    query = predict_query("How many critical tickets are open?")
+
+    assert query.source.value == "support"
+    assert query.filters == {"priority": "critical", "status": "open"}
+
+    metric = predict_query("What is the average daily active users")
+    assert metric.source.value == "analytics"
+    assert metric.filters == {"metric_name": "daily_active_users"}
+
+    assert predict_query("hello there") is None
+
+
+def _turn(arguments):
+    return tool_turn(arguments, "Answer")
+
+
+@patch("app.llm.handler.get_connector")
+@patch("app.llm.handler.client")
+def test_matching_tool_call_reuses_prefetched_result(mock_client, mock_get_connector, monkeypatch):
+    monkeypatch.setattr(settings, "SPECULATIVE_PREFETCH", True)
+    before = PREFETCHER.stats()
+
+    mock_client.chat.completions.create.side_effect = _turn(
+        '{"source": "support", "filters": {"status": "open", "priority": "critical"}}'
+    )
+
+    assert LLMHandler.process_user_message("How many critical tickets are open?") == "Answer"
+
+    # The handler never had to run the connector itself
+    mock_get_connector.assert_not_called()
+
+    after = PREFETCHER.stats()
+    assert after["hits"] == before["hits"] + 1
+    assert after["saved_ms"] > before["saved_ms"]
+
+
+@patch("app.llm.handler.client")
+def test_mismatched_tool_call_discards_prefetch(mock_client, monkeypatch):
+    monkeypatch.setattr(settings, "SPECULATIVE_PREFETCH", True)
+    before = PREFETCHER.stats()
+
+    mock_client.chat.completions.create.side_effect = _turn(
+        '{"source": "support", "filters": {"priority": "high"}}'
+    )
+
+    assert LLMHandler.process_user_message("Any critical tickets open?") == "Answer"
+    assert PREFETCHER.stats()["misses"] == before["misses"] + 1
+
+
+@patch("app.llm.handler.get_connector")
+@patch("app.llm.handler.client")
+def test_tool_call_spelling_out_schema_defaults_reuses_prefetch(mock_client, mock_get_connector, monkeypatch):
+    from app.connectors.registry import get_connector
+    from app.models.common import DataQuery
+
+    monkeypatch.setattr(settings, "SPECULATIVE_PREFETCH", True)
+    before = PREFETCHER.stats()
+
+    # limit 5 / voice_context false are what QUERY_DATA_FUNCTION advertises
+    mock_client.chat.completions.create.side_effect = _turn(
+        '{"source": "support", "filters": {"status": "open", "priority": "critical"},'
+        ' "limit": 5, "offset": 0, "voice_context": false}'
+    )
+
+    assert LLMHandler.process_user_message("How many critical tickets are open?") == "Answer"
+
+    mock_get_connector.assert_not_called()
+    assert PREFETCHER.stats()["hits"] == before["hits"] + 1
+
+    tool_message = mock_client.chat.completions.create.call_args.kwargs["messages"][-1]
+    expected = get_connector("support").execute(DataQuery(
+        source="support",
+        filters={"status": "open", "priority": "critical"},
+        limit=5,
+        voice_context=False,
+    ))
+    assert tool_message["content"] == LLMHandler._tool_message(
+        SimpleNamespace(id=tool_message["tool_call_id"]), "support", expected
+    )["content"]
@@ -0,0 +1,29 @@
+from app.connectors.crm_connector import CRMConnector
+from app.connectors.records import Record, build_records
+
+
+def test_typed_rows_round_trip_to_original_json():
+    raw = CRMConnector().snapshot().to_dicts()
+    rows = build_records(raw)
+
+    assert all(isinstance(row, Record) for row in rows)
+    assert [row.to_dict() for row in rows] == raw
+
+
+def test_datetimes_stored_as_epoch_and_categories_shared():
+    rows = build_records([
+        {"id": "1", "status": "active", "created_at": "2026-01-01T00:00:00+00:00"},
+        {"id": "2", "status": "active", "created_at": "2026-01-02T00:00:00+00:00"},
+    ])
+
+    assert rows[0].get("created_at") == 1767225600 * 1_000_000
+    assert rows[0].get("status") is rows[1].get("status")
+    assert rows[1].get("missing", "default") == "default"
+
+
+def test_unrepresentable_datasets_stay_as_dicts():
+    raw = [{"not-an-identifier": 1}]
+    assert build_records(raw) is raw
+
+    odd_dates = [{"created_at": "2026-01-01T00:00:00Z"}]
+    assert build_records(odd_dates)[0].to_dict() == odd_dates[0]
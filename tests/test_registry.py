@@ -0,0 +1,84 @@
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from app.config import settings
+from app.connectors import registry
+from app.connectors.crm_connector import CRMConnector
+from app.connectors.registry import REGISTRY, ConnectorRegistry, get_connector
+
+
+class TrackedConnector(CRMConnector):
+    started = 0
+    stopped = 0
+    closed = []
+
+    def startup(self) -> None:
+        TrackedConnector.started += 1
+        self.pool = self.resource("test_pool", lambda: {"connections": 4}, TrackedConnector.closed.append)
+
+    def shutdown(self) -> None:
+        TrackedConnector.stopped += 1
+
+
+class NotAConnector:
+    pass
+
+
+@pytest.fixture
+def tracked():
+    TrackedConnector.started = TrackedConnector.stopped = 0
+    TrackedConnector.closed = []
+    REGISTRY.register("crm", f"{__name__}:TrackedConnector")
+    yield
+    REGISTRY.shutdown()
+    REGISTRY._paths = None
+
+
+def test_registered_connector_is_started_once_and_shared(tracked):
+    first = get_connector("crm")
+    second = REGISTRY.get("crm")
+
+    assert isinstance(first, TrackedConnector) and first is second
+    assert TrackedConnector.started == 1
+    assert first.pool is CRMConnector.resource("test_pool", dict)
+
+
+def test_shutdown_stops_connectors_and_closes_resources(tracked):
+    get_connector("crm")
+
+    REGISTRY.shutdown()
+
+    assert TrackedConnector.stopped == 1
+    assert TrackedConnector.closed == [{"connections": 4}]
+
+    # Used again after shutdown: a fresh, started instance
+    get_connector("crm")
+    assert TrackedConnector.started == 2
+
+
+def test_discovery_merges_entry_points_and_settings(monkeypatch):
+    plugin = EntryPoint(
+        name="tickets",
+        value="app.connectors.support_connector:SupportConnector",
+        group=registry.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(registry, "entry_points", lambda group: [plugin])
+    monkeypatch.setattr(settings, "CONNECTOR_PLUGINS", {"crm": f"{__name__}:TrackedConnector"})
+
+    paths = ConnectorRegistry().paths()
+
+    assert paths["tickets"] == plugin.value
+    assert paths["crm"] == f"{__name__}:TrackedConnector"
+    assert paths["analytics"] == registry.BUILTIN_CONNECTORS["analytics"]
+
+
+def test_unknown_or_invalid_connectors_are_rejected():
+    local = ConnectorRegistry()
+
+    with pytest.raises(ValueError):
+        local.get("erp")
+
+    local.register("erp", f"{__name__}:NotAConnector")
+    with pytest.raises(TypeError):
+        local.get("erp")
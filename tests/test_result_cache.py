@@ -0,0 +1,72 @@
+from app.connectors.crm_connector import CRMConnector
+from app.models.common import DataQuery, DataResponse, Metadata
+from app.services.result_cache import (
+    RESULT_CACHE,
+    ResultCache,
+    query_key,
+    ttl_for_freshness,
+)
+
+
+def _response(n):
+    return DataResponse(
+        data=[{"id": i} for i in range(n)],
+        metadata=Metadata(total_results=n, returned_results=n, data_type="tabular", freshness="real-time"),
+    )
+
+
+def test_query_key_ignores_filter_order():
+    a = DataQuery(source="crm", filters={"status": "active", "company": "Globex"})
+    b = DataQuery(source="crm", filters={"company": "Globex", "status": "active"})
+
+    assert query_key(a) == query_key(b)
+
+
+def test_ttl_follows_freshness():
+    assert ttl_for_freshness("cached_5m") == 300
+    assert ttl_for_freshness("cached_30s") == 30
+
+
+def test_lru_evicts_by_size():
+    one = len(_response(5).model_dump_json())
+    cache = ResultCache(max_bytes=one * 2)
+
+    cache.put(("c", "v", "a"), _response(5), ttl=60)
+    cache.put(("c", "v", "b"), _response(5), ttl=60)
+    assert cache.get(("c", "v", "a")) is not None  # refresh "a"
+
+    cache.put(("c", "v", "c"), _response(5), ttl=60)
+
+    assert cache.get(("c", "v", "b")) is None
+    assert cache.get(("c", "v", "a")) is not None
+    assert cache.evictions == 1
+
+
+def test_expired_entries_are_misses():
+    cache = ResultCache(max_bytes=1 << 20)
+    cache.put(("c", "v", "a"), _response(1), ttl=0.0001)
+
+    import time
+    time.sleep(0.01)
+
+    assert cache.get(("c", "v", "a")) is None
+    assert cache.expirations == 1
+
+
+def test_connector_execute_uses_cache_and_opt_out():
+    query = DataQuery(source="crm", filters={"status": "active"}, limit=7)
+
+    RESULT_CACHE.clear()
+    hits = RESULT_CACHE.hits
+
+    first = CRMConnector().execute(query)
+    second = CRMConnector().execute(query)
+
+    assert first == second
+    assert RESULT_CACHE.hits == hits + 1
+
+    class Uncached(CRMConnector):
+        cacheable = False
+
+    Uncached().execute(query)
+    assert RESULT_CACHE.hits == hits + 1
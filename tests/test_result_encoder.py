@@ -0,0 +1,57 @@
+from app.config import settings
+from app.llm.result_encoder import (
+    encode_compact,
+    encode_json,
+    encode_tool_result,
+    estimate_tokens,
+)
+from app.models.common import DataResponse, Metadata
+
+
+def _response(rows, context="Two customers."):
+    return DataResponse(
+        data=rows,
+        metadata=Metadata(
+            total_results=len(rows),
+            returned_results=len(rows),
+            data_type="tabular",
+            freshness="real-time"
+        ),
+        context=context
+    )
+
+
+def test_compact_encoding_uses_header_and_value_rows():
+    result = _response([
+        {"name": "Ada", "status": "active", "lifetime_value": 1234.5678, "email": None},
+        {"name": "Bob", "status": "active", "lifetime_value": 0.000123456, "email": None},
+    ])
+
+    lines = encode_compact(result, token_budget=1000).splitlines()
+
+    assert lines[0] == "meta: total_results=2 returned_results=2 data_type=tabular freshness=real-time"
+    assert lines[1] == "context: Two customers."
+    assert lines[2] == 'all rows: {"status":"active"}'
+    assert lines[3] == 'columns: ["name","lifetime_value"]'
+    assert lines[4:] == ['["Ada",1234.57]', '["Bob",0.00012]']
+
+
+def test_compact_encoding_trims_rows_to_budget():
+    rows = [{"id": i, "subject": f"Ticket number {i} about billing"} for i in range(100)]
+    result = _response(rows)
+
+    encoded = encode_compact(result, token_budget=120)
+
+    assert estimate_tokens(encoded) <= 130
+    assert encoded.splitlines()[-1].startswith("showing ")
+    assert encoded.splitlines()[-1].endswith(" of 100 rows")
+    assert estimate_tokens(encoded) < estimate_tokens(encode_json(result)) / 5
+
+
+def test_encoding_is_selectable_per_source(monkeypatch):
+    result = _response([{"name": "Ada"}])
+
+    monkeypatch.setattr(settings, "TOOL_RESULT_ENCODING_BY_SOURCE", {"crm": "json"})
+
+    assert encode_tool_result("crm", result) == encode_json(result)
+    assert encode_tool_result("support", result).startswith("meta: ")
@@ -0,0 +1,39 @@
+import json
+import os
+
+from app.connectors.snapshot import SnapshotCache, MISSING_VERSION
+
+
+def _write(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+def test_snapshot_reused_until_file_changes(tmp_path):
+    path = tmp_path / "records.json"
+    _write(path, [{"id": 1}])
+
+    cache = SnapshotCache()
+    first = cache.get(path)
+    second = cache.get(path)
+
+    assert first is second
+    assert first.to_dicts() == [{"id": 1}]
+
+    _write(path, [{"id": 1}, {"id": 2}])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    third = cache.get(path)
+
+    assert third is not first
+    assert third.version != first.version
+    assert len(third) == 2
+
+
+def test_missing_file_returns_empty_snapshot(tmp_path):
+    cache = SnapshotCache()
+    snapshot = cache.get(tmp_path / "absent.json")
+
+    assert snapshot.records == []
+    assert snapshot.version == MISSING_VERSION
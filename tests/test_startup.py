@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.connectors.registry import get_connector
+from app.main import app
+from app.services.warmup import STARTUP
+
+
+def test_importing_the_app_defers_sdk_and_connectors():
+    env = dict(os.environ)
+    env.pop("GROQ_API_KEY", None)
+
+    output = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys, app.main; "
+            "print([m for m in ('groq', 'numpy', 'app.connectors.analytics_connector') if m in sys.modules])"
+        )],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "[]"
+
+
+def test_lifespan_warms_up_connectors_and_reports_timings():
+    with TestClient(app) as client:
+        body = client.get("/metrics").text
+
+    assert set(STARTUP["warmup_seconds_by_source"]) == {"crm", "support", "analytics"}
+    assert STARTUP["ready_seconds"] >= STARTUP["warmup_seconds"] > 0
+    assert "startup_ready_seconds " in body
+    assert 'startup_warmup_seconds_by_source{key="analytics"}' in body
+
+    snapshot = get_connector("analytics").snapshot()
+    assert any(key[0] == "index" for key in snapshot._derived if isinstance(key, tuple))
+
+
+def test_every_entry_point_shares_one_connector_instance():
+    from app.services.data_services import build_query
+    from starlette.requests import Request
+
+    request = Request({"type": "http", "query_string": b"", "headers": []})
+    connector, _ = build_query("crm", request, 10, 0)
+
+    assert connector is get_connector("crm")